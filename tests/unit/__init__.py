@@ -0,0 +1 @@
+"""Unit test suite for the vision-ai-service package."""
@@ -0,0 +1,45 @@
+"""Unit test cases for the control loop of the app."""
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from vision_ai_service.adapters.exceptions import CircuitOpenError
+from vision_ai_service.app import create_status, report_job_error
+
+
+class UnavailableTokenManager:
+    """Token manager whose calls are rejected by an open circuit breaker."""
+
+    def __init__(self) -> None:
+        """Initialize call count."""
+        self.calls = 0
+
+    async def call(self, _func: Callable, *_args: Any) -> Any:
+        """Reject call."""
+        self.calls += 1
+        informasjon = "Circuit open."
+        raise CircuitOpenError(informasjon, 10.0)
+
+
+@pytest.mark.unit
+async def test_create_status_services_unavailable() -> None:
+    """Should log, not raise, when the status cannot be posted."""
+    token_manager = UnavailableTokenManager()
+    await create_status(token_manager, {"id": "1"}, "", "ready")  # type: ignore[arg-type]
+    assert token_manager.calls == 1
+
+
+@pytest.mark.unit
+async def test_report_job_error_services_unavailable() -> None:
+    """Should log, not raise, when the error cannot be reported."""
+    token_manager = UnavailableTokenManager()
+    await report_job_error(
+        token_manager,  # type: ignore[arg-type]
+        {"id": "1"},
+        "",
+        "analytics",
+        RuntimeError("failed"),
+    )
+    assert token_manager.calls == 2
@@ -0,0 +1,68 @@
+"""Unit test cases for the batch detector."""
+
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+
+from vision_ai_service.adapters.exceptions import BatchDetectorClosedError
+from vision_ai_service.services.batch_detector import BatchDetector
+
+
+class StubModel:
+    """Model returning one box per frame, the frame value as confidence."""
+
+    def __init__(self) -> None:
+        """Initialize model."""
+        self.batch_sizes: list[int] = []
+
+    def predict(self, ims: list[np.ndarray], **_kwargs: Any) -> list:
+        """Return one result per frame."""
+        self.batch_sizes.append(len(ims))
+        return [
+            SimpleNamespace(
+                boxes=SimpleNamespace(
+                    data=SimpleNamespace(
+                        cpu=lambda im=im: SimpleNamespace(
+                            numpy=lambda: np.array([[0, 0, 1, 1, im[0, 0], 0]])
+                        )
+                    )
+                )
+            )
+            for im in ims
+        ]
+
+
+@pytest.mark.unit
+def test_frames_of_all_cameras_in_one_batch() -> None:
+    """Should detect the frames of all cameras in one batch."""
+    model = StubModel()
+    batch_detector = BatchDetector(model, batch_size=8, max_wait=5.0)  # type: ignore[arg-type]
+    results: dict[int, np.ndarray] = {}
+
+    def detect(camera: int) -> None:
+        im = np.full((2, 2), camera / 10)
+        results[camera] = batch_detector.detect(im, 0.5, [0], (640, 480))
+
+    threads = [threading.Thread(target=detect, args=(i,)) for i in range(3)]
+    for _ in threads:
+        batch_detector.add_camera()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batch_detector.close()
+
+    assert model.batch_sizes == [3]
+    assert [results[i][0, 4] for i in range(3)] == pytest.approx([0.0, 0.1, 0.2])
+
+
+@pytest.mark.unit
+def test_detect_after_close() -> None:
+    """Should raise when the detector is closed."""
+    batch_detector = BatchDetector(StubModel())  # type: ignore[arg-type]
+    batch_detector.close()
+    with pytest.raises(BatchDetectorClosedError):
+        batch_detector.detect(np.zeros((2, 2)), 0.5, [0], (640, 480))
@@ -0,0 +1,96 @@
+"""Unit test cases for the best frame selector."""
+
+import numpy as np
+import pytest
+
+from vision_ai_service.services.best_frame import (
+    BestFrameSelector,
+    get_occlusion,
+    get_sharpness,
+)
+
+BOX = np.array([10, 10, 60, 110])
+
+
+def get_frame(*, sharp: bool) -> np.ndarray:
+    """Return frame with a sharp pattern, or a flat grey, inside BOX."""
+    im = np.full((120, 80, 3), 128, dtype=np.uint8)
+    if sharp:
+        im[10:110:2, 10:60] = 255
+    return im
+
+
+@pytest.mark.unit
+def test_get_sharpness() -> None:
+    """Should score a sharp crop above a flat one, 0 for an empty crop."""
+    assert get_sharpness(get_frame(sharp=True), BOX) > get_sharpness(
+        get_frame(sharp=False), BOX
+    )
+    assert get_sharpness(get_frame(sharp=True), np.array([10, 10, 10, 10])) == 0.0
+
+
+@pytest.mark.unit
+def test_get_occlusion() -> None:
+    """Should return share of the box covered by others, at most 1."""
+    box = np.array([0, 0, 10, 10])
+    assert get_occlusion(box, np.empty((0, 4))) == 0.0
+    assert get_occlusion(box, np.array([[5, 0, 20, 10]])) == pytest.approx(0.5)
+    assert get_occlusion(box, np.array([[0, 0, 10, 10], [0, 0, 10, 10]])) == 1.0
+
+
+@pytest.mark.unit
+def test_sharpest_frame_selected() -> None:
+    """Should save the sharpest frame around the crossing, window frames late."""
+    selector = BestFrameSelector(window=2)
+    frames = [get_frame(sharp=i == 3) for i in range(5)]
+    ready = []
+    for i, im in enumerate(frames):
+        selector.add_frame(im, {7: BOX})
+        if i == 2:
+            selector.add_crossing(7, 100.0, 0.5, im, BOX)
+        ready = selector.pop_ready()
+        assert bool(ready) == (i == 4)
+    crossing, im, xyxy = ready[0]
+    assert crossing.d_id == 7
+    assert im is frames[3]
+    assert xyxy is BOX
+
+
+@pytest.mark.unit
+def test_occluded_frame_not_selected() -> None:
+    """Should prefer a less sharp frame where the skier is not covered."""
+    selector = BestFrameSelector(window=1)
+    covered = get_frame(sharp=True)
+    free = get_frame(sharp=True)
+    free[10:110:4, 10:60] = 128
+    selector.add_frame(covered, {7: BOX, 8: BOX})
+    selector.add_crossing(7, 100.0, 0.5, covered, BOX)
+    selector.add_frame(free, {7: BOX})
+    ((_crossing, im, _xyxy),) = selector.pop_ready()
+    assert im is free
+
+
+@pytest.mark.unit
+def test_flush() -> None:
+    """Should return pending crossings at once on flush."""
+    selector = BestFrameSelector(window=3)
+    im = get_frame(sharp=True)
+    selector.add_frame(im, {7: BOX})
+    selector.add_crossing(7, 100.0, 0.5, im, BOX)
+    assert selector.pop_ready() == []
+    ready = selector.pop_ready(flush=True)
+    assert ready[0][1] is im
+    assert selector.pending == []
+
+
+@pytest.mark.unit
+def test_no_frame_in_window() -> None:
+    """Should fall back to the crossing frame if no frame has the skier."""
+    selector = BestFrameSelector(window=1)
+    im = get_frame(sharp=False)
+    selector.add_frame(im, {})
+    selector.add_crossing(7, 100.0, 0.5, im, BOX)
+    selector.add_frame(get_frame(sharp=True), {})
+    ((_crossing, best_im, xyxy),) = selector.pop_ready()
+    assert best_im is im
+    assert xyxy is BOX
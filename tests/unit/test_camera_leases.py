@@ -0,0 +1,71 @@
+"""Unit test cases for the camera assignment of instances."""
+
+import pytest
+
+from vision_ai_service.services.camera_leases import (
+    Camera,
+    get_assignment,
+    get_cameras,
+)
+
+
+def get_camera_list(count: int) -> list[Camera]:
+    """Return count cameras."""
+    return [Camera(f"camera_{i}", f"rtsp://camera_{i}") for i in range(count)]
+
+
+@pytest.mark.unit
+def test_get_assignment_fair_share() -> None:
+    """Should give each camera to one instance, at most a fair share each."""
+    cameras = get_camera_list(6)
+    assignment = get_assignment(cameras, {"a": 4, "b": 4, "c": 4})
+
+    assigned = [location for locations in assignment.values() for location in locations]
+    assert sorted(assigned) == sorted(camera.location for camera in cameras)
+    assert [len(locations) for locations in assignment.values()] == [2, 2, 2]
+
+
+@pytest.mark.unit
+def test_get_assignment_capacity() -> None:
+    """Should respect capacity, leave cameras unassigned when full."""
+    assignment = get_assignment(get_camera_list(6), {"a": 1, "b": 3})
+    assert len(assignment["a"]) == 1
+    assert len(assignment["b"]) == 3
+
+
+@pytest.mark.unit
+def test_get_assignment_instance_leaves() -> None:
+    """Should give the cameras of an instance that leaves to the others."""
+    cameras = get_camera_list(8)
+    after = get_assignment(cameras, {"a": 8, "b": 8, "c": 8})
+    assert sorted(len(locations) for locations in after.values()) == [2, 3, 3]
+    assert set().union(*after.values()) == {camera.location for camera in cameras}
+
+
+@pytest.mark.unit
+def test_get_assignment_same_on_all_instances() -> None:
+    """Should not depend on the order of cameras and instances."""
+    cameras = get_camera_list(8)
+    assignment = get_assignment(cameras, {"a": 3, "b": 4, "c": 2})
+    assert get_assignment(cameras[::-1], {"c": 2, "b": 4, "a": 3}) == assignment
+
+
+@pytest.mark.unit
+def test_get_assignment_no_instances() -> None:
+    """Should return empty assignment without instances."""
+    assert get_assignment(get_camera_list(2), {}) == {}
+
+
+@pytest.mark.unit
+def test_get_cameras() -> None:
+    """Should parse cameras with optional trigger line, raise if invalid."""
+    cameras = get_cameras(
+        '[{"location": "Finish", "url": "rtsp://a", "trigger_line": "0:0.7:1:0.7"},'
+        ' {"location": "Start", "url": "rtsp://b"}]'
+    )
+    assert cameras[0].get_overrides() == {"TRIGGER_LINE_XYXYN": "0:0.7:1:0.7"}
+    assert cameras[1].get_overrides() == {}
+    with pytest.raises(ValueError, match="Error reading CAMERAS"):
+        get_cameras('[{"location": "Finish"}]')
+    with pytest.raises(ValueError, match="Error reading CAMERAS"):
+        get_cameras('["Finish"]')
@@ -0,0 +1,85 @@
+"""Unit test cases for the circuit breaker."""
+
+import time
+
+import pytest
+
+from vision_ai_service.adapters.circuit_breaker import CircuitBreaker
+from vision_ai_service.adapters.exceptions import CircuitOpenError
+
+
+async def fail() -> None:
+    """Fail as a service that is down."""
+    informasjon = "Connection refused"
+    raise ConnectionRefusedError(informasjon)
+
+
+async def succeed() -> str:
+    """Answer as a service that is up."""
+    return "ok"
+
+
+async def open_breaker(breaker: CircuitBreaker) -> None:
+    """Fail calls until the breaker opens."""
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionRefusedError):
+            await breaker.call(fail)
+
+
+@pytest.mark.unit
+async def test_opens_after_threshold() -> None:
+    """Should reject calls without calling when the threshold is reached."""
+    breaker = CircuitBreaker("test", failure_threshold=3, base_delay=10)
+    for _ in range(2):
+        with pytest.raises(ConnectionRefusedError):
+            await breaker.call(fail)
+    assert breaker.state == "closed"
+    with pytest.raises(ConnectionRefusedError):
+        await breaker.call(fail)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError) as e:
+        await breaker.call(succeed)
+    assert e.value.retry_after > 0
+
+
+@pytest.mark.unit
+async def test_other_errors_do_not_count() -> None:
+    """Should only count outage errors."""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+
+    async def bad_request() -> None:
+        informasjon = "Invalid config"
+        raise ValueError(informasjon)
+
+    with pytest.raises(ValueError, match="Invalid config"):
+        await breaker.call(bad_request)
+    assert breaker.state == "closed"
+
+
+@pytest.mark.unit
+async def test_half_open_success_closes() -> None:
+    """Should let one trial call through after the delay, success closes."""
+    breaker = CircuitBreaker("test", failure_threshold=2, base_delay=10)
+    await open_breaker(breaker)
+    breaker.open_until = time.monotonic()
+    assert breaker.state == "half_open"
+
+    assert await breaker.call(succeed) == "ok"
+    assert breaker.state == "closed"
+    assert breaker.open_count == 0
+
+
+@pytest.mark.unit
+async def test_half_open_failure_doubles_delay() -> None:
+    """Should open again with a doubled delay when the trial call fails."""
+    breaker = CircuitBreaker("test", failure_threshold=2, base_delay=10)
+    await open_breaker(breaker)
+    first_delay = breaker.retry_after()
+    assert 8 <= first_delay <= 12
+    breaker.open_until = time.monotonic()
+
+    with pytest.raises(ConnectionRefusedError):
+        await breaker.call(fail)
+    assert breaker.state == "open"
+    assert 16 <= breaker.retry_after() <= 24
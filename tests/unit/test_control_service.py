@@ -0,0 +1,35 @@
+"""Unit test cases for the local control service."""
+
+import asyncio
+
+import pytest
+
+from vision_ai_service.services.control_service import ControlService
+
+
+@pytest.mark.unit
+async def test_wait_returns_pending_commands() -> None:
+    """Should return all queued commands at once."""
+    control_service = ControlService()
+    control_service.send("analytics_start")
+    control_service.send("draw_trigger_line")
+    assert await control_service.wait() == {"analytics_start", "draw_trigger_line"}
+
+
+@pytest.mark.unit
+async def test_wait_timeout() -> None:
+    """Should leave the queue intact when the wait times out."""
+    control_service = ControlService()
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.01):
+            await control_service.wait()
+    control_service.send("stop_tracking")
+    assert await control_service.wait() == {"stop_tracking"}
+    assert control_service.stop_event.is_set()
+
+
+@pytest.mark.unit
+def test_send_unknown_command() -> None:
+    """Should reject unknown commands."""
+    with pytest.raises(ValueError, match="Unknown command"):
+        ControlService().send("reboot")
@@ -0,0 +1,98 @@
+"""Unit test cases for the crossing journal."""
+
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from vision_ai_service.services import crossing_journal
+from vision_ai_service.services.crossing_journal import (
+    VISIBLE_SECONDS,
+    Crossing,
+    CrossingJournal,
+)
+
+
+@pytest.mark.unit
+def test_append_is_written_on_close(tmp_path: Path) -> None:
+    """Should write all appended crossings before close returns."""
+    db_path = str(tmp_path / "journal.db")
+    journal = CrossingJournal(db_path, "Finish", "session_1")
+    now = time.time()
+    for i in range(250):
+        journal.append(i, now + i / 100, 0.5, f"Finish_{i}.jpg")
+    journal.close()
+
+    connection = sqlite3.connect(db_path)
+    try:
+        crossings = CrossingJournal.get_crossings(connection, "Finish", 0)
+    finally:
+        connection.close()
+    assert len(crossings) == 250
+    assert crossings[0].track_id == 0
+    assert crossings[-1].file_name == "Finish_249.jpg"
+
+
+@pytest.mark.unit
+def test_restarted_session_finds_duplicate(tmp_path: Path) -> None:
+    """Should recognize a crossing saved by the session before the restart."""
+    db_path = str(tmp_path / "journal.db")
+    now = time.time()
+    journal = CrossingJournal(db_path, "Finish", "session_1")
+    journal.append(1, now - 1, 0.5, "Finish_1.jpg")
+    journal.close()
+
+    journal = CrossingJournal(db_path, "Finish", "session_2")
+    journal.close()
+    assert journal.is_duplicate(now - 0.8, 0.52)
+    assert not journal.is_duplicate(now - 0.8, 0.9)
+    # skiers crossing after the restart are never duplicates
+    assert not journal.is_duplicate(journal.started + VISIBLE_SECONDS + 1, 0.5)
+
+
+@pytest.mark.unit
+def test_other_camera_not_loaded(tmp_path: Path) -> None:
+    """Should only load recent crossings of its own camera."""
+    db_path = str(tmp_path / "journal.db")
+    now = time.time()
+    journal = CrossingJournal(db_path, "Start", "session_1")
+    journal.append(1, now - 1, 0.5, "Start_1.jpg")
+    journal.close()
+
+    journal = CrossingJournal(db_path, "Finish", "session_2")
+    journal.close()
+    assert journal.recent == []
+    assert not journal.is_duplicate(now - 1, 0.5)
+
+
+@pytest.mark.unit
+def test_writer_survives_failed_batch(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Should log a failed batch and go on writing the next."""
+    monkeypatch.setattr(crossing_journal, "FLUSH_INTERVAL", 0.01)
+    insert = CrossingJournal.insert
+
+    def failing_insert(connection: sqlite3.Connection, batch: list[Crossing]) -> None:
+        if any(crossing.track_id == 1 for crossing in batch):
+            informasjon = "disk I/O error"
+            raise sqlite3.OperationalError(informasjon)
+        insert(connection, batch)
+
+    monkeypatch.setattr(CrossingJournal, "insert", staticmethod(failing_insert))
+    db_path = str(tmp_path / "journal.db")
+    journal = CrossingJournal(db_path, "Finish", "session_1")
+    journal.append(1, time.time(), 0.5, "Finish_1.jpg")
+    while not journal.queue.empty():
+        time.sleep(0.01)
+    time.sleep(0.1)
+    journal.append(2, time.time(), 0.5, "Finish_2.jpg")
+    journal.close()
+
+    connection = sqlite3.connect(db_path)
+    try:
+        crossings = CrossingJournal.get_crossings(connection, "Finish", 0)
+    finally:
+        connection.close()
+    assert [crossing.track_id for crossing in crossings] == [2]
@@ -0,0 +1,73 @@
+"""Unit test cases for the detection log."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from vision_ai_service.services.detection_log import (
+    FLUSH_FRAMES,
+    DetectionRecorder,
+    open_detection_log,
+)
+
+
+class FakeTensor:
+    """Stand-in for a torch tensor, as used by the recorder."""
+
+    def __init__(self, array: np.ndarray) -> None:
+        """Wrap array."""
+        self.array = array
+
+    def int(self) -> "FakeTensor":
+        """Return as int."""
+        return FakeTensor(self.array.astype(int))
+
+    def cpu(self) -> "FakeTensor":
+        """Return self."""
+        return self
+
+    def numpy(self) -> np.ndarray:
+        """Return wrapped array."""
+        return self.array
+
+
+class FakeBoxes:
+    """Stand-in for ultralytics Boxes with one detection."""
+
+    def __init__(self, track_id: int) -> None:
+        """Create one person box."""
+        self.id = FakeTensor(np.array([track_id]))
+        self.cls = FakeTensor(np.array([0.0]))
+        self.conf = FakeTensor(np.array([0.9]))
+        self.xyxyn = FakeTensor(np.array([[0.1, 0.2, 0.3, 0.8]]))
+
+    def __len__(self) -> int:
+        """Return number of boxes."""
+        return 1
+
+
+@pytest.mark.unit
+def test_log_readable_while_recording(tmp_path: Path) -> None:
+    """Should open the rows flushed so far before the log is closed."""
+    log_path = str(tmp_path / "log")
+    recorder = DetectionRecorder(log_path)
+    assert len(open_detection_log(log_path)["frame"]) == 0
+    for frame in range(FLUSH_FRAMES + 1):
+        recorder.add(frame, float(frame), FakeBoxes(frame % 3))
+    columns = open_detection_log(log_path)
+    assert len(columns["frame"]) == FLUSH_FRAMES
+    assert columns["track_id"][4] == 1
+    recorder.close()
+    columns = open_detection_log(log_path)
+    assert len(columns["frame"]) == FLUSH_FRAMES + 1
+    assert columns["xyxyn"].shape == (FLUSH_FRAMES + 1, 4)
+
+
+@pytest.mark.unit
+def test_existing_log_not_appended(tmp_path: Path) -> None:
+    """Should refuse to record to an existing log."""
+    log_path = str(tmp_path / "log")
+    DetectionRecorder(log_path).close()
+    with pytest.raises(FileExistsError):
+        DetectionRecorder(log_path)
@@ -0,0 +1,72 @@
+"""Unit test cases for import time and memory of the light modules.
+
+Each module is imported in a fresh interpreter with python -X importtime.
+The test fails if the cold import is slower than the cap, uses more memory
+than the cap, or pulls in any module of the heavy vision stack.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+MAX_IMPORT_SECONDS = 1.5
+MAX_RSS_MB = 150
+HEAVY_MODULES = ["torch", "ultralytics", "cv2", "piexif"]
+LIGHT_MODULES = [
+    "vision_ai_service.adapters",
+    "vision_ai_service.services.simulate_service",
+    "vision_ai_service.app",
+]
+RSS_SCRIPT = "import resource, {module}; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+ROOT_PATH = Path(__file__).parents[2]
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Parse -X importtime output to cumulative microseconds per module."""
+    cumulative = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        try:
+            cumulative[fields[2].strip()] = int(fields[1])
+        except ValueError:
+            continue  # header line
+    return cumulative
+
+
+@pytest.mark.unit
+def test_parse_importtime() -> None:
+    """Should return cumulative microseconds per module."""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   aiohttp.hdrs\n"
+        "import time:      2000 |      52000 | aiohttp\n"
+    )
+    assert parse_importtime(output) == {"aiohttp.hdrs": 120, "aiohttp": 52000}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_cold_import(module: str, tmp_path: Path) -> None:
+    """Should import without the vision stack, within time and memory caps."""
+    # run elsewhere, so the import cannot depend on the working directory
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", RSS_SCRIPT.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(ROOT_PATH)},
+    )
+    assert completed.returncode == 0, completed.stderr.strip()[-500:]
+    cumulative = parse_importtime(completed.stderr)
+    seconds = cumulative.get(module, 0) / 1_000_000
+    rss_mb = int(completed.stdout.strip().splitlines()[-1]) / 1024
+    loaded = sorted(name for name in cumulative if name.split(".")[0] in HEAVY_MODULES)
+    assert not loaded, f"loads heavy modules {loaded[:5]}"
+    assert seconds <= MAX_IMPORT_SECONDS, f"cold import {seconds:.3f}s"
+    assert rss_mb <= MAX_RSS_MB, f"RSS {rss_mb:.0f} MB"
@@ -0,0 +1,92 @@
+"""Unit test cases for the encoding of crossing photos."""
+
+import cv2
+import numpy as np
+import piexif
+import pytest
+
+from vision_ai_service.adapters.photo_encoding import (
+    PhotoSettings,
+    encode_image,
+    encode_photo,
+    resize_to_max,
+)
+
+
+def get_image(height: int = 480, width: int = 640) -> np.ndarray:
+    """Return a gradient image (BGR) with noise, like a photo to encode."""
+    rng = np.random.default_rng(1)
+    gradient = np.linspace(0, 200, width, dtype=np.float32)
+    im = np.repeat(gradient[np.newaxis, :, np.newaxis], height, axis=0)
+    im = np.repeat(im, 3, axis=2) + rng.normal(0, 20, (height, width, 3))
+    return np.clip(im, 0, 255).astype(np.uint8)
+
+
+def decode(data: bytes) -> np.ndarray:
+    """Decode encoded bytes to an image (BGR)."""
+    im = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    assert im is not None
+    return im
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("photo_format", ["jpg", "webp"])
+def test_photo_is_resized_and_decodes(photo_format: str) -> None:
+    """Should keep the longest side within max dimension, crop at full size."""
+    settings = PhotoSettings(
+        photo_format=photo_format,
+        max_dimension=320,
+        preview=True,
+        preview_dimension=160,
+    )
+    photos = encode_photo(get_image(), get_image(200, 100), "Finish", settings)
+
+    assert decode(photos["Finish"]).shape == (240, 320, 3)
+    assert decode(photos[f"Finish_crop.{photo_format}"]).shape == (200, 100, 3)
+    preview = photos["Finish_preview.jpg"]
+    assert preview.startswith(b"\xff\xd8")
+    assert decode(preview).shape == (120, 160, 3)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("photo_format", ["jpg", "webp"])
+def test_higher_quality_is_larger_and_closer(photo_format: str) -> None:
+    """Should give larger files and a smaller error with higher quality."""
+    im = get_image()
+    low = encode_image(im, photo_format, 30)
+    high = encode_image(im, photo_format, 95)
+
+    def error(data: bytes) -> float:
+        return float(np.abs(decode(data).astype(int) - im).mean())
+
+    assert len(high) > len(low)
+    assert error(high) < error(low)
+
+
+@pytest.mark.unit
+def test_exif_is_kept_in_the_photo() -> None:
+    """Should insert EXIF in the photo, not in the crop."""
+    exif_bytes = piexif.dump({"0th": {piexif.ImageIFD.ImageDescription: b"Finish"}})
+    photos = encode_photo(
+        get_image(), get_image(200, 100), "Finish", PhotoSettings(), exif_bytes
+    )
+
+    exif = piexif.load(photos["Finish"])
+    assert exif["0th"][piexif.ImageIFD.ImageDescription] == b"Finish"
+    assert not piexif.load(photos["Finish_crop.jpg"])["0th"]
+
+
+@pytest.mark.unit
+def test_small_image_is_not_resized() -> None:
+    """Should keep images within max dimension, and all images with 0."""
+    im = get_image(100, 50)
+
+    assert resize_to_max(im, 320) is im
+    assert resize_to_max(get_image(), 0).shape == (480, 640, 3)
+
+
+@pytest.mark.unit
+def test_invalid_quality_is_refused() -> None:
+    """Should refuse a quality outside 1-100."""
+    with pytest.raises(ValueError, match="PHOTO_QUALITY"):
+        PhotoSettings(quality=0)
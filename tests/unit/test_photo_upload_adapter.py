@@ -0,0 +1,103 @@
+"""Unit test cases for the photo uploader spool."""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from vision_ai_service.adapters.exceptions import PhotoRejectedError
+from vision_ai_service.adapters.photo_upload_adapter import (
+    METADATA_FILE,
+    REJECTED_DIR,
+    PhotoUpload,
+    PhotoUploadAdapter,
+    PhotoUploader,
+)
+
+
+class StubTokenManager:
+    """Token manager handing out a fixed token."""
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Call func with the token as first argument."""
+        return await func("token", *args)
+
+
+def get_upload(name: str) -> PhotoUpload:
+    """Return upload of one crossing."""
+    return PhotoUpload({f"{name}.jpg": b"photo", f"{name}_crop.jpg": b"crop"}, {})
+
+
+@pytest.fixture
+def uploaded(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace upload with a stub refusing photos named rejected."""
+    names: list[str] = []
+
+    async def upload_photo(
+        _self: Any, _token: str, _event_id: str, upload: PhotoUpload
+    ) -> None:
+        name = next(iter(upload.photos))
+        if name.startswith("rejected"):
+            informasjon = "upload_photo failed - 400 - No photo files in upload."
+            raise PhotoRejectedError(informasjon)
+        names.append(name)
+
+    monkeypatch.setattr(PhotoUploadAdapter, "upload_photo", upload_photo)
+    return names
+
+
+async def drain_spool(uploader: PhotoUploader) -> None:
+    """Run one round of the spool retry loop."""
+    task = asyncio.create_task(uploader.retry_spool())
+    await uploader.spool_empty.wait()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.unit
+async def test_rejected_upload_does_not_block_spool(
+    tmp_path: Path, uploaded: list[str]
+) -> None:
+    """Should set refused uploads aside and upload the rest of the spool."""
+    uploader = PhotoUploader(StubTokenManager(), "event", str(tmp_path))  # type: ignore[arg-type]
+    uploader.spool(get_upload("rejected_1"))
+    uploader.spool(get_upload("finish_2"))
+    await asyncio.wait_for(drain_spool(uploader), 5)
+
+    assert uploaded == ["finish_2.jpg"]
+    assert uploader.counts["unspooled"] == 1
+    assert uploader.counts["rejected"] == 1
+    assert (tmp_path / REJECTED_DIR / "rejected_1.jpg" / "rejected_1.jpg").exists()
+
+
+@pytest.mark.unit
+async def test_unreadable_spooled_upload_is_set_aside(
+    tmp_path: Path, uploaded: list[str]
+) -> None:
+    """Should set aside a spooled upload with broken metadata."""
+    uploader = PhotoUploader(StubTokenManager(), "event", str(tmp_path))  # type: ignore[arg-type]
+    uploader.spool(get_upload("finish_1"))
+    (tmp_path / "finish_1.jpg" / METADATA_FILE).write_text("{")
+    uploader.spool(get_upload("finish_2"))
+    await asyncio.wait_for(drain_spool(uploader), 5)
+
+    assert uploaded == ["finish_2.jpg"]
+    assert (tmp_path / REJECTED_DIR / "finish_1.jpg").exists()
+
+
+@pytest.mark.unit
+async def test_rejected_upload_is_not_retried(
+    tmp_path: Path, uploaded: list[str]
+) -> None:
+    """Should not retry or spool an upload refused by photo-service."""
+    uploader = PhotoUploader(StubTokenManager(), "event", str(tmp_path))  # type: ignore[arg-type]
+    await uploader.deliver(get_upload("rejected_1"))
+
+    assert uploader.counts["retried"] == 0
+    assert uploader.get_spool_depth() == 0
+    metadata = tmp_path / REJECTED_DIR / "rejected_1.jpg" / METADATA_FILE
+    assert json.loads(metadata.read_text()) == {}
+    assert not uploaded
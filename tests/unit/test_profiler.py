@@ -0,0 +1,85 @@
+"""Unit test cases for the on-demand profiler."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from vision_ai_service.services.profiler import Profiler
+
+
+@pytest.mark.unit
+def test_profile_is_handed_over_on_the_frame_after_the_window() -> None:
+    """Should profile between frames while active, hand over when stopped."""
+    profiler = Profiler("unused")
+    profiler.on_frame()
+    assert profiler.profile is None
+
+    profiler.active = True
+    profiler.on_frame()
+    assert profiler.profile is not None
+    assert profiler.profiled_thread == threading.get_ident()
+
+    profiler.active = False
+    profiler.on_frame()
+    assert profiler.profile is None
+    assert profiler.finished_profile is not None
+
+
+@pytest.mark.unit
+def test_only_the_profiled_thread_stops_the_profile() -> None:
+    """Should leave the profile of one camera thread to that thread."""
+    profiler = Profiler("unused")
+    profiler.active = True
+    profiler.on_frame()
+    profile = profiler.profile
+    profiler.active = False
+
+    other = threading.Thread(target=profiler.on_frame)
+    other.start()
+    other.join()
+
+    assert profiler.profile is profile
+    assert profiler.finished_profile is None
+    # stopped by the profiled thread
+    profiler.on_frame()
+    assert profiler.finished_profile is profile
+
+
+@pytest.mark.unit
+async def test_report_without_frames(tmp_path: Path) -> None:
+    """Should write a report with allocation growth when no frames are seen."""
+    profiler = Profiler(str(tmp_path), top_n=5)
+
+    file_name = await profiler.run(0.04)
+
+    report = Path(file_name).read_text()
+    assert "No analytics frames in the profiling window." in report
+    assert "Top 5 allocation growth, snapshot 4 of 4" in report
+    assert profiler.last_report == file_name
+    assert not list(tmp_path.glob("*.prof"))
+
+
+@pytest.mark.unit
+async def test_report_of_a_profiled_thread(tmp_path: Path) -> None:
+    """Should report the hot functions of the analytics thread and dump stats."""
+    profiler = Profiler(str(tmp_path), top_n=5)
+    stop = threading.Event()
+
+    def analytics() -> None:
+        while not stop.wait(0.005):
+            profiler.on_frame()
+            sum(range(1000))
+
+    thread = threading.Thread(target=analytics)
+    thread.start()
+    try:
+        file_name = await profiler.run(0.2)
+    finally:
+        stop.set()
+        thread.join()
+
+    report = Path(file_name).read_text()
+    assert "Top 5 functions by tottime:" in report
+    assert "Top 5 functions by cumulative:" in report
+    assert len(list(tmp_path.glob("*.prof"))) == 1
@@ -0,0 +1,70 @@
+"""Unit test cases for the re-identification cache."""
+
+import numpy as np
+import pytest
+
+from vision_ai_service.services.reid_cache import ReIdCache, get_signature
+
+
+def get_skier(
+    jacket: tuple[int, int, int], trousers: tuple[int, int, int]
+) -> np.ndarray:
+    """Return crop (BGR) of a skier with jacket and trousers colours."""
+    crop = np.zeros((120, 50, 3), dtype=np.uint8)
+    crop[:60] = jacket
+    crop[60:] = trousers
+    return crop
+
+
+RED_BLUE = get_skier((0, 0, 200), (200, 0, 0))
+BLUE_RED = get_skier((200, 0, 0), (0, 0, 200))
+
+
+@pytest.mark.unit
+def test_get_signature() -> None:
+    """Should return normalized signature, jacket and trousers apart."""
+    signature = get_signature(RED_BLUE)
+    assert np.linalg.norm(signature) == pytest.approx(1.0)
+    assert signature @ get_signature(RED_BLUE.copy()) == pytest.approx(1.0)
+    assert signature @ get_signature(BLUE_RED) < 0.5
+    assert not get_signature(np.zeros((0, 0, 3), dtype=np.uint8)).any()
+
+
+@pytest.mark.unit
+def test_match_same_skier() -> None:
+    """Should merge a new id with the same appearance close by."""
+    reid_cache = ReIdCache()
+    reid_cache.add(1, get_signature(RED_BLUE), 100.0, 0.5)
+    reid_cache.add(2, get_signature(BLUE_RED), 100.5, 0.5)
+
+    assert reid_cache.match(3, get_signature(RED_BLUE), 101.0, 0.55) == 1
+    # merged twice - still the first id
+    assert reid_cache.match(4, get_signature(RED_BLUE), 101.5, 0.55) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("crossing_time", "x_center", "crop"),
+    [
+        (110.0, 0.5, RED_BLUE),  # too late
+        (101.0, 0.9, RED_BLUE),  # too far
+        (101.0, 0.5, BLUE_RED),  # other skier
+    ],
+)
+def test_match_other_skier(
+    crossing_time: float, x_center: float, crop: np.ndarray
+) -> None:
+    """Should not merge when late, far apart or different."""
+    reid_cache = ReIdCache()
+    reid_cache.add(1, get_signature(RED_BLUE), 100.0, 0.5)
+    assert reid_cache.match(3, get_signature(crop), crossing_time, x_center) is None
+
+
+@pytest.mark.unit
+def test_oldest_overwritten() -> None:
+    """Should keep capacity signatures, overwriting the oldest."""
+    reid_cache = ReIdCache(capacity=2)
+    reid_cache.add(1, get_signature(RED_BLUE), 100.0, 0.5)
+    reid_cache.add(2, get_signature(BLUE_RED), 100.0, 0.2)
+    reid_cache.add(3, get_signature(BLUE_RED), 100.0, 0.8)
+    assert reid_cache.match(4, get_signature(RED_BLUE), 100.5, 0.5) is None
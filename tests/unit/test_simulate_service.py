@@ -0,0 +1,35 @@
+"""Unit test cases for the simulation schedule."""
+
+import pytest
+
+from vision_ai_service.services.simulate_service import (
+    get_emission_schedule,
+    parse_speedup,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("4", 4.0), ("0.5", 0.5), ("0", 1.0), ("-2", 1.0), ("", 1.0)],
+)
+def test_parse_speedup(value: str, expected: float) -> None:
+    """Should fall back to real time for a speedup not above 0."""
+    assert parse_speedup(value) == expected
+
+
+@pytest.mark.unit
+def test_emission_schedule_is_divided_by_speedup() -> None:
+    """Should schedule crossings in time order, divided by speedup."""
+    contestants = [
+        {"bib": 2, "crossing_time": "2024-01-01T10:00:30"},
+        {"bib": 1, "crossing_time": "2024-01-01T10:00:00"},
+        {"bib": 3, "crossing_time": "not a time"},
+    ]
+
+    schedule = get_emission_schedule(contestants, 2.0)
+
+    assert [(delay, contestant["bib"]) for delay, contestant in schedule] == [
+        (0.0, 1),
+        (15.0, 2),
+    ]
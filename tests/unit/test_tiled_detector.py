@@ -0,0 +1,63 @@
+"""Unit test cases for the tile layout and NMS of tiled detection."""
+
+import numpy as np
+import pytest
+
+from vision_ai_service.services.tiled_detector import (
+    get_tile_layout,
+    non_max_suppression,
+)
+
+
+@pytest.mark.unit
+def test_tiles_cover_the_trigger_line_to_the_frame_edge() -> None:
+    """Should end the last tile at the right edge, all tiles of full size."""
+    tiles = get_tile_layout(1920, 1080, (0.0, 0.5, 1.0, 0.5))
+
+    assert [tile[0] for tile in tiles] == [0, 512, 1024, 1280]
+    assert tiles[-1][2] == 1920
+    assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles)
+    assert all(y1 <= 540 <= y2 for _x1, y1, _x2, y2 in tiles)
+
+
+@pytest.mark.unit
+def test_tiles_at_the_bottom_edge_are_kept_inside_the_frame() -> None:
+    """Should move tiles of a line close to the bottom up into the frame."""
+    tiles = get_tile_layout(1920, 1080, (0.0, 0.95, 1.0, 0.95))
+
+    assert {(y1, y2) for _x1, y1, _x2, y2 in tiles} == {(440, 1080)}
+
+
+@pytest.mark.unit
+def test_frame_smaller_than_a_tile_is_one_tile() -> None:
+    """Should use the whole frame as the only tile."""
+    assert get_tile_layout(320, 240, (0.1, 0.5, 0.9, 0.5)) == ((0, 0, 320, 240),)
+
+
+@pytest.mark.unit
+def test_overlapping_detections_are_suppressed() -> None:
+    """Should keep the most confident of overlapping boxes, and separate boxes."""
+    detections = np.array(
+        [
+            [10, 10, 110, 210, 0.6, 0],
+            [12, 14, 112, 212, 0.9, 0],
+            [300, 10, 400, 210, 0.5, 0],
+        ]
+    )
+
+    kept = non_max_suppression(detections, 0.5)
+
+    assert kept[:, 4].tolist() == [0.9, 0.5]
+
+
+@pytest.mark.unit
+def test_boxes_below_the_iou_threshold_are_kept() -> None:
+    """Should keep boxes overlapping less than the threshold."""
+    detections = np.array(
+        [
+            [0, 0, 100, 100, 0.9, 0],
+            [70, 0, 170, 100, 0.8, 0],
+        ]
+    )
+
+    assert len(non_max_suppression(detections, 0.5)) == 2
@@ -0,0 +1,84 @@
+"""Unit test cases for the token manager."""
+
+import time
+from typing import Any
+
+import jwt
+import pytest
+
+from vision_ai_service.adapters.exceptions import LoginExpiredError
+from vision_ai_service.adapters.token_manager import TokenManager, get_token_expiry
+
+
+def make_token(expires_in: float) -> str:
+    """Return a JWT expiring in expires_in seconds."""
+    payload = {"username": "admin", "exp": int(time.time() + expires_in)}
+    return jwt.encode(payload, "secret", algorithm="HS256")
+
+
+@pytest.fixture
+def logins(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace login with a stub, return the tokens handed out."""
+    tokens: list[str] = []
+
+    async def login(_self: Any, _username: str, _password: str) -> str:
+        tokens.append(make_token(3600))
+        return tokens[-1]
+
+    monkeypatch.setattr(
+        "vision_ai_service.adapters.token_manager.UserAdapter.login", login
+    )
+    return tokens
+
+
+@pytest.mark.unit
+def test_get_token_expiry() -> None:
+    """Should return exp of the token, None if not a JWT."""
+    token = make_token(100)
+    assert get_token_expiry(token) == jwt.decode(token, "secret", ["HS256"])["exp"]
+    assert get_token_expiry("not-a-jwt") is None
+
+
+@pytest.mark.unit
+async def test_get_token_reused_until_expiring(logins: list[str]) -> None:
+    """Should login once, and again shortly before the token expires."""
+    token_manager = TokenManager("admin", "password", refresh_margin=60)
+    token = await token_manager.get_token()
+    assert await token_manager.get_token() == token
+    assert len(logins) == 1
+
+    token_manager.expires_at = time.time() + 30
+    assert await token_manager.get_token() == logins[-1]
+    assert len(logins) == 2
+
+
+@pytest.mark.unit
+async def test_call_retries_once_on_rejected_token(logins: list[str]) -> None:
+    """Should login again and retry when the service rejects the token."""
+    token_manager = TokenManager("admin", "password")
+    used: list[str] = []
+
+    async def get_config(token: str, key: str) -> str:
+        used.append(token)
+        if len(used) == 1:
+            informasjon = "401"
+            raise LoginExpiredError(informasjon)
+        return f"{key}=True"
+
+    assert await token_manager.call(get_config, "SHOW_VIDEO") == "SHOW_VIDEO=True"
+    assert used == logins
+    assert len(used) == 2
+
+
+@pytest.mark.unit
+async def test_call_gives_up_after_one_retry(logins: list[str]) -> None:
+    """Should raise if the new token is rejected too."""
+    token_manager = TokenManager("admin", "password")
+
+    async def get_config(_token: str) -> str:
+        informasjon = "401"
+        raise LoginExpiredError(informasjon)
+
+    with pytest.raises(LoginExpiredError):
+        await token_manager.call(get_config)
+    assert len(logins) == 2
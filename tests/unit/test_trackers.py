@@ -0,0 +1,92 @@
+"""Unit test cases for the lap tracker."""
+
+import numpy as np
+import pytest
+
+from vision_ai_service.services.trackers import (
+    GATED_COST,
+    LapTracker,
+    get_cost_matrix,
+    get_tracker,
+)
+
+
+def get_detections(*boxes: tuple[float, float, float, float]) -> np.ndarray:
+    """Return detections (x1, y1, x2, y2, conf, cls) of persons."""
+    return np.array([[*box, 0.9, 0] for box in boxes], dtype=float).reshape(-1, 6)
+
+
+@pytest.mark.unit
+def test_get_cost_matrix() -> None:
+    """Should give low cost to overlapping boxes and gate far apart boxes."""
+    tracks = np.array([[0, 0, 10, 20], [100, 0, 110, 20]], dtype=float)
+    detections = np.array([[1, 0, 11, 20], [300, 0, 310, 20]], dtype=float)
+    cost = get_cost_matrix(tracks, detections, 0.3, 0.5)
+
+    assert cost.shape == (2, 2)
+    assert cost[0, 0] < 0.5
+    assert cost[0, 1] == GATED_COST
+    assert cost[1, 0] == GATED_COST
+    assert cost[1, 1] == GATED_COST
+
+
+@pytest.mark.unit
+def test_get_cost_matrix_centroid_close() -> None:
+    """Should not gate a box with low IoU if the centroid is close."""
+    tracks = np.array([[0, 0, 10, 40]], dtype=float)
+    detections = np.array([[8, 0, 18, 40]], dtype=float)
+    cost = get_cost_matrix(tracks, detections, 0.3, 0.5)
+    assert cost[0, 0] < GATED_COST
+
+
+@pytest.mark.unit
+def test_lap_tracker_keeps_ids() -> None:
+    """Should keep the id of each skier while moving."""
+    tracker = LapTracker()
+    first = tracker.update(get_detections((0, 0, 10, 20), (50, 0, 60, 20)))
+    second = tracker.update(get_detections((52, 2, 62, 22), (2, 2, 12, 22)))
+
+    assert first[:, 4].tolist() == [1, 2]
+    # detections in other order - ids follow the boxes, last column is the index
+    assert second[:, 4].tolist() == [2, 1]
+    assert second[:, 7].tolist() == [0, 1]
+
+
+@pytest.mark.unit
+def test_lap_tracker_predicts_fast_skier() -> None:
+    """Should match a fast skier by the predicted position after a missed frame."""
+    tracker = LapTracker()
+    for x in [0, 20, 40, 60]:
+        tracker.update(get_detections((x, 0, x + 10, 40)))
+    tracker.update(get_detections())
+    # too far from the last box to match without prediction
+    tracks = tracker.update(get_detections((100, 0, 110, 40)))
+    assert tracks[:, 4].tolist() == [1]
+
+
+@pytest.mark.unit
+def test_lap_tracker_removes_old_tracks() -> None:
+    """Should give a new id when the track is older than max age."""
+    tracker = LapTracker(max_age=2)
+    tracker.update(get_detections((0, 0, 10, 20)))
+    for _ in range(3):
+        tracker.update(get_detections())
+    tracks = tracker.update(get_detections((0, 0, 10, 20)))
+    assert tracks[:, 4].tolist() == [2]
+
+
+@pytest.mark.unit
+def test_lap_tracker_low_confidence_not_new_track() -> None:
+    """Should not start a track from a low confidence detection."""
+    tracker = LapTracker()
+    detections = get_detections((0, 0, 10, 20))
+    detections[:, 4] = 0.1
+    assert len(tracker.update(detections)) == 0
+
+
+@pytest.mark.unit
+def test_get_tracker() -> None:
+    """Should create lap tracker, raise on unknown name."""
+    assert isinstance(get_tracker("lap"), LapTracker)
+    with pytest.raises(ValueError, match="Unknown TRACKER"):
+        get_tracker("ultralytics")
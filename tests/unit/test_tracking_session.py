@@ -0,0 +1,47 @@
+"""Unit test cases for the tracking session parameters."""
+
+import pytest
+
+from vision_ai_service.services.tracking_session import (
+    get_crossing_time,
+    parse_trigger_line,
+)
+
+
+@pytest.mark.unit
+def test_get_crossing_time_interpolated() -> None:
+    """Should interpolate between the frame above and the frame below the line."""
+    # 0.02 above the line at 10.0, 0.06 below at 10.4 - crossed a quarter in
+    assert get_crossing_time((10.0, -0.02), 10.4, 0.06) == pytest.approx(10.1)
+
+
+@pytest.mark.unit
+def test_get_crossing_time_on_the_line() -> None:
+    """Should return the earlier frame time if the box was on the line."""
+    assert get_crossing_time((10.0, 0.0), 10.4, 0.05) == pytest.approx(10.0)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("previous", "line_offset"),
+    [
+        (None, 0.05),  # first seen below the line
+        ((10.0, 0.01), 0.05),  # already below in the last frame
+        ((10.0, -0.02), -0.03),  # moving up
+    ],
+)
+def test_get_crossing_time_frame_time(
+    previous: tuple[float, float] | None, line_offset: float
+) -> None:
+    """Should return the frame time when there is nothing to interpolate."""
+    assert get_crossing_time(previous, 10.4, line_offset) == 10.4
+
+
+@pytest.mark.unit
+def test_parse_trigger_line() -> None:
+    """Should parse 4 numbers, colon-separated."""
+    assert parse_trigger_line("0:0.7:1:0.75") == (0.0, 0.7, 1.0, 0.75)
+    with pytest.raises(ValueError, match="4 numbers"):
+        parse_trigger_line("0:0.7:1")
+    with pytest.raises(ValueError, match="Error reading"):
+        parse_trigger_line("0:0.7:1:x")
@@ -1,8 +1,32 @@
 """Package for all adapters."""
 
+from typing import TYPE_CHECKING, Any
+
+from .circuit_breaker import CircuitBreaker
 from .config_adapter import ConfigAdapter
 from .events_adapter import EventsAdapter
-from .exceptions import VideoStreamNotFoundError
+from .exceptions import (
+    BatchDetectorClosedError,
+    CircuitOpenError,
+    LoginExpiredError,
+    PhotoRejectedError,
+    VideoStreamNotFoundError,
+)
+from .exif_adapter import ExifAdapter
+from .photo_upload_adapter import PhotoUploadAdapter, PhotoUploader
 from .status_adapter import StatusAdapter
+from .token_manager import TokenManager
 from .user_adapter import UserAdapter
-from .vision_ai_service import VisionAIService
+
+if TYPE_CHECKING:
+    from .vision_ai_service import VisionAIService
+
+
+def __getattr__(name: str) -> Any:
+    """Import the vision stack (cv2, numpy) on first use only."""
+    if name == "VisionAIService":
+        from .vision_ai_service import VisionAIService
+
+        return VisionAIService
+    informasjon = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(informasjon)
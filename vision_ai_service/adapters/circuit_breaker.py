@@ -0,0 +1,99 @@
+"""Module for circuit breaker protecting calls to dependent services."""
+
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiohttp import ClientError
+
+from vision_ai_service.adapters.exceptions import CircuitOpenError
+
+FAILURE_THRESHOLD = 3
+BASE_DELAY = 2.0
+MAX_DELAY = 60.0
+OUTAGE_ERRORS = (ClientError, TimeoutError, OSError)
+
+
+class CircuitBreaker:
+    """Class representing a circuit breaker with exponential backoff.
+
+    The breaker opens after a number of consecutive outage errors (connection
+    failures and timeouts). While open, calls are rejected with
+    CircuitOpenError without touching the network. When the backoff delay has
+    passed one trial call is let through (half open) - success closes the
+    breaker, failure opens it again with a doubled delay.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+    ) -> None:
+        """Initialize the breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.open_count = 0
+        self.open_until = 0.0
+        self.trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        """Return breaker state - closed, open or half_open."""
+        if self.failures < self.failure_threshold:
+            return "closed"
+        if time.monotonic() < self.open_until:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        """Return seconds until the next call will be let through."""
+        return max(0.0, self.open_until - time.monotonic())
+
+    async def call(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Call func unless the breaker is open."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self.trial_in_progress):
+            retry_after = max(self.retry_after(), self.base_delay)
+            informasjon = f"{self.name} unavailable - retry in {retry_after:.1f}s."
+            raise CircuitOpenError(informasjon, retry_after)
+        if state == "half_open":
+            self.trial_in_progress = True
+        try:
+            result = await func(*args, **kwargs)
+        except OUTAGE_ERRORS:
+            self.record_failure()
+            raise
+        finally:
+            self.trial_in_progress = False
+        self.record_success()
+        return result
+
+    def record_failure(self) -> None:
+        """Register an outage error, open the breaker at the threshold."""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            delay = min(self.max_delay, self.base_delay * (2**self.open_count))
+            # jitter to avoid several instances retrying in lockstep
+            delay *= random.uniform(0.8, 1.2)  # noqa: S311
+            self.open_until = time.monotonic() + delay
+            self.open_count += 1
+            logging.warning(
+                f"Circuit {self.name} open - pausing calls for {delay:.1f}s."
+            )
+
+    def record_success(self) -> None:
+        """Register a successful call and close the breaker."""
+        if self.open_count:
+            logging.info(f"Circuit {self.name} closed - service is back.")
+        self.failures = 0
+        self.open_count = 0
+        self.open_until = 0.0
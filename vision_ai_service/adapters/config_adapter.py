@@ -10,6 +10,8 @@ from pathlib import Path
 from aiohttp import ClientSession, hdrs, web
 from multidict import MultiDict
 
+from vision_ai_service.adapters.exceptions import LoginExpiredError
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
@@ -30,15 +32,18 @@ class ConfigAdapter:
         )
         servicename = "get_config"
 
-        async with ClientSession() as session, session.get(
-            f"{PHOTO_SERVICE_URL}/config?key={key}&eventId={event_id}",
-            headers=headers,
-        ) as resp:
+        async with (
+            ClientSession() as session,
+            session.get(
+                f"{PHOTO_SERVICE_URL}/config?key={key}&eventId={event_id}",
+                headers=headers,
+            ) as resp,
+        ):
             if resp.status == HTTPStatus.OK:
                 config = await resp.json()
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
-                raise Exception(informasjon)
+                raise LoginExpiredError(informasjon)
             elif resp.status == HTTPStatus.NOT_FOUND:
                 # config not found - find default value
                 config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
@@ -74,15 +79,18 @@ class ConfigAdapter:
         else:
             url = f"{PHOTO_SERVICE_URL}/configs"
 
-        async with ClientSession() as session, session.get(
-            url,
-            headers=headers,
-        ) as resp:
+        async with (
+            ClientSession() as session,
+            session.get(
+                url,
+                headers=headers,
+            ) as resp,
+        ):
             if resp.status == HTTPStatus.OK:
                 config = await resp.json()
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
-                raise Exception(informasjon)
+                raise LoginExpiredError(informasjon)
             else:
                 body = await resp.json()
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
@@ -90,6 +98,44 @@ class ConfigAdapter:
                 raise web.HTTPBadRequest(reason=informasjon)
         return config
 
+    async def get_all_configs_if_changed(
+        self, token: str, event_id: str, etag: str
+    ) -> tuple[list | None, str]:
+        """Get all configs with a conditional request.
+
+        Returns (None, etag) if nothing has changed since etag was issued,
+        otherwise the configs and the new etag ("" if not supported).
+        """
+        headers = MultiDict(
+            [
+                (hdrs.CONTENT_TYPE, "application/json"),
+                (hdrs.AUTHORIZATION, f"Bearer {token}"),
+            ]
+        )
+        if etag:
+            headers.add(hdrs.IF_NONE_MATCH, etag)
+        servicename = "get_all_configs_if_changed"
+
+        async with (
+            ClientSession() as session,
+            session.get(
+                f"{PHOTO_SERVICE_URL}/configs?eventId={event_id}",
+                headers=headers,
+            ) as resp,
+        ):
+            if resp.status == HTTPStatus.NOT_MODIFIED:
+                return None, etag
+            if resp.status == HTTPStatus.OK:
+                configs = await resp.json()
+                return configs, resp.headers.get(hdrs.ETAG, "")
+            if resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"Login expired: {resp}"
+                raise LoginExpiredError(informasjon)
+            body = await resp.json()
+            informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
+            logging.error(informasjon)
+            raise web.HTTPBadRequest(reason=informasjon)
+
     async def get_config_bool(self, token: str, event_id: str, key: str) -> bool:
         """Get config boolean value."""
         string_value = await self.get_config(token, event_id, key)
@@ -110,7 +156,9 @@ class ConfigAdapter:
         # convert from json string to list
         return json.loads(string_value)
 
-    async def get_config_img_res_tuple(self, token: str, event_id: str, key: str) -> tuple:
+    async def get_config_img_res_tuple(
+        self, token: str, event_id: str, key: str
+    ) -> tuple:
         """Get config tuple value."""
         string_value = await self.get_config(token, event_id, key)
         try:
@@ -139,16 +187,19 @@ class ConfigAdapter:
         }
         request_body = copy.deepcopy(config)
 
-        async with ClientSession() as session, session.post(
-            f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
-        ) as resp:
+        async with (
+            ClientSession() as session,
+            session.post(
+                f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
+            ) as resp,
+        ):
             if resp.status == HTTPStatus.CREATED:
                 logging.debug(f"result - got response {resp}")
                 location = resp.headers[hdrs.LOCATION]
                 result = location.split(os.path.sep)[-1]
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
-                raise Exception(informasjon)
+                raise LoginExpiredError(informasjon)
             else:
                 body = await resp.json()
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
@@ -182,9 +233,12 @@ class ConfigAdapter:
             "value": new_value,
         }
 
-        async with ClientSession() as session, session.put(
-            f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
-        ) as resp:
+        async with (
+            ClientSession() as session,
+            session.put(
+                f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body
+            ) as resp,
+        ):
             response = str(resp.status)
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"update config - got response {resp}")
@@ -203,7 +257,7 @@ class ConfigAdapter:
                 raise web.HTTPBadRequest(reason=informasjon)
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
-                raise Exception(informasjon)
+                raise LoginExpiredError(informasjon)
             else:
                 body = await resp.json()
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
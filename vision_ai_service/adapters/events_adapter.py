@@ -10,6 +10,8 @@ from aiohttp import ClientSession, hdrs
 from dotenv import load_dotenv
 from multidict import MultiDict
 
+from vision_ai_service.adapters.exceptions import LoginExpiredError
+
 # get base settings
 load_dotenv()
 EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER", "localhost")
@@ -30,31 +32,36 @@ class EventsAdapter:
             ]
         )
 
-        async with ClientSession() as session, session.get(
-                f"{EVENT_SERVICE_URL}/events", headers=headers
-            ) as resp:
-                logging.debug(f"get_all_events - got response {resp.status}")
-                if resp.status == HTTPStatus.OK:
-                    events = await resp.json()
-                    logging.debug(f"events - got response {events}")
-                elif resp.status == HTTPStatus.UNAUTHORIZED:
-                    informasjon = f"Login expired: {resp}"
-                    raise Exception(informasjon)
-                else:
-                    informasjon = f"Error {resp.status} getting events: {resp} "
-                    logging.error(informasjon)
+        async with (
+            ClientSession() as session,
+            session.get(f"{EVENT_SERVICE_URL}/events", headers=headers) as resp,
+        ):
+            logging.debug(f"get_all_events - got response {resp.status}")
+            if resp.status == HTTPStatus.OK:
+                events = await resp.json()
+                logging.debug(f"events - got response {events}")
+            elif resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"Login expired: {resp}"
+                raise LoginExpiredError(informasjon)
+            else:
+                informasjon = f"Error {resp.status} getting events: {resp} "
+                logging.error(informasjon)
         return events
 
     def get_local_datetime_now(self, event: dict) -> datetime:
         """Return local datetime object, time zone adjusted from event info."""
         timezone = event["timezone"]
-        return datetime.now(ZoneInfo(timezone)) if timezone else datetime.now(timezone.utc)
+        return (
+            datetime.now(ZoneInfo(timezone)) if timezone else datetime.now(timezone.utc)
+        )
 
     def get_local_time(self, event: dict, time_format: str) -> str:
         """Return local time string, time zone adjusted from event info."""
         local_time = ""
         timezone = event["timezone"]
-        t_n = datetime.now(ZoneInfo(timezone)) if timezone else datetime.now(timezone.utc)
+        t_n = (
+            datetime.now(ZoneInfo(timezone)) if timezone else datetime.now(timezone.utc)
+        )
         if time_format == "HH:MM":
             local_time = f"{t_n.strftime('%H')}:{t_n.strftime('%M')}"
         elif time_format == "log":
@@ -8,3 +8,36 @@ class VideoStreamNotFoundError(Exception):
         """Initialize the error."""
         # Call the base class constructor with the parameters it needs
         super().__init__(message)
+
+
+class LoginExpiredError(Exception):
+    """Class representing an expired or rejected token (401)."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+
+
+class PhotoRejectedError(Exception):
+    """Class representing an upload refused by photo-service (4xx)."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+
+
+class BatchDetectorClosedError(Exception):
+    """Class representing a frame submitted to a closed batch detector."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+
+
+class CircuitOpenError(Exception):
+    """Class representing a call rejected by an open circuit breaker."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.retry_after = retry_after
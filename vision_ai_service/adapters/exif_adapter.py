@@ -0,0 +1,27 @@
+"""Module for exif adapter."""
+
+import json
+
+
+class ExifAdapter:
+    """Class representing image info in EXIF format."""
+
+    def get_image_info(
+        self, camera_location: str, time_text: str, precise_time_text: str | None = None
+    ) -> bytes:
+        """Create image info EXIF data.
+
+        passeringstid is kept to whole seconds, the interpolated crossing time
+        with milliseconds is added as passeringstid_presis when known.
+        """
+        # imported on first image, keeps the control plane import light
+        import piexif
+
+        # set the params
+        image_info = {"passeringspunkt": camera_location, "passeringstid": time_text}
+        if precise_time_text:
+            image_info["passeringstid_presis"] = precise_time_text
+
+        # create the EXIF data and convert to bytes
+        exif_dict = {"0th": {piexif.ImageIFD.ImageDescription: json.dumps(image_info)}}
+        return piexif.dump(exif_dict)
@@ -0,0 +1,39 @@
+"""Module for a shared, pooled HTTP client session."""
+
+import asyncio
+import logging
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+HTTP_POOL_SIZE = 20
+HTTP_TIMEOUT = 30
+
+_session: ClientSession | None = None
+_session_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_client_session() -> ClientSession:
+    """Return the pooled session, created on first use in the running loop.
+
+    Connections are kept alive and reused between calls, instead of a new
+    session (and TCP handshake) per request.
+    """
+    global _session, _session_loop  # noqa: PLW0603
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = ClientSession(
+            connector=TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300),
+            timeout=ClientTimeout(total=HTTP_TIMEOUT),
+        )
+        _session_loop = loop
+        logging.debug("Created pooled HTTP client session.")
+    return _session
+
+
+async def close_client_session() -> None:
+    """Close the pooled session, if any."""
+    global _session, _session_loop  # noqa: PLW0603
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
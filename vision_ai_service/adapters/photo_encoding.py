@@ -0,0 +1,136 @@
+"""Module for encoding of crossing photos.
+
+Photo settings are read per event: format (jpg or webp), quality, maximum
+dimension of the full frame and an optional downscaled preview. Photos are
+encoded in memory, EXIF is inserted in the encoded bytes and each file is
+written once.
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from vision_ai_service.adapters.config_adapter import ConfigAdapter
+
+PHOTO_FORMATS = {"jpg": cv2.IMWRITE_JPEG_QUALITY, "webp": cv2.IMWRITE_WEBP_QUALITY}
+PHOTO_QUALITY = 95  # OpenCV default for JPEG
+PREVIEW_DIMENSION = 320
+PREVIEW_QUALITY = 70
+MAX_QUALITY = 100
+
+
+@dataclass(frozen=True)
+class PhotoSettings:
+    """Class representing encoding settings of crossing photos."""
+
+    photo_format: str = "jpg"
+    quality: int = PHOTO_QUALITY
+    max_dimension: int = 0  # 0 keeps the original frame size
+    preview: bool = False
+    preview_dimension: int = PREVIEW_DIMENSION
+
+    def __post_init__(self) -> None:
+        """Validate settings."""
+        if self.photo_format not in PHOTO_FORMATS:
+            informasjon = f"PHOTO_FORMAT must be one of {list(PHOTO_FORMATS)}."
+            raise ValueError(informasjon)
+        if not 1 <= self.quality <= MAX_QUALITY:
+            informasjon = "PHOTO_QUALITY must be between 1 and 100."
+            raise ValueError(informasjon)
+        if self.max_dimension < 0 or self.preview_dimension < 1:
+            informasjon = (
+                "PHOTO_MAX_DIMENSION and PHOTO_PREVIEW_DIMENSION must be positive."
+            )
+            raise ValueError(informasjon)
+
+
+async def load_photo_settings(token: str, event_id: str) -> PhotoSettings:
+    """Load photo settings of an event, creating defaults if missing."""
+    return PhotoSettings(
+        photo_format=await ConfigAdapter().get_config(token, event_id, "PHOTO_FORMAT"),
+        quality=await ConfigAdapter().get_config_int(token, event_id, "PHOTO_QUALITY"),
+        max_dimension=await ConfigAdapter().get_config_int(
+            token, event_id, "PHOTO_MAX_DIMENSION"
+        ),
+        preview=await ConfigAdapter().get_config_bool(token, event_id, "PHOTO_PREVIEW"),
+        preview_dimension=await ConfigAdapter().get_config_int(
+            token, event_id, "PHOTO_PREVIEW_DIMENSION"
+        ),
+    )
+
+
+def resize_to_max(im: np.ndarray, max_dimension: int) -> np.ndarray:
+    """Downscale image so the longest side is at most max_dimension."""
+    height, width = im.shape[:2]
+    scale = max_dimension / max(height, width)
+    if max_dimension <= 0 or scale >= 1:
+        return im
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(im, size, interpolation=cv2.INTER_AREA)
+
+
+def encode_image(im: np.ndarray, photo_format: str, quality: int) -> bytes:
+    """Encode image (BGR) in memory."""
+    ok, buffer = cv2.imencode(
+        f".{photo_format}", im, [PHOTO_FORMATS[photo_format], quality]
+    )
+    if not ok:
+        informasjon = f"Error encoding image as {photo_format}."
+        raise ValueError(informasjon)
+    return buffer.tobytes()
+
+
+def insert_exif(data: bytes, exif_bytes: bytes) -> bytes:
+    """Insert EXIF in encoded JPEG or WebP bytes."""
+    # imported on first image, keeps the control plane import light
+    import piexif
+
+    output = io.BytesIO()
+    piexif.insert(exif_bytes, data, output)
+    return output.getvalue()
+
+
+def encode_photo(
+    im: np.ndarray,
+    crop_im: np.ndarray,
+    file_name: str,
+    settings: PhotoSettings,
+    exif_bytes: bytes | None = None,
+) -> dict[str, bytes]:
+    """Encode photo, crop montage and preview, return bytes per file name.
+
+    The preview is kept as JPEG - it is small and shown in lists.
+    """
+    image = encode_image(
+        resize_to_max(im, settings.max_dimension),
+        settings.photo_format,
+        settings.quality,
+    )
+    if exif_bytes:
+        try:
+            image = insert_exif(image, exif_bytes)
+        except Exception as e:
+            informasjon = f"vision_ai_service - Error inserting EXIF: {e}"
+            logging.exception(informasjon)
+    photos = {
+        file_name: image,
+        f"{file_name}_crop.{settings.photo_format}": encode_image(
+            crop_im, settings.photo_format, settings.quality
+        ),
+    }
+    if settings.preview:
+        photos[f"{file_name}_preview.jpg"] = encode_image(
+            resize_to_max(im, settings.preview_dimension), "jpg", PREVIEW_QUALITY
+        )
+    return photos
+
+
+def write_photos(photos: dict[str, bytes]) -> int:
+    """Write encoded photos to file, return number of bytes written."""
+    for file_name, data in photos.items():
+        Path(file_name).write_bytes(data)
+    return sum(len(data) for data in photos.values())
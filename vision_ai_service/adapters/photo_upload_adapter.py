@@ -0,0 +1,338 @@
+"""Module for direct upload of crossing photos to photo-service.
+
+Photos are queued from the analytics thread and uploaded by a few workers in
+the event loop over the pooled HTTP client. Failed uploads are retried with
+backoff, and spooled to disk when photo-service is down. The spool is
+uploaded again when the service is back. Uploads refused by photo-service
+(4xx) will not be accepted on retry, and are moved to the rejected directory
+of the spool, so they do not block the spool.
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import os
+import random
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aiohttp import FormData, hdrs
+from dotenv import load_dotenv
+
+from vision_ai_service.adapters.exceptions import LoginExpiredError, PhotoRejectedError
+from vision_ai_service.adapters.http_client import get_client_session
+
+if TYPE_CHECKING:
+    from vision_ai_service.adapters.token_manager import TokenManager
+
+# get base settings
+load_dotenv()
+PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
+PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
+PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
+UPLOAD_CONCURRENCY = 4
+QUEUE_SIZE = 100
+MAX_ATTEMPTS = 4
+BASE_DELAY = 0.5
+MAX_DELAY = 10.0
+SPOOL_RETRY_INTERVAL = 30.0
+CLOSE_TIMEOUT = 30.0
+LATENCY_SAMPLES = 1000
+CONTENT_TYPES = {".jpg": "image/jpeg", ".webp": "image/webp"}
+METADATA_FILE = "metadata.json"
+REJECTED_DIR = ".rejected"
+
+
+@dataclass
+class PhotoUpload:
+    """Class representing the encoded files and metadata of one crossing."""
+
+    photos: dict[str, bytes]
+    metadata: dict
+    created: float = field(default_factory=time.monotonic)
+
+
+class PhotoUploadAdapter:
+    """Class representing the photo upload endpoint of photo-service."""
+
+    async def upload_photo(
+        self, token: str, event_id: str, upload: PhotoUpload
+    ) -> None:
+        """Upload photo, crop and preview with metadata as one multipart request."""
+        servicename = "upload_photo"
+        form = FormData()
+        form.add_field(
+            "metadata",
+            json.dumps({"event_id": event_id, **upload.metadata}),
+            content_type="application/json",
+        )
+        for file_name, data in upload.photos.items():
+            form.add_field(
+                "file",
+                data,
+                filename=Path(file_name).name,
+                content_type=CONTENT_TYPES.get(Path(file_name).suffix, "image/jpeg"),
+            )
+        async with get_client_session().post(
+            f"{PHOTO_SERVICE_URL}/photos/upload",
+            data=form,
+            headers={hdrs.AUTHORIZATION: f"Bearer {token}"},
+        ) as resp:
+            if resp.status in [HTTPStatus.OK, HTTPStatus.CREATED]:
+                return
+            if resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"Login expired: {resp}"
+                raise LoginExpiredError(informasjon)
+            informasjon = f"{servicename} failed - {resp.status} - {await resp.text()}"
+            if HTTPStatus.BAD_REQUEST <= resp.status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                raise PhotoRejectedError(informasjon)
+            raise Exception(informasjon)
+
+
+class PhotoUploader:
+    """Class uploading crossing photos with bounded concurrency.
+
+    submit is called from the analytics thread, the workers run in the event
+    loop. A full queue, or an upload failing MAX_ATTEMPTS times, sends the
+    photo to the spool directory instead. The token is taken from the token
+    manager for each upload, so a long session outlives its first token.
+    Each uploader drains its own spool directory.
+    """
+
+    def __init__(
+        self,
+        token_manager: "TokenManager",
+        event_id: str,
+        spool_path: str,
+        concurrency: int = UPLOAD_CONCURRENCY,
+        queue_size: int = QUEUE_SIZE,
+    ) -> None:
+        """Initialize uploader."""
+        self.token_manager = token_manager
+        self.event_id = event_id
+        self.spool_path = spool_path
+        self.concurrency = concurrency
+        self.queue: asyncio.Queue[PhotoUpload] = asyncio.Queue(queue_size)
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.tasks: list[asyncio.Task] = []
+        self.uploads: dict[int, PhotoUpload] = {}
+        self.latencies: collections.deque[float] = collections.deque(
+            maxlen=LATENCY_SAMPLES
+        )
+        self.counts = {
+            "uploaded": 0,
+            "retried": 0,
+            "spooled": 0,
+            "unspooled": 0,
+            "rejected": 0,
+        }
+        self.closed = False
+        # set when a round of the spool retry loop leaves the spool empty
+        self.spool_empty = asyncio.Event()
+
+    async def start(self) -> None:
+        """Start upload workers and the spool retry loop in the running loop."""
+        self.loop = asyncio.get_running_loop()
+        Path(self.spool_path).mkdir(parents=True, exist_ok=True)
+        self.tasks = [
+            asyncio.create_task(self.work(), name=f"photo_upload_{i}")
+            for i in range(self.concurrency)
+        ]
+        self.tasks.append(asyncio.create_task(self.retry_spool(), name="photo_spool"))
+        logging.info(
+            f"Photo upload to {PHOTO_SERVICE_URL} started - {self.get_spool_depth()} "
+            "spooled photos."
+        )
+
+    def submit(self, photos: dict[str, bytes], metadata: dict) -> None:
+        """Queue photo for upload - called from the analytics thread."""
+        upload = PhotoUpload(photos, metadata)
+        if self.closed or self.loop is None or self.queue.full():
+            self.spool(upload)
+            return
+        self.loop.call_soon_threadsafe(self.enqueue, upload)
+
+    def enqueue(self, upload: PhotoUpload) -> None:
+        """Put upload in the queue, spool if closed or the queue filled up meanwhile."""
+        if not self.closed:
+            try:
+                self.queue.put_nowait(upload)
+            except asyncio.QueueFull:
+                pass
+            else:
+                return
+        asyncio.get_running_loop().run_in_executor(None, self.spool, upload)
+
+    async def work(self) -> None:
+        """Upload queued photos until cancelled."""
+        while True:
+            upload = await self.queue.get()
+            self.uploads[id(upload)] = upload
+            try:
+                await self.deliver(upload)
+            finally:
+                self.uploads.pop(id(upload), None)
+                self.queue.task_done()
+
+    async def deliver(self, upload: PhotoUpload) -> None:
+        """Upload with retry and backoff, spool after the last attempt."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                await self.token_manager.call(
+                    PhotoUploadAdapter().upload_photo, self.event_id, upload
+                )
+            except PhotoRejectedError as e:
+                logging.warning(f"Photo upload rejected, moved to {REJECTED_DIR}: {e}")
+                self.uploads.pop(id(upload), None)
+                await asyncio.to_thread(self.reject, upload)
+                return
+            except Exception as e:
+                if attempt == MAX_ATTEMPTS - 1:
+                    logging.warning(f"Photo upload failed, spooling: {e}")
+                    self.uploads.pop(id(upload), None)
+                    await asyncio.to_thread(self.spool, upload)
+                    return
+                self.counts["retried"] += 1
+                delay = min(MAX_DELAY, BASE_DELAY * (2**attempt))
+                # jitter to avoid the workers retrying in lockstep
+                await asyncio.sleep(delay * random.uniform(0.8, 1.2))  # noqa: S311
+            else:
+                self.counts["uploaded"] += 1
+                self.latencies.append(time.monotonic() - upload.created)
+                return
+
+    def spool(self, upload: PhotoUpload) -> None:
+        """Write upload to the spool directory."""
+        if write_upload(upload, Path(self.spool_path)):
+            self.counts["spooled"] += 1
+
+    def reject(self, upload: PhotoUpload) -> None:
+        """Write upload refused by photo-service to the rejected directory."""
+        write_upload(upload, Path(self.spool_path) / REJECTED_DIR)
+        self.counts["rejected"] += 1
+
+    def quarantine(self, path: Path) -> None:
+        """Move a spooled upload refused by photo-service to the rejected directory."""
+        rejected_path = Path(self.spool_path) / REJECTED_DIR
+        rejected_path.mkdir(exist_ok=True)
+        try:
+            path.rename(rejected_path / path.name)
+        except OSError:
+            # rejected before with the same name
+            path.rename(rejected_path / f"{path.name}.{uuid.uuid4().hex}")
+        self.counts["rejected"] += 1
+
+    def get_spooled(self) -> list[Path]:
+        """Return complete spooled uploads, oldest first."""
+        spool_path = Path(self.spool_path)
+        if not spool_path.exists():
+            return []
+        return sorted(
+            (path for path in spool_path.iterdir() if not path.name.startswith(".")),
+            key=lambda path: path.stat().st_mtime,
+        )
+
+    def get_spool_depth(self) -> int:
+        """Return number of spooled uploads."""
+        return len(self.get_spooled())
+
+    async def retry_spool(self) -> None:
+        """Upload spooled photos, oldest first, while photo-service answers."""
+        while True:
+            for path in await asyncio.to_thread(self.get_spooled):
+                try:
+                    upload = await asyncio.to_thread(load_spooled, path)
+                    await self.token_manager.call(
+                        PhotoUploadAdapter().upload_photo, self.event_id, upload
+                    )
+                except (PhotoRejectedError, ValueError) as e:
+                    # refused or unreadable - set aside, go on with the next
+                    logging.warning(
+                        f"Spooled photo {path.name} moved to {REJECTED_DIR}: {e}"
+                    )
+                    await asyncio.to_thread(self.quarantine, path)
+                    continue
+                except Exception as e:
+                    logging.debug(f"Spooled photo not uploaded yet: {e}")
+                    break
+                await asyncio.to_thread(shutil.rmtree, path)
+                self.counts["unspooled"] += 1
+            if await asyncio.to_thread(self.get_spool_depth):
+                self.spool_empty.clear()
+            else:
+                self.spool_empty.set()
+            logging.info(f"Photo upload: {self.get_stats()}")
+            await asyncio.sleep(SPOOL_RETRY_INTERVAL)
+
+    def get_stats(self) -> dict:
+        """Return upload counts, queue and spool depth and latency percentiles (ms)."""
+        latencies = sorted(self.latencies)
+        stats: dict = {
+            **self.counts,
+            "queue_depth": self.queue.qsize(),
+            "spool_depth": self.get_spool_depth(),
+        }
+        if latencies:
+            stats["latency_p50_ms"] = round(latencies[len(latencies) // 2] * 1000, 1)
+            stats["latency_p95_ms"] = round(
+                latencies[int(len(latencies) * 0.95)] * 1000, 1
+            )
+            stats["latency_max_ms"] = round(latencies[-1] * 1000, 1)
+        return stats
+
+    async def close(self) -> dict:
+        """Finish queued uploads, spool what is left after CLOSE_TIMEOUT."""
+        self.closed = True
+        try:
+            async with asyncio.timeout(CLOSE_TIMEOUT):
+                await self.queue.join()
+        except TimeoutError:
+            logging.warning("Photo upload not finished - spooling the rest.")
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        # uploads in progress when cancelled, and those not started
+        left = list(self.uploads.values())
+        while not self.queue.empty():
+            left.append(self.queue.get_nowait())
+        for upload in left:
+            await asyncio.to_thread(self.spool, upload)
+        stats = self.get_stats()
+        logging.info(f"Photo upload finished: {stats}")
+        return stats
+
+
+def write_upload(upload: PhotoUpload, directory: Path) -> bool:
+    """Write upload to directory, renamed in place when complete.
+
+    Return False if it was already there.
+    """
+    name = Path(next(iter(upload.photos))).name
+    temp_path = directory / f".{name}.{uuid.uuid4().hex}"
+    temp_path.mkdir(parents=True)
+    for file_name, data in upload.photos.items():
+        (temp_path / Path(file_name).name).write_bytes(data)
+    (temp_path / METADATA_FILE).write_text(json.dumps(upload.metadata))
+    try:
+        temp_path.rename(directory / name)
+    except OSError:
+        shutil.rmtree(temp_path)
+        return False
+    return True
+
+
+def load_spooled(path: Path) -> PhotoUpload:
+    """Read a spooled upload from its directory."""
+    metadata = json.loads((path / METADATA_FILE).read_text())
+    photos = {
+        file_path.name: file_path.read_bytes()
+        for file_path in sorted(path.iterdir())
+        if file_path.name != METADATA_FILE
+    }
+    return PhotoUpload(photos, metadata)
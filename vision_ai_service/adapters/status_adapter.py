@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 from multidict import MultiDict
 
 from vision_ai_service.adapters.events_adapter import EventsAdapter
+from vision_ai_service.adapters.exceptions import LoginExpiredError
 
 # get base settings
 load_dotenv()
@@ -32,20 +33,23 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
+        async with (
+            ClientSession() as session,
+            session.get(
                 f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event['id']}",
                 headers=headers,
-            ) as resp:
-                if resp.status == HTTPStatus.OK:
-                    status = await resp.json()
-                elif resp.status == HTTPStatus.UNAUTHORIZED:
-                    informasjon = f"Login expired: {resp}"
-                    raise Exception(informasjon)
-                else:
-                    body = await resp.json()
-                    informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
-                    logging.error(informasjon)
-                    raise Exception(informasjon)
+            ) as resp,
+        ):
+            if resp.status == HTTPStatus.OK:
+                status = await resp.json()
+            elif resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"Login expired: {resp}"
+                raise LoginExpiredError(informasjon)
+            else:
+                body = await resp.json()
+                informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
+                logging.error(informasjon)
+                raise Exception(informasjon)
         return status
 
     async def get_status_by_type(
@@ -61,20 +65,23 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
+        async with (
+            ClientSession() as session,
+            session.get(
                 f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event['id']}&type={status_type}",
                 headers=headers,
-            ) as resp:
-                if resp.status == HTTPStatus.OK:
-                    status = await resp.json()
-                elif resp.status == HTTPStatus.UNAUTHORIZED:
-                    informasjon = f"Login expired: {resp}"
-                    raise Exception(informasjon)
-                else:
-                    body = await resp.json()
-                    informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
-                    logging.error(informasjon)
-                    raise Exception(informasjon)
+            ) as resp,
+        ):
+            if resp.status == HTTPStatus.OK:
+                status = await resp.json()
+            elif resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"Login expired: {resp}"
+                raise LoginExpiredError(informasjon)
+            else:
+                body = await resp.json()
+                informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
+                logging.error(informasjon)
+                raise Exception(informasjon)
         return status
 
     async def create_status(
@@ -98,21 +105,25 @@ class StatusAdapter:
         }
         request_body = copy.deepcopy(status_dict)
 
-        async with ClientSession() as session, session.post(
+        async with (
+            ClientSession() as session,
+            session.post(
                 f"{PHOTO_SERVICE_URL}/status", headers=headers, json=request_body
-            ) as resp:
-                if resp.status == HTTPStatus.CREATED:
-                    logging.debug(f"result - got response {resp}")
-                    location = resp.headers[hdrs.LOCATION]
-                    result = location.split(os.path.sep)[-1]
-                elif resp.status == HTTPStatus.UNAUTHORIZED:
-                    raise web.HTTPBadRequest(reason=f"401 Unathorized - {servicename}")
-                else:
-                    body = await resp.json()
-                    logging.error(f"{servicename} failed - {resp.status} - {body}")
-                    raise web.HTTPBadRequest(
-                        reason=f"Error - {resp.status}: {body['detail']}."
-                    )
+            ) as resp,
+        ):
+            if resp.status == HTTPStatus.CREATED:
+                logging.debug(f"result - got response {resp}")
+                location = resp.headers[hdrs.LOCATION]
+                result = location.split(os.path.sep)[-1]
+            elif resp.status == HTTPStatus.UNAUTHORIZED:
+                informasjon = f"401 Unathorized - {servicename}"
+                raise LoginExpiredError(informasjon)
+            else:
+                body = await resp.json()
+                logging.error(f"{servicename} failed - {resp.status} - {body}")
+                raise web.HTTPBadRequest(
+                    reason=f"Error - {resp.status}: {body['detail']}."
+                )
 
         return result
 
@@ -126,7 +137,10 @@ class StatusAdapter:
             ]
         )
         url = f"{PHOTO_SERVICE_URL}/status?event_id={event['id']}"
-        async with ClientSession() as session, session.delete(url, headers=headers) as resp:
+        async with (
+            ClientSession() as session,
+            session.delete(url, headers=headers) as resp,
+        ):
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"result - got response {resp}")
             else:
@@ -0,0 +1,99 @@
+"""Module for token lifecycle management."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import jwt
+
+from vision_ai_service.adapters.circuit_breaker import CircuitBreaker
+from vision_ai_service.adapters.exceptions import LoginExpiredError
+from vision_ai_service.adapters.user_adapter import UserAdapter
+
+REFRESH_MARGIN = 60  # seconds before expiry to fetch a new token
+
+
+class TokenManager:
+    """Class representing a self refreshing login token.
+
+    The expiry is decoded from the JWT and a new token is fetched shortly
+    before it runs out. Calls made through call() are re-tried once with a
+    fresh token if a dependent service answers 401, and are routed through a
+    circuit breaker so an outage does not lead to a request storm.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        refresh_margin: int = REFRESH_MARGIN,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        """Initialize the token manager."""
+        self.username = username
+        self.password = password
+        self.refresh_margin = refresh_margin
+        self.breaker = breaker or CircuitBreaker("services")
+        self.token = ""
+        self.expires_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def is_expiring(self) -> bool:
+        """Check if the token is missing or about to expire."""
+        if not self.token:
+            return True
+        if self.expires_at is None:
+            return False
+        return time.time() > self.expires_at - self.refresh_margin
+
+    async def get_token(self) -> str:
+        """Return a valid token, refresh proactively before expiry."""
+        if self.is_expiring():
+            return await self.refresh(self.token)
+        return self.token
+
+    async def refresh(self, stale_token: str = "") -> str:
+        """Login again unless another caller already replaced stale_token."""
+        async with self._lock:
+            if self.token and self.token != stale_token and not self.is_expiring():
+                return self.token
+            token = await self.breaker.call(
+                UserAdapter().login, self.username, self.password
+            )
+            if not token:
+                informasjon = f"Login failed for user {self.username}."
+                raise LoginExpiredError(informasjon)
+            self.token = token
+            self.expires_at = get_token_expiry(token)
+            logging.debug(f"New token - expires at {self.expires_at}")
+        return self.token
+
+    async def call(
+        self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Call an adapter function with a valid token as first argument.
+
+        A 401 from the service triggers one new login and a transparent retry.
+        """
+        token = await self.get_token()
+        try:
+            return await self.breaker.call(func, token, *args, **kwargs)
+        except LoginExpiredError:
+            logging.info("Token rejected - logging in again.")
+            token = await self.refresh(token)
+            return await self.breaker.call(func, token, *args, **kwargs)
+
+
+def get_token_expiry(token: str) -> float | None:
+    """Return expiry (epoch seconds) from the JWT, None if not present."""
+    try:
+        claims = jwt.decode(
+            token, options={"verify_signature": False, "verify_exp": False}
+        )
+    except jwt.PyJWTError as e:
+        logging.debug(f"Unable to decode token expiry: {e}")
+        return None
+    exp = claims.get("exp")
+    return float(exp) if exp is not None else None
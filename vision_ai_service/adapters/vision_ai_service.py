@@ -1,35 +1,40 @@
 """Module for status adapter."""
 
 import datetime
-import json
 import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import cv2
 import numpy as np
-import piexif
-from torch import Tensor
-from ultralytics.engine.results import Results
 
 from vision_ai_service.adapters.config_adapter import ConfigAdapter
+from vision_ai_service.adapters.exif_adapter import ExifAdapter
+from vision_ai_service.adapters.photo_encoding import (
+    PhotoSettings,
+    encode_photo,
+    write_photos,
+)
 from vision_ai_service.adapters.status_adapter import StatusAdapter
 
+if TYPE_CHECKING:
+    from torch import Tensor
+
+    from vision_ai_service.adapters.photo_upload_adapter import PhotoUploader
+
 COUNT_COORDINATES = 4
 
 
 class VisionAIService:
     """Class representing vision ai services."""
 
-    def get_crop_image(self, im: np.ndarray, xyxy: Tensor) -> np.ndarray:
+    def get_crop_image(self, im: np.ndarray, xyxy: "Tensor") -> np.ndarray:
         """Get cropped image."""
         x1, y1, x2, y2 = map(int, xyxy.tolist())  # Ensure integer coordinates
         return im[y1:y2, x1:x2]  # Cropping in OpenCV (NumPy array slicing)
 
-    def save_crop_images(
-        self,
-        image_list: list[np.ndarray],
-        file_name: str,
-    ) -> None:
-        """Save all crop images in one image file."""
+    def get_crop_montage(self, image_list: list[np.ndarray]) -> np.ndarray:
+        """Combine crop images side by side, padded to the same height."""
         # OpenCV uses NumPy arrays, so concatenate horizontally
         max_height = max(img.shape[0] for img in image_list)
         padded_images = []
@@ -45,13 +50,11 @@ class VisionAIService:
                 left,
                 right,
                 cv2.BORDER_CONSTANT,
-                value=[255, 255, 255]
+                value=[255, 255, 255],
             )
             padded_images.append(padded_img)
 
-        combined_image = np.concatenate(padded_images, axis=1)
-        crop_file_name = f"{file_name}_crop.jpg"
-        cv2.imwrite(crop_file_name, combined_image)
+        return np.concatenate(padded_images, axis=1)
 
     async def check_stop_tracking(
         self, token: str, event: dict, status_type: str
@@ -73,14 +76,13 @@ class VisionAIService:
             return True
         return False
 
-    def get_image_info(self, camera_location: str, time_text: str) -> bytes:
+    def get_image_info(
+        self, camera_location: str, time_text: str, precise_time_text: str | None = None
+    ) -> bytes:
         """Create image info EXIF data."""
-        # set the params
-        image_info = {"passeringspunkt": camera_location, "passeringstid": time_text}
-
-        # create the EXIF data and convert to bytes
-        exif_dict = {"0th": {piexif.ImageIFD.ImageDescription: json.dumps(image_info)}}
-        return piexif.dump(exif_dict)
+        return ExifAdapter().get_image_info(
+            camera_location, time_text, precise_time_text
+        )
 
     async def get_trigger_line_xyxy_list(self, token: str, event: dict) -> list:
         """Get list of trigger line coordinates."""
@@ -92,7 +94,7 @@ class VisionAIService:
         try:
             trigger_line_xyxy_list = [float(i) for i in trigger_line_xyxy.split(":")]
         except Exception as e:
-            informasjon  = f"Error reading TRIGGER_LINE_XYXYN: {e}"
+            informasjon = f"Error reading TRIGGER_LINE_XYXYN: {e}"
             logging.exception(informasjon)
             raise Exception(informasjon) from e
 
@@ -105,32 +107,42 @@ class VisionAIService:
 
     def save_image(
         self,
-        result: Results,
+        im: np.ndarray,
         camera_location: str,
         photos_file_path: str,
         d_id: int,
         crossings: dict,
-        xyxy: Tensor,
-    ) -> None:
-        """Save image and crop_images to file."""
+        xyxy: "Tensor | np.ndarray",
+        crossing_time: float | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: "PhotoUploader | None" = None,
+    ) -> str:
+        """Save image, crop images and preview, return file name of the image.
+
+        The image is the frame selected for the crossing. The crossing time
+        (epoch seconds) is interpolated from frame capture times, the time of
+        saving is used if not given. Format, quality and size are given by the
+        photo settings of the event. With an uploader the photos are sent to
+        photo-service instead of written to file.
+        """
         logging.info(f"Line crossing! ID:{d_id} {photos_file_path}")
-        current_time = datetime.datetime.now(datetime.UTC)
+        settings = photo_settings or PhotoSettings()
+        if crossing_time is None:
+            current_time = datetime.datetime.now(datetime.UTC)
+        else:
+            current_time = datetime.datetime.fromtimestamp(crossing_time, datetime.UTC)
         time_text = current_time.strftime("%Y%m%d %H:%M:%S")
-
-        # save image to file - full size
+        precise_time_text = current_time.isoformat(timespec="milliseconds")
         timestamp = current_time.strftime("%Y%m%d_%H%M%S")
-        file_name = f"{photos_file_path}/{camera_location}_{timestamp}_{d_id}.jpg"
-        cv2.imwrite(f"{file_name}", result.orig_img)
-
-        # Now insert the EXIF data using piexif
-        try:
-            exif_bytes = VisionAIService().get_image_info(camera_location, time_text)
-            piexif.insert(exif_bytes, file_name)
-        except Exception as e:
-            informasjon = f"vision_ai_service - Error inserting EXIF: {e}"
-            logging.exception(informasjon)
+        file_name = (
+            f"{photos_file_path}/{camera_location}_{timestamp}_{d_id}"
+            f".{settings.photo_format}"
+        )
+        exif_bytes = VisionAIService().get_image_info(
+            camera_location, time_text, precise_time_text
+        )
 
-        # save crop images
+        # crop images
         crop_im_list = []
         if d_id in crossings["80"]:
             crop_im_list.append(crossings["80"][d_id])
@@ -139,9 +151,27 @@ class VisionAIService:
             crop_im_list.append(crossings["90"][d_id])
             crossings["90"].pop(d_id)
         # add crop of saved image (100)
-        crop_im_list.append(VisionAIService().get_crop_image(result.orig_img, xyxy))
+        crop_im_list.append(VisionAIService().get_crop_image(im, xyxy))
 
-        VisionAIService().save_crop_images(
-            crop_im_list,
+        # encode in memory with EXIF, then write each file once
+        photos = encode_photo(
+            im,
+            VisionAIService().get_crop_montage(crop_im_list),
             file_name,
+            settings,
+            exif_bytes,
         )
+        if uploader:
+            uploader.submit(
+                photos,
+                {
+                    "file_name": Path(file_name).name,
+                    "passeringspunkt": camera_location,
+                    "passeringstid": time_text,
+                    "passeringstid_presis": precise_time_text,
+                    "track_id": d_id,
+                },
+            )
+        else:
+            write_photos(photos)
+        return file_name
@@ -1,21 +1,53 @@
 """Module for application looking at video and detecting line crossings."""
 
 import asyncio
+import contextlib
+import functools
 import logging
 import os
+import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from aiohttp import ClientError, web
 from dotenv import load_dotenv
 
 from vision_ai_service.adapters import (
+    CircuitOpenError,
     ConfigAdapter,
-    EventsAdapter,
     StatusAdapter,
-    UserAdapter,
+    TokenManager,
 )
-from vision_ai_service.services import VideoAIService
+from vision_ai_service.adapters.http_client import close_client_session
+from vision_ai_service.services.camera_leases import (
+    RENEW_INTERVAL,
+    CameraLeases,
+    get_camera_capacity,
+    get_cameras,
+    get_instance_id,
+)
+from vision_ai_service.services.config_watcher import ConfigWatcher
+from vision_ai_service.services.control_service import ControlService
+from vision_ai_service.services.profiler import Profiler
 from vision_ai_service.services.simulate_service import SimulateService
+from vision_ai_service.services.startup_service import StartupService
+from vision_ai_service.services.task_supervisor import STOP_GRACE_PERIOD, TaskSupervisor
+from vision_ai_service.services.tracking_session import TrackingSession
+from vision_ai_service.views import (
+    AnalyticsStart,
+    AnalyticsStop,
+    Health,
+    ProfilingStart,
+    Ready,
+    SimulationStart,
+    TriggerLine,
+)
+from vision_ai_service.views.health import CONTROL_SERVICE_KEY
+
+if TYPE_CHECKING:
+    from vision_ai_service.services.batch_detector import BatchDetector
+    from vision_ai_service.services.video_ai_service import VideoAIService
 
 # get base settings
 load_dotenv()
@@ -23,187 +55,633 @@ CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 photos_file_path = f"{Path.cwd()}/vision_ai_service/files"
 event = {"id": ""}
 status_type = ""
-STATUS_INTERVAL = 60
+STATUS_INTERVAL = 120  # seconds between ready heartbeats
+# the commands are not authenticated - local access only by default
+CONTROL_HOST = os.getenv("CONTROL_HOST", "127.0.0.1")
+CONTROL_PORT = int(os.getenv("CONTROL_PORT", "8080"))
+# load the model at startup, else on the first analytics or trigger line request
+WARM_UP_MODEL = os.getenv("WARM_UP_MODEL", "False") == "True"
+# dependent services are down - logged, retried on the next round
+SERVICE_ERRORS = (CircuitOpenError, ClientError, TimeoutError)
 
-# set up logging
 LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO")
-logging.basicConfig(
-    level=LOGGING_LEVEL,
-    format="%(asctime)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-# Separate logging for errors
-file_handler = RotatingFileHandler("error.log", maxBytes=1024 * 1024, backupCount=5)
-file_handler.setLevel(logging.ERROR)
-# Create a formatter with the desired format
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(formatter)
-logging.getLogger().addHandler(file_handler)
+
+
+def setup_logging() -> None:
+    """Set up logging, with errors also in error.log.
+
+    Called on start only - worker processes of the simulation import this
+    module again, and must not rotate the same log file.
+    """
+    logging.basicConfig(
+        level=LOGGING_LEVEL,
+        format="%(asctime)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    # Separate logging for errors
+    file_handler = RotatingFileHandler("error.log", maxBytes=1024 * 1024, backupCount=5)
+    file_handler.setLevel(logging.ERROR)
+    # Create a formatter with the desired format
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    file_handler.setFormatter(formatter)
+    logging.getLogger().addHandler(file_handler)
 
 
 async def main() -> None:
     """CLI for analysing video stream."""
-    token = ""
     event = {}
     status_type = ""
-    i = STATUS_INTERVAL
+    token_manager = TokenManager(
+        os.getenv("ADMIN_USERNAME", "a"), os.getenv("ADMIN_PASSWORD", ".")
+    )
+    supervisor = TaskSupervisor()
+    control_service = ControlService(supervisor)
+    control_runner = await start_control_server(control_service)
+    camera_leases = None
     try:
-        # login to data-source
-        token = await do_login()
-        event = await get_event(token)
-        information = (
-            f"vision-ai-service is ready! - {event['name']}, {event['date_of_event']}"
+        # login, find event and load model if warm-up is on - service ready!
+        startup_service = StartupService()
+        event, status_type = await startup_service.start(
+            token_manager, warm_up_vision_model if WARM_UP_MODEL else None
         )
-        status_type = await ConfigAdapter().get_config(
-            token, event["id"], "VIDEO_ANALYTICS_STATUS_TYPE"
+        control_service.event = event
+        control_service.ready = True
+        supervisor.on_error = functools.partial(
+            report_job_error, token_manager, event, status_type
         )
-        await StatusAdapter().create_status(
-            token, event, status_type, information
+        # cameras are shared with other instances through leases
+        camera_leases = CameraLeases(
+            token_manager,
+            event["id"],
+            get_instance_id(),
+            get_camera_capacity(startup_service.inference_seconds),
+        )
+        await run_control_loop(
+            token_manager,
+            event,
+            status_type,
+            supervisor,
+            control_service,
+            camera_leases,
+        )
+    except Exception as e:
+        logging.exception("Critical error.")
+        await create_status(
+            token_manager,
+            event,
+            status_type,
+            f"Critical Error - exiting program: {e}",
         )
+    control_service.ready = False
+    await supervisor.shutdown()
+    if get_batch_detector.cache_info().currsize:
+        await asyncio.to_thread(get_batch_detector().close)
+    if camera_leases:
+        for location in list(camera_leases.held):
+            await camera_leases.release(location)
+    try:
+        await token_manager.call(
+            ConfigAdapter().update_config,
+            event["id"],
+            "VIDEO_ANALYTICS_AVAILABLE",
+            "False",
+        )
+    except SERVICE_ERRORS as e:
+        logging.warning(f"Services unavailable, not set unavailable: {e}")
+    await control_runner.cleanup()
+    await close_client_session()
+    logging.info("Goodbye!")
 
-        # service ready!
-        await ConfigAdapter().update_config(
-            token, event["id"], "VIDEO_ANALYTICS_AVAILABLE", "True"
+
+async def run_control_loop(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    supervisor: TaskSupervisor,
+    control_service: ControlService,
+    camera_leases: CameraLeases,
+) -> None:
+    """Poll configs and commands, start and stop jobs - runs until cancelled.
+
+    Errors of the dependent services are logged and the loop continues, so
+    the service resumes by itself when they are back.
+    """
+    last_status_time = 0.0
+    config_watcher = ConfigWatcher(token_manager, event["id"])
+    # detection parameters are updated on the fly while tracking
+    tracking_session = TrackingSession()
+    config_watcher.add_listener(tracking_session.apply_configs)
+    profiler = Profiler(photos_file_path)
+    camera_stop_events: dict[str, asyncio.Event] = {}
+    # detection parameters per leased camera, e.g. its own trigger line
+    camera_sessions: dict[str, TrackingSession] = {}
+    last_lease_time = 0.0
+    commands = set()
+    last_commands: set[str] = set()
+    while True:
+        try:
+            ai_config = await get_config(config_watcher)
+        except SERVICE_ERRORS as e:
+            # dependent services are down - back off and resume automatically
+            retry_after = max(token_manager.breaker.retry_after(), 2)
+            logging.warning(f"Services unavailable, retry in {retry_after:.0f}s: {e}")
+            await asyncio.sleep(retry_after)
+            continue
+        for command in commands:
+            ai_config[command] = True
+        last_commands = tighten_on_new_commands(
+            config_watcher, ai_config, last_commands
         )
-        while True:
-            ai_config = await get_config(token, event["id"])
+        try:
+            await handle_commands(
+                token_manager,
+                event,
+                status_type,
+                ai_config,
+                supervisor,
+                control_service,
+                tracking_session,
+                profiler,
+                camera_stop_events
+                if await config_watcher.get_bool("CAMERA_LEASES")
+                else None,
+            )
+        except Exception as e:
+            logging.exception("Error handling commands.")
+            await report_job_error(token_manager, event, status_type, "control", e)
+        if time.monotonic() - last_lease_time > RENEW_INTERVAL:
+            last_lease_time = time.monotonic()
             try:
-                # run simulation
-                if ai_config["start_simulation"]:
-                    await SimulateService().simulate_crossings(
-                        token, event, status_type, photos_file_path
-                    )
-                if ai_config["stop_tracking"]:
-                    await ConfigAdapter().update_config(
-                        token, event["id"], "VIDEO_ANALYTICS_STOP", "False"
-                    )
-                elif ai_config["analytics_start"]:
-                    await VideoAIService().detect_crossings_with_ultraltyics(
-                        token, event, status_type, photos_file_path
-                    )
-                elif ai_config["draw_trigger_line"]:
-                    await ConfigAdapter().update_config(
-                        token, event["id"], "DRAW_TRIGGER_LINE", "False"
-                    )
-                    await VideoAIService().print_image_with_trigger_line_v2(
-                        token, event, status_type, photos_file_path
-                    )
-                elif ai_config["analytics_running"]:
-                    # should be invalid (no muliti thread) - reset
-                    await ConfigAdapter().update_config(
-                        token, event["id"], "VIDEO_ANALYTICS_RUNNING", "False"
-                    )
-            except Exception as e:
-                err_string = str(e)
-                logging.exception(err_string)
-                await StatusAdapter().create_status(
-                    token,
+                await handle_camera_leases(
+                    token_manager,
                     event,
                     status_type,
-                    f"Error in Vision AI: {err_string}",
-                )
-                await ConfigAdapter().update_config(
-                    token, event["id"], "VIDEO_ANALYTICS_RUNNING", "False"
-                )
-                await ConfigAdapter().update_config(
-                    token, event["id"], "VIDEO_ANALYTICS_START", "False"
+                    config_watcher,
+                    supervisor,
+                    camera_leases,
+                    control_service,
+                    camera_sessions,
+                    camera_stop_events,
+                    profiler,
                 )
-            if i > STATUS_INTERVAL:
-                informasjon = "Vision AI er klar til å starte analyse."
-                await StatusAdapter().create_status(
-                    token, event, status_type, informasjon
-                )
-                i = 0
-            else:
-                i += 1
-            await asyncio.sleep(2)
-    except Exception as e:
-        err_string = str(e)
-        logging.exception(err_string)
-        await StatusAdapter().create_status(
-            token, event, status_type, f"Critical Error - exiting program: {err_string}"
+            except Exception:
+                # leases expire if not renewed, retried on next round
+                logging.exception("Error updating camera leases.")
+            stop_expiring_cameras(supervisor, camera_leases, camera_stop_events)
+        if time.monotonic() - last_status_time > STATUS_INTERVAL:
+            informasjon = "Vision AI er klar til å starte analyse."
+            if is_analytics_running(supervisor):
+                informasjon = "Vision AI analyse pågår."
+            await create_status(token_manager, event, status_type, informasjon)
+            last_status_time = time.monotonic()
+        # wake up at once on local commands
+        commands = set()
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(config_watcher.interval):
+                commands = await control_service.wait()
+
+
+def tighten_on_new_commands(
+    config_watcher: ConfigWatcher, ai_config: dict, last_commands: set[str]
+) -> set[str]:
+    """Poll configs more often on operator action, return the active commands.
+
+    analytics_running is a status, and the stop flag of leased cameras stays
+    set until start - only new commands count.
+    """
+    active_commands = {
+        key for key, value in ai_config.items() if value and key != "analytics_running"
+    }
+    if active_commands - last_commands:
+        # operator action - look for follow up commands more often
+        config_watcher.tighten()
+    return active_commands
+
+
+async def create_status(
+    token_manager: TokenManager, event: dict, status_type: str, message: str
+) -> None:
+    """Post status message - logged only if the services are unavailable."""
+    try:
+        await token_manager.call(
+            StatusAdapter().create_status, event, status_type, message
         )
-    await ConfigAdapter().update_config(
-        token, event["id"], "VIDEO_ANALYTICS_AVAILABLE", "False"
+    except SERVICE_ERRORS as e:
+        logging.warning(f"Services unavailable, status not posted: {e}")
+
+
+async def report_job_error(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    name: str,
+    error: BaseException,
+) -> None:
+    """Report failed job and reset the analytics flags.
+
+    Called from the main loop and the supervisor, so it must not raise
+    while the services are unavailable.
+    """
+    logging.error(f"Job {name} failed: {error}")
+    await create_status(
+        token_manager, event, status_type, f"Error in Vision AI: {error}"
     )
-    logging.info("Goodbye!")
+    try:
+        for key in ["VIDEO_ANALYTICS_RUNNING", "VIDEO_ANALYTICS_START"]:
+            await token_manager.call(
+                ConfigAdapter().update_config, event["id"], key, "False"
+            )
+    except SERVICE_ERRORS as e:
+        logging.warning(f"Services unavailable, flags not reset: {e}")
 
 
-async def do_login() -> str:
-    """Login to data-source."""
-    uid = os.getenv("ADMIN_USERNAME", "a")
-    pw = os.getenv("ADMIN_PASSWORD", ".")
-    while True:
-        try:
-            token = await UserAdapter().login(uid, pw)
-            if token:
-                return token
-        except Exception as e:
-            err_string = str(e)
-            logging.info(err_string)
-        logging.info("Vision AI is waiting for db connection")
-        await asyncio.sleep(5)
+async def handle_commands(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    ai_config: dict,
+    supervisor: TaskSupervisor,
+    control_service: ControlService,
+    tracking_session: TrackingSession,
+    profiler: Profiler,
+    camera_stop_events: dict[str, asyncio.Event] | None = None,
+) -> None:
+    """Start or stop supervised jobs according to config flags and commands.
 
+    With camera leases (camera_stop_events given), stop and start apply to
+    the analytics of the leased cameras instead of the single analytics job.
+    """
+    if ai_config["start_simulation"]:
+        await start_simulation(token_manager, event, status_type, supervisor)
+    if camera_stop_events is not None:
+        await handle_camera_commands(
+            token_manager,
+            event,
+            ai_config,
+            supervisor,
+            control_service,
+            camera_stop_events,
+        )
+    else:
+        await handle_analytics_commands(
+            token_manager,
+            event,
+            status_type,
+            ai_config,
+            supervisor,
+            control_service,
+            tracking_session,
+            profiler,
+        )
+    if ai_config["analytics_running"] != is_analytics_running(supervisor):
+        # flag left over from a session that is no longer running, or set
+        # here for the sessions of leased cameras
+        await token_manager.call(
+            ConfigAdapter().update_config,
+            event["id"],
+            "VIDEO_ANALYTICS_RUNNING",
+            str(is_analytics_running(supervisor)),
+        )
+    if ai_config["draw_trigger_line"]:
+        await draw_trigger_lines(token_manager, event, status_type, supervisor)
+    if ai_config["start_profiling"]:
+        await token_manager.call(
+            ConfigAdapter().update_config, event["id"], "PROFILE_START", "False"
+        )
+        if not supervisor.is_running("profiling"):
+            duration = await token_manager.call(
+                ConfigAdapter().get_config_int, event["id"], "PROFILE_DURATION"
+            )
+            supervisor.start("profiling", profiler.run(duration))
 
-async def get_event(token: str) -> dict:
-    """Get event_details - use info from config and db."""
-    def raise_multiple_events_error(events_db: list) -> None:
-        """Raise an exception for multiple events found."""
-        information = (
-            f"Multiple events found. Please specify an EVENT_ID in .env: {events_db}"
+
+async def handle_analytics_commands(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    ai_config: dict,
+    supervisor: TaskSupervisor,
+    control_service: ControlService,
+    tracking_session: TrackingSession,
+    profiler: Profiler,
+) -> None:
+    """Stop or start the single analytics job, used without camera leases."""
+    if ai_config["stop_tracking"]:
+        await token_manager.call(
+            ConfigAdapter().update_config, event["id"], "VIDEO_ANALYTICS_STOP", "False"
+        )
+        if supervisor.is_running("analytics"):
+            # session stops between frames, cancelled if it does not respond
+            control_service.stop_event.set()
+            supervisor.start(
+                "stop_analytics", supervisor.cancel("analytics", STOP_GRACE_PERIOD)
+            )
+    elif ai_config["analytics_start"] and not supervisor.is_running("analytics"):
+        control_service.stop_event.clear()
+        supervisor.start(
+            "analytics",
+            get_video_ai_service().detect_crossings_with_ultraltyics(
+                token_manager,
+                event,
+                status_type,
+                photos_file_path,
+                control_service.stop_event,
+                tracking_session,
+                profiler,
+            ),
         )
-        raise Exception(information)
 
-    event = {}
-    while True:
-        try:
-            events_db = await EventsAdapter().get_all_events(token)
-            event_id_config = os.getenv("EVENT_ID")
-            if len(events_db) == 1:
-                event = events_db[0]
-            elif len(events_db) > 1:
-                for _event in events_db:
-                    if _event["id"] == event_id_config:
-                        event = _event
-                        break
-                else:
-                    raise_multiple_events_error(events_db)
-            if event:
-                break
-        except Exception as e:
-            err_string = str(e)
-            logging.info(err_string)
-        logging.info("vision-ai-service is waiting for an event to work on.")
-        await asyncio.sleep(5)
 
-    return event
+async def draw_trigger_lines(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    supervisor: TaskSupervisor,
+) -> None:
+    """Draw the trigger line on the latest frame of each running camera.
+
+    Each leased camera is drawn with its own trigger line, without leased
+    cameras running the configs of the event are used.
+    """
+    await token_manager.call(
+        ConfigAdapter().update_config, event["id"], "DRAW_TRIGGER_LINE", "False"
+    )
+    video_ai_service = get_video_ai_service()
+    cameras = list(video_ai_service.cameras.values())
+    if not cameras:
+        supervisor.start(
+            "trigger_line",
+            video_ai_service.print_image_with_trigger_line_v2(
+                token_manager, event, status_type, photos_file_path
+            ),
+        )
+    for camera in cameras:
+        supervisor.start(
+            f"trigger_line_{camera.location}",
+            video_ai_service.print_image_with_trigger_line_v2(
+                token_manager, event, status_type, photos_file_path, camera
+            ),
+        )
+
 
+async def start_simulation(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    supervisor: TaskSupervisor,
+) -> None:
+    """Start the simulation job, unless it is already running.
 
-async def get_config(token: str, event_id: str) -> dict:
-    """Get config details - use info from db."""
-    analytics_running = await ConfigAdapter().get_config_bool(
-        token, event_id, "VIDEO_ANALYTICS_RUNNING"
+    The flag is reset in both cases, so a request made while a simulation
+    is running is refused once, not run again after it.
+    """
+    await token_manager.call(
+        ConfigAdapter().update_config,
+        event["id"],
+        "SIMULATION_CROSSINGS_START",
+        "False",
     )
-    analytics_start = await ConfigAdapter().get_config_bool(
-        token, event_id, "VIDEO_ANALYTICS_START"
+    supervisor.start(
+        "simulation",
+        SimulateService().simulate_crossings(
+            token_manager, event, status_type, photos_file_path
+        ),
     )
-    stop_tracking = await ConfigAdapter().get_config_bool(
-        token, event_id, "VIDEO_ANALYTICS_STOP"
+
+
+async def handle_camera_commands(
+    token_manager: TokenManager,
+    event: dict,
+    ai_config: dict,
+    supervisor: TaskSupervisor,
+    control_service: ControlService,
+    stop_events: dict[str, asyncio.Event],
+) -> None:
+    """Stop or resume the analytics of the leased cameras.
+
+    The stop flag is kept set until start, so the cameras of all instances
+    stop - a local stop command is shared through the flag too. The leases
+    are kept while stopped.
+    """
+    if ai_config["analytics_start"]:
+        for key in ["VIDEO_ANALYTICS_START", "VIDEO_ANALYTICS_STOP"]:
+            await token_manager.call(
+                ConfigAdapter().update_config, event["id"], key, "False"
+            )
+        control_service.cameras_stopped = False
+        return
+    if ai_config["stop_tracking"] and not control_service.cameras_stopped:
+        await token_manager.call(
+            ConfigAdapter().update_config, event["id"], "VIDEO_ANALYTICS_STOP", "True"
+        )
+    control_service.cameras_stopped = ai_config["stop_tracking"]
+    if control_service.cameras_stopped:
+        for location in list(stop_events):
+            stop_camera(supervisor, stop_events, location, STOP_GRACE_PERIOD)
+
+
+async def handle_camera_leases(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    config_watcher: ConfigWatcher,
+    supervisor: TaskSupervisor,
+    camera_leases: CameraLeases,
+    control_service: ControlService,
+    sessions: dict[str, TrackingSession],
+    stop_events: dict[str, asyncio.Event],
+    profiler: Profiler,
+) -> None:
+    """Claim cameras, run one analytics job per camera held by this instance.
+
+    Each camera has its own detection parameters, the values of the event
+    with the overrides of the camera, updated by the config watcher.
+    """
+    cameras = {}
+    if await config_watcher.get_bool("CAMERA_LEASES"):
+        cameras_value = config_watcher.configs.get("CAMERAS") or (
+            await token_manager.call(ConfigAdapter().get_config, event["id"], "CAMERAS")
+        )
+        cameras = {camera.location: camera for camera in get_cameras(cameras_value)}
+    held = await camera_leases.update(config_watcher.configs, list(cameras.values()))
+    batch_detector = None
+    if held and await config_watcher.get_bool("BATCH_INFERENCE"):
+        # one model for all cameras, frames are detected in batches
+        batch_detector = await asyncio.to_thread(get_batch_detector)
+        batch_detector.batch_size = int(
+            config_watcher.configs.get("BATCH_SIZE")
+            or await token_manager.call(
+                ConfigAdapter().get_config, event["id"], "BATCH_SIZE"
+            )
+        )
+        batch_detector.max_wait = float(
+            config_watcher.configs.get("BATCH_MAX_WAIT")
+            or await token_manager.call(
+                ConfigAdapter().get_config, event["id"], "BATCH_MAX_WAIT"
+            )
+        )
+    for location in list(stop_events):
+        if location not in held:
+            # moved to another instance - stop between frames, then release
+            stop_events.pop(location).set()
+            supervisor.start(
+                f"release_{location}",
+                release_camera(supervisor, camera_leases, location),
+            )
+    for location in held:
+        name = f"analytics_{location}"
+        if (
+            location in cameras
+            and not control_service.cameras_stopped
+            and not supervisor.is_running(name)
+            and not supervisor.is_running(f"release_{location}")
+            and not supervisor.is_running(f"stop_{location}")
+        ):
+            if location not in sessions:
+                sessions[location] = TrackingSession()
+                config_watcher.add_listener(sessions[location].apply_configs)
+            sessions[location].overrides = cameras[location].get_overrides()
+            stop_events[location] = asyncio.Event()
+            supervisor.start(
+                name,
+                # latest frames are kept by camera, tracks by the session
+                get_video_ai_service().detect_crossings_with_ultraltyics(
+                    token_manager,
+                    event,
+                    status_type,
+                    photos_file_path,
+                    stop_events[location],
+                    sessions[location],
+                    profiler,
+                    camera=cameras[location],
+                    batch_detector=batch_detector,
+                ),
+            )
+
+
+def stop_expiring_cameras(
+    supervisor: TaskSupervisor,
+    camera_leases: CameraLeases,
+    stop_events: dict[str, asyncio.Event],
+) -> None:
+    """Stop analytics of cameras whose lease was not renewed, before it expires.
+
+    Another instance may claim the camera when the lease expires. The lease
+    is kept, analytics starts again if it is renewed.
+    """
+    expiring = camera_leases.get_expiring(2 * RENEW_INTERVAL)
+    for location, seconds_left in expiring.items():
+        if location in stop_events:
+            logging.warning(
+                f"Lease of camera {location} not renewed, expires in "
+                f"{seconds_left:.0f}s - stopping analytics."
+            )
+            stop_camera(
+                supervisor,
+                stop_events,
+                location,
+                max(0.0, min(STOP_GRACE_PERIOD, seconds_left - 1)),
+            )
+
+
+def stop_camera(
+    supervisor: TaskSupervisor,
+    stop_events: dict[str, asyncio.Event],
+    location: str,
+    grace_period: float,
+) -> None:
+    """Stop analytics of a leased camera between frames, keep the lease."""
+    stop_events.pop(location).set()
+    supervisor.start(
+        f"stop_{location}", supervisor.cancel(f"analytics_{location}", grace_period)
     )
-    start_simulation = await ConfigAdapter().get_config_bool(
-        token, event_id, "SIMULATION_CROSSINGS_START"
+
+
+def is_analytics_running(supervisor: TaskSupervisor) -> bool:
+    """Check if the analytics job or the job of a leased camera is running."""
+    return any(
+        supervisor.is_running(name)
+        for name in list(supervisor.tasks)
+        if name == "analytics" or name.startswith("analytics_")
     )
-    draw_trigger_line = await ConfigAdapter().get_config_bool(
-        token, event_id, "DRAW_TRIGGER_LINE"
+
+
+async def release_camera(
+    supervisor: TaskSupervisor, camera_leases: CameraLeases, location: str
+) -> None:
+    """Stop analytics of a camera, then release its lease."""
+    await supervisor.cancel(f"analytics_{location}", STOP_GRACE_PERIOD)
+    await camera_leases.release(location)
+
+
+def create_control_app(control_service: ControlService) -> web.Application:
+    """Create local control and health API."""
+    app = web.Application()
+    app[CONTROL_SERVICE_KEY] = control_service
+    app.add_routes(
+        [
+            web.view("/health", Health),
+            web.view("/ready", Ready),
+            web.view("/analytics/start", AnalyticsStart),
+            web.view("/analytics/stop", AnalyticsStop),
+            web.view("/trigger-line", TriggerLine),
+            web.view("/simulation/start", SimulationStart),
+            web.view("/profiling/start", ProfilingStart),
+        ]
     )
+    return app
+
+
+async def start_control_server(control_service: ControlService) -> web.AppRunner:
+    """Start local control API in the running event loop."""
+    runner = web.AppRunner(create_control_app(control_service), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, CONTROL_HOST, CONTROL_PORT).start()
+    logging.info(f"Control API listening on {CONTROL_HOST}:{CONTROL_PORT}")
+    return runner
+
+
+@functools.cache
+def get_video_ai_service() -> "VideoAIService":
+    """Import the vision stack on first analytics or trigger line request.
+
+    One instance is shared by the sessions of all cameras, so the trigger
+    line can be drawn from the frames of a running tracking session.
+    """
+    from vision_ai_service.services.video_ai_service import VideoAIService
+
+    return VideoAIService()
+
+
+@functools.cache
+def get_batch_detector() -> "BatchDetector":
+    """Load the model shared by the camera sessions on first use - blocking."""
+    from vision_ai_service.services.batch_detector import BatchDetector
+    from vision_ai_service.services.video_ai_service import load_model
+
+    return BatchDetector(load_model())
+
+
+def warm_up_vision_model() -> float:
+    """Import the vision stack and load the model - runs in a worker thread."""
+    from vision_ai_service.services.video_ai_service import warm_up_model
+
+    return warm_up_model()
+
+
+async def get_config(config_watcher: ConfigWatcher) -> dict:
+    """Get config details - use info from db, fetched only when changed."""
+    await config_watcher.poll()
     return {
-        "analytics_running": analytics_running,
-        "analytics_start": analytics_start,
-        "start_simulation": start_simulation,
-        "stop_tracking": stop_tracking,
-        "draw_trigger_line": draw_trigger_line,
+        "analytics_running": await config_watcher.get_bool("VIDEO_ANALYTICS_RUNNING"),
+        "analytics_start": await config_watcher.get_bool("VIDEO_ANALYTICS_START"),
+        "start_simulation": await config_watcher.get_bool("SIMULATION_CROSSINGS_START"),
+        "stop_tracking": await config_watcher.get_bool("VIDEO_ANALYTICS_STOP"),
+        "draw_trigger_line": await config_watcher.get_bool("DRAW_TRIGGER_LINE"),
+        "start_profiling": await config_watcher.get_bool("PROFILE_START"),
     }
 
 
 if __name__ == "__main__":
+    setup_logging()
     asyncio.run(main())
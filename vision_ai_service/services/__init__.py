@@ -1,4 +1,18 @@
 """Package for all views."""
 
+from typing import TYPE_CHECKING, Any
+
 from .simulate_service import SimulateService
-from .video_ai_service import VideoAIService
+
+if TYPE_CHECKING:
+    from .video_ai_service import VideoAIService
+
+
+def __getattr__(name: str) -> Any:
+    """Import the vision stack (torch, ultralytics) on first use only."""
+    if name == "VideoAIService":
+        from .video_ai_service import VideoAIService
+
+        return VideoAIService
+    informasjon = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(informasjon)
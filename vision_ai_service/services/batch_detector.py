@@ -0,0 +1,173 @@
+"""Module for batched inference across the cameras of an instance.
+
+One model is shared by the analytics sessions of all cameras. Each session
+reads the latest frame of its camera in its own thread and submits it here,
+a scheduler thread gathers the waiting frames into one batch and runs one
+inference. The detections are returned to the session, which tracks them
+with its own tracker and keeps its own crossing state.
+A batch is run when it is full, when every camera has a frame waiting, or
+when the first frame has waited max wait seconds.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from vision_ai_service.adapters.exceptions import BatchDetectorClosedError
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+BATCH_SIZE = 8
+BATCH_MAX_WAIT = 0.02  # seconds
+
+
+@dataclass(eq=False)
+class BatchRequest:
+    """Class representing one frame waiting for inference."""
+
+    im: np.ndarray
+    key: tuple  # conf, classes and image size - batched only with equal keys
+    future: Future = field(default_factory=Future)
+    created: float = field(default_factory=time.monotonic)
+
+
+class BatchDetector:
+    """Class running one model on the frames of several cameras in batches.
+
+    detect is called from the analytics thread of each camera and blocks
+    until the batch of its frame is done. Batch size and max wait may be
+    changed while running.
+    """
+
+    def __init__(
+        self,
+        model: "YOLO",
+        batch_size: int = BATCH_SIZE,
+        max_wait: float = BATCH_MAX_WAIT,
+    ) -> None:
+        """Initialize detector and start the scheduler thread."""
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.requests: list[BatchRequest] = []
+        self.cameras = 0
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.counts = {"batches": 0, "frames": 0, "wait_seconds": 0.0}
+        self.thread = threading.Thread(
+            target=self.run, name="batch_detector", daemon=True
+        )
+        self.thread.start()
+
+    def add_camera(self) -> None:
+        """Count a camera session, a batch waits for a frame from each."""
+        with self.condition:
+            self.cameras += 1
+
+    def remove_camera(self) -> None:
+        """Stop counting a camera session."""
+        with self.condition:
+            self.cameras = max(0, self.cameras - 1)
+            self.condition.notify()
+
+    def detect(
+        self, im: np.ndarray, conf: float, classes: list[int], image_size: tuple
+    ) -> np.ndarray:
+        """Detect on one frame, return detections (x1, y1, x2, y2, conf, cls).
+
+        Blocking - called from the analytics thread of a camera.
+        """
+        request = BatchRequest(im, (conf, tuple(classes), tuple(image_size)))
+        with self.condition:
+            if self.stopped:
+                informasjon = "Batch detector is closed."
+                raise BatchDetectorClosedError(informasjon)
+            self.requests.append(request)
+            self.condition.notify()
+        return request.future.result()
+
+    def get_batch(self) -> list[BatchRequest]:
+        """Wait for frames, return the next batch - empty when stopped."""
+        with self.condition:
+            while not self.requests and not self.stopped:
+                self.condition.wait()
+            if not self.requests:
+                return []
+            deadline = self.requests[0].created + self.max_wait
+            while not self.stopped:
+                batch = [r for r in self.requests if r.key == self.requests[0].key]
+                remaining = deadline - time.monotonic()
+                if (
+                    len(batch) >= self.batch_size
+                    or len(self.requests) >= self.cameras
+                    or remaining <= 0
+                ):
+                    break
+                self.condition.wait(remaining)
+            if not self.requests:
+                # closed meanwhile
+                return []
+            batch = [r for r in self.requests if r.key == self.requests[0].key]
+            batch = batch[: self.batch_size]
+            self.requests = [r for r in self.requests if r not in batch]
+            return batch
+
+    def run(self) -> None:
+        """Run batches until closed - runs in the scheduler thread."""
+        while batch := self.get_batch():
+            conf, classes, image_size = batch[0].key
+            start_time = time.monotonic()
+            try:
+                results = self.model.predict(
+                    [request.im for request in batch],
+                    conf=conf,
+                    classes=list(classes),
+                    imgsz=image_size,
+                    verbose=False,
+                )
+            except Exception as e:
+                logging.exception("Error in batched inference.")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, result in zip(batch, results, strict=True):
+                request.future.set_result(result.boxes.data.cpu().numpy())
+            self.counts["batches"] += 1
+            self.counts["frames"] += len(batch)
+            self.counts["wait_seconds"] += sum(
+                start_time - request.created for request in batch
+            )
+
+    def get_stats(self) -> dict:
+        """Return number of batches and frames, mean batch size and wait (ms)."""
+        stats: dict = {
+            "batches": self.counts["batches"],
+            "frames": self.counts["frames"],
+            "cameras": self.cameras,
+        }
+        if self.counts["batches"]:
+            stats["mean_batch_size"] = round(
+                self.counts["frames"] / self.counts["batches"], 2
+            )
+            stats["mean_wait_ms"] = round(
+                self.counts["wait_seconds"] / self.counts["frames"] * 1000, 1
+            )
+        return stats
+
+    def close(self) -> None:
+        """Stop the scheduler, frames still waiting get an error."""
+        with self.condition:
+            self.stopped = True
+            left, self.requests = self.requests, []
+            self.condition.notify_all()
+        informasjon = "Batch detector is closed."
+        for request in left:
+            request.future.set_exception(BatchDetectorClosedError(informasjon))
+        self.thread.join()
+        logging.info(f"Batch detector closed: {self.get_stats()}")
@@ -0,0 +1,136 @@
+"""Module for selecting the best frame of a line crossing.
+
+The last frames are kept by reference in a fixed ring buffer - the frame
+reader allocates a new array per frame, so nothing is copied. A crossing is
+saved a few frames late, from the frame around the crossing where the crop
+of the skier is sharpest and least occluded by other skiers. Sharpness is
+the variance of the Laplacian of the downscaled crop.
+"""
+
+import logging
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+WINDOW = 3  # frames before and after the crossing frame
+SHARPNESS_HEIGHT = 64  # crop is downscaled to this height before scoring
+
+
+@dataclass(eq=False)
+class PendingCrossing:
+    """Class representing a crossing waiting for the frames after it."""
+
+    d_id: int
+    frame_index: int
+    crossing_time: float
+    x_center: float
+    im: np.ndarray  # crossing frame and box, used if the window has no frame
+    xyxy: np.ndarray
+
+
+def get_sharpness(im: np.ndarray, xyxy: np.ndarray) -> float:
+    """Return variance of the Laplacian of the downscaled crop, 0 if empty."""
+    x1, y1, x2, y2 = (int(c) for c in xyxy)
+    crop = im[max(0, y1) : y2, max(0, x1) : x2]
+    if crop.size == 0:
+        return 0.0
+    scale = min(1.0, SHARPNESS_HEIGHT / crop.shape[0])
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    if scale < 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+
+def get_occlusion(xyxy: np.ndarray, others: np.ndarray) -> float:
+    """Return share of the box covered by other boxes (N, 4), at most 1."""
+    if not len(others):
+        return 0.0
+    width = np.clip(
+        np.minimum(xyxy[2], others[:, 2]) - np.maximum(xyxy[0], others[:, 0]), 0, None
+    )
+    height = np.clip(
+        np.minimum(xyxy[3], others[:, 3]) - np.maximum(xyxy[1], others[:, 1]), 0, None
+    )
+    area = max((xyxy[2] - xyxy[0]) * (xyxy[3] - xyxy[1]), 1e-9)
+    return float(min(1.0, (width * height).sum() / area))
+
+
+class BestFrameSelector:
+    """Class keeping recent frames and selecting the best frame per crossing."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        """Initialize ring buffer for window frames before and after a crossing."""
+        self.window = window
+        self.size = 2 * window + 1
+        self.frames: list[np.ndarray | None] = [None] * self.size
+        self.boxes: list[dict[int, np.ndarray]] = [{} for _ in range(self.size)]
+        self.frame_index = -1
+        self.pending: list[PendingCrossing] = []
+
+    def add_frame(self, im: np.ndarray, boxes: dict[int, np.ndarray]) -> int:
+        """Keep frame and its person boxes (xyxy) by track id, return frame index."""
+        self.frame_index += 1
+        slot = self.frame_index % self.size
+        self.frames[slot] = im
+        self.boxes[slot] = boxes
+        return self.frame_index
+
+    def add_crossing(
+        self,
+        d_id: int,
+        crossing_time: float,
+        x_center: float,
+        im: np.ndarray,
+        xyxy: np.ndarray,
+    ) -> None:
+        """Register crossing of the current frame, saved when the window is full."""
+        self.pending.append(
+            PendingCrossing(d_id, self.frame_index, crossing_time, x_center, im, xyxy)
+        )
+
+    def pop_ready(
+        self, *, flush: bool = False
+    ) -> list[tuple[PendingCrossing, np.ndarray, np.ndarray]]:
+        """Return (crossing, best frame, box) of crossings with a full window.
+
+        With flush all pending crossings are returned, e.g. at end of stream.
+        """
+        ready = [
+            crossing
+            for crossing in self.pending
+            if flush or self.frame_index - crossing.frame_index >= self.window
+        ]
+        self.pending = [crossing for crossing in self.pending if crossing not in ready]
+        return [(crossing, *self.get_best_frame(crossing)) for crossing in ready]
+
+    def get_best_frame(
+        self, crossing: PendingCrossing
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return frame and box with the best score within the window."""
+        best: tuple[float, np.ndarray, np.ndarray] | None = None
+        first = max(
+            crossing.frame_index - self.window, self.frame_index - self.size + 1, 0
+        )
+        last = min(crossing.frame_index + self.window, self.frame_index)
+        for frame_index in range(first, last + 1):
+            slot = frame_index % self.size
+            im = self.frames[slot]
+            xyxy = self.boxes[slot].get(crossing.d_id)
+            if im is None or xyxy is None:
+                continue
+            others = [
+                box for d_id, box in self.boxes[slot].items() if d_id != crossing.d_id
+            ]
+            occlusion = get_occlusion(xyxy, np.array(others).reshape(-1, 4))
+            score = get_sharpness(im, xyxy) * (1 - occlusion)
+            if best is None or score > best[0]:
+                best = (score, im, xyxy)
+        if best is None:
+            # no box of the skier in the buffered frames - not expected
+            logging.warning(
+                f"No frame in window for crossing ID:{crossing.d_id}, "
+                "crossing frame used."
+            )
+            return crossing.im, crossing.xyxy
+        return best[1], best[2]
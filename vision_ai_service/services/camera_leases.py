@@ -0,0 +1,266 @@
+"""Module for assigning cameras to instances with leases.
+
+Cameras of the event are listed in config CAMERAS. Each instance posts a
+heartbeat with its capacity (INSTANCE_<id>), and claims cameras by writing
+a lease (CAMERA_LEASE_<location>) with owner and expiry. All instances
+compute the same wanted assignment from the live instances, so cameras move
+when an instance joins, and leases of a dead instance expire.
+The config backend has no compare-and-swap - a new claim is read back after
+a short delay, and only kept if the lease still has this instance as owner.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import socket
+import time
+from dataclasses import dataclass
+
+from vision_ai_service.adapters.config_adapter import ConfigAdapter
+from vision_ai_service.adapters.token_manager import TokenManager
+
+LEASE_TTL = 15.0
+RENEW_INTERVAL = 5.0
+CLAIM_SETTLE = 1.0
+LEASE_PREFIX = "CAMERA_LEASE_"
+INSTANCE_PREFIX = "INSTANCE_"
+LEASE_KEY_PREFIXES = (LEASE_PREFIX, INSTANCE_PREFIX)
+TARGET_FPS = 10  # frames per second analysed per camera
+MAX_UTILIZATION = 0.8
+MAX_CAMERAS = 8
+
+
+@dataclass(frozen=True)
+class Camera:
+    """Class representing one camera of the event."""
+
+    location: str
+    url: str
+    trigger_line: str = ""  # TRIGGER_LINE_XYXYN of the camera, event value if empty
+
+    def get_overrides(self) -> dict[str, str]:
+        """Return config values of this camera used instead of the event values."""
+        if self.trigger_line:
+            return {"TRIGGER_LINE_XYXYN": self.trigger_line}
+        return {}
+
+
+def get_cameras(value: str) -> list[Camera]:
+    """Parse CAMERAS, a JSON list of {"location": ..., "url": ...}.
+
+    Each camera may have its own "trigger_line", 4 numbers colon-separated.
+    """
+    try:
+        return [
+            Camera(camera["location"], camera["url"], camera.get("trigger_line", ""))
+            for camera in json.loads(value)
+        ]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        informasjon = f"Error reading CAMERAS: {e}"
+        raise ValueError(informasjon) from e
+
+
+def get_instance_id() -> str:
+    """Return id of this instance, INSTANCE_ID or host name."""
+    return os.getenv("INSTANCE_ID", socket.gethostname())
+
+
+def get_camera_capacity(inference_seconds: float | None) -> int:
+    """Return number of cameras this instance can analyse.
+
+    Measured from the time of one inference at warm-up, MAX_CAMERAS (env)
+    overrides.
+    """
+    if os.getenv("MAX_CAMERAS"):
+        return int(os.getenv("MAX_CAMERAS", "1"))
+    if not inference_seconds:
+        return 1
+    capacity = int(MAX_UTILIZATION / (inference_seconds * TARGET_FPS))
+    return max(1, min(MAX_CAMERAS, capacity))
+
+
+def get_weight(location: str, instance_id: str) -> int:
+    """Rendezvous hash weight of a camera on an instance."""
+    digest = hashlib.sha256(f"{location}:{instance_id}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def get_assignment(
+    cameras: list[Camera], capacities: dict[str, int]
+) -> dict[str, set[str]]:
+    """Return wanted camera locations per instance.
+
+    Each camera goes to the instance with the highest rendezvous weight that
+    has room - first limited to a fair share, then to the capacity. Only
+    few cameras move when an instance joins or leaves.
+    """
+    assignment: dict[str, set[str]] = {instance_id: set() for instance_id in capacities}
+    if not capacities:
+        return assignment
+    fair_share = math.ceil(len(cameras) / len(capacities))
+    unassigned = sorted(camera.location for camera in cameras)
+    for limit in [
+        {i: min(c, fair_share) for i, c in capacities.items()},
+        capacities,
+    ]:
+        left = []
+        for location in unassigned:
+            ranked = sorted(
+                capacities, key=lambda i: get_weight(location, i), reverse=True
+            )
+            instance_id = next(
+                (i for i in ranked if len(assignment[i]) < limit[i]), None
+            )
+            if instance_id is None:
+                left.append(location)
+            else:
+                assignment[instance_id].add(location)
+        unassigned = left
+    return assignment
+
+
+def parse_lease(value: str) -> dict:
+    """Parse lease or heartbeat value, empty if invalid."""
+    try:
+        lease = json.loads(value)
+    except ValueError:
+        return {}
+    return lease if isinstance(lease, dict) else {}
+
+
+def get_capacities(configs: dict[str, str], now: float) -> dict[str, int]:
+    """Return capacity per instance id of the instances with a live heartbeat."""
+    capacities = {}
+    for key, value in configs.items():
+        if key.startswith(INSTANCE_PREFIX):
+            heartbeat = parse_lease(value)
+            if heartbeat.get("expires", 0) > now:
+                capacities[key.removeprefix(INSTANCE_PREFIX)] = int(
+                    heartbeat.get("capacity", 1)
+                )
+    return capacities
+
+
+class CameraLeases:
+    """Class representing the camera leases of this instance."""
+
+    def __init__(
+        self,
+        token_manager: TokenManager,
+        event_id: str,
+        instance_id: str,
+        capacity: int,
+        ttl: float = LEASE_TTL,
+        settle: float = CLAIM_SETTLE,
+    ) -> None:
+        """Initialize leases."""
+        self.token_manager = token_manager
+        self.event_id = event_id
+        self.instance_id = instance_id
+        self.capacity = capacity
+        self.ttl = ttl
+        self.settle = settle
+        self.held: set[str] = set()
+        # expiry of the leases written by this instance, by location
+        self.expires: dict[str, float] = {}
+        self.keys: set[str] = set()
+        self.unassigned: set[str] = set()
+
+    async def update(self, configs: dict[str, str], cameras: list[Camera]) -> set[str]:
+        """Post heartbeat, renew and claim leases, return locations held.
+
+        Cameras held but no longer wanted are not renewed, the caller stops
+        their analytics and calls release.
+        """
+        now = time.time()
+        self.keys.update(configs)
+        if not cameras and not self.held:
+            return self.held
+        capacities = get_capacities(configs, now)
+        capacities[self.instance_id] = self.capacity
+        assignment = get_assignment(cameras, capacities)
+        wanted = assignment[self.instance_id]
+        unassigned = {camera.location for camera in cameras}.difference(
+            *assignment.values()
+        )
+        if unassigned and unassigned != self.unassigned:
+            logging.warning(f"No capacity left for cameras {sorted(unassigned)}.")
+        self.unassigned = unassigned
+        await self.write(
+            f"{INSTANCE_PREFIX}{self.instance_id}",
+            {"capacity": self.capacity, "expires": now + self.ttl},
+        )
+
+        held = set()
+        claimed = set()
+        for location in sorted(wanted):
+            lease = parse_lease(configs.get(f"{LEASE_PREFIX}{location}", "{}"))
+            if lease.get("owner") == self.instance_id:
+                held.add(location)
+            elif lease.get("owner") and lease.get("expires", 0) > now:
+                # still held by another instance, it releases when it sees us
+                continue
+            else:
+                claimed.add(location)
+            await self.write(
+                f"{LEASE_PREFIX}{location}",
+                {"owner": self.instance_id, "expires": now + self.ttl},
+            )
+            self.expires[location] = now + self.ttl
+        if claimed:
+            held |= await self.confirm_claims(claimed)
+        # held but no longer wanted - kept until analytics is stopped
+        self.held = held | {
+            location for location in self.held if location not in wanted
+        }
+        return held
+
+    async def confirm_claims(self, claimed: set[str]) -> set[str]:
+        """Return claimed locations still owned by this instance after settle.
+
+        Read back - another instance may have claimed at the same time.
+        """
+        await asyncio.sleep(self.settle)
+        confirmed = set()
+        for location in claimed:
+            value = await self.token_manager.call(
+                ConfigAdapter().get_config,
+                self.event_id,
+                f"{LEASE_PREFIX}{location}",
+            )
+            if parse_lease(value).get("owner") == self.instance_id:
+                confirmed.add(location)
+                logging.info(f"Camera {location} claimed by {self.instance_id}.")
+        return confirmed
+
+    def get_expiring(self, margin: float) -> dict[str, float]:
+        """Return seconds left of held leases expiring within margin seconds.
+
+        A lease not renewed, e.g. when the config backend is down, may be
+        claimed by another instance when it expires - analytics of the camera
+        must stop before that.
+        """
+        now = time.time()
+        return {
+            location: self.expires.get(location, now) - now
+            for location in self.held
+            if self.expires.get(location, now) - now < margin
+        }
+
+    async def release(self, location: str) -> None:
+        """Release lease, so the wanted instance can claim it at once."""
+        self.held.discard(location)
+        self.expires.pop(location, None)
+        await self.write(f"{LEASE_PREFIX}{location}", {"owner": "", "expires": 0})
+        logging.info(f"Camera {location} released by {self.instance_id}.")
+
+    async def write(self, key: str, value: dict) -> None:
+        """Write lease or heartbeat, create the config if it is new."""
+        func = ConfigAdapter().update_config
+        if key not in self.keys:
+            func = ConfigAdapter().create_config
+            self.keys.add(key)
+        await self.token_manager.call(func, self.event_id, key, json.dumps(value))
@@ -0,0 +1,87 @@
+"""Module for watching config changes with adaptive polling."""
+
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from vision_ai_service.adapters.config_adapter import ConfigAdapter
+from vision_ai_service.adapters.token_manager import TokenManager
+from vision_ai_service.services.camera_leases import LEASE_KEY_PREFIXES
+
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 1.5
+POLL_BACKOFF_FACTOR = 1.5
+
+
+class ConfigWatcher:
+    """Class representing a local copy of the event configs.
+
+    All configs are fetched in one conditional request (ETag/If-None-Match).
+    The poll interval grows while nothing changes and is reset to the minimum
+    on any change or operator action. Listeners are called with all configs
+    whenever something has changed. Camera leases and heartbeats are kept in
+    configs, but do not count as changes.
+    """
+
+    def __init__(
+        self,
+        token_manager: TokenManager,
+        event_id: str,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> None:
+        """Initialize the watcher."""
+        self.token_manager = token_manager
+        self.event_id = event_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.etag = ""
+        self.configs: dict[str, str] = {}
+        self.listeners: list[Callable[[dict[str, str]], Any]] = []
+
+    def add_listener(self, listener: Callable[[dict[str, str]], Any]) -> None:
+        """Register a function to be called with all configs on change."""
+        self.listeners.append(listener)
+
+    async def poll(self) -> bool:
+        """Fetch configs if changed, return True on change."""
+        configs, self.etag = await self.token_manager.call(
+            ConfigAdapter().get_all_configs_if_changed, self.event_id, self.etag
+        )
+        changed = False
+        if configs is not None:
+            new_configs = {config["key"]: config["value"] for config in configs}
+            changed = get_operator_configs(new_configs) != get_operator_configs(
+                self.configs
+            )
+            self.configs = new_configs
+        if changed:
+            logging.debug(f"Config changed - polling every {self.min_interval}s")
+            self.tighten()
+            for listener in self.listeners:
+                listener(self.configs)
+        else:
+            self.interval = min(self.max_interval, self.interval * POLL_BACKOFF_FACTOR)
+        return changed
+
+    def tighten(self) -> None:
+        """Poll at the minimum interval, e.g. right after an operator action."""
+        self.interval = self.min_interval
+
+    async def get_bool(self, key: str) -> bool:
+        """Get config boolean value, fetch (and create default) if unknown."""
+        if key not in self.configs:
+            return await self.token_manager.call(
+                ConfigAdapter().get_config_bool, self.event_id, key
+            )
+        return self.configs[key] in ["True", "true", "1"]
+
+
+def get_operator_configs(configs: dict[str, str]) -> dict[str, str]:
+    """Return configs without the keys written by the instances."""
+    return {
+        key: value
+        for key, value in configs.items()
+        if not key.startswith(LEASE_KEY_PREFIXES)
+    }
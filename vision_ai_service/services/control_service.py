@@ -0,0 +1,73 @@
+"""Module for commands sent straight to the running process."""
+
+import asyncio
+import logging
+import time
+
+from vision_ai_service.services.task_supervisor import TaskSupervisor
+
+COMMANDS = [
+    "analytics_start",
+    "stop_tracking",
+    "draw_trigger_line",
+    "start_simulation",
+    "start_profiling",
+]
+
+
+class ControlService:
+    """Class representing local control state of the running process.
+
+    Commands from the local HTTP API are queued here and picked up by the
+    main loop immediately, in addition to the config flags polled from
+    photo-service.
+    """
+
+    def __init__(self, supervisor: TaskSupervisor | None = None) -> None:
+        """Initialize control state."""
+        self.supervisor = supervisor
+        self.queue: asyncio.Queue[str] = asyncio.Queue()
+        self.stop_event = asyncio.Event()
+        # leased cameras stopped by the operator, until analytics is started
+        self.cameras_stopped = False
+        self.ready = False
+        self.event: dict = {}
+        self.started_at = time.monotonic()
+        self.last_loop_at = 0.0
+
+    def send(self, command: str) -> None:
+        """Queue a command for the main loop."""
+        if command not in COMMANDS:
+            informasjon = f"Unknown command {command}."
+            raise ValueError(informasjon)
+        logging.info(f"Local command received: {command}")
+        if command == "stop_tracking":
+            # picked up by a running analytics session between frames
+            self.stop_event.set()
+        self.queue.put_nowait(command)
+
+    async def wait(self) -> set[str]:
+        """Wait for a command, return all pending commands.
+
+        Called with a timeout by the main loop, which polls the config flags
+        in between.
+        """
+        self.last_loop_at = time.monotonic()
+        commands = {await self.queue.get()}
+        while not self.queue.empty():
+            commands.add(self.queue.get_nowait())
+        return commands
+
+    def get_health(self) -> dict:
+        """Return health information."""
+        now = time.monotonic()
+        return {
+            "status": "OK",
+            "ready": self.ready,
+            "event_id": self.event.get("id", ""),
+            "uptime_s": round(now - self.started_at, 1),
+            "last_loop_s": round(now - self.last_loop_at, 1)
+            if self.last_loop_at
+            else None,
+            "jobs": self.supervisor.get_status() if self.supervisor else {},
+        }
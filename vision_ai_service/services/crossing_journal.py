@@ -0,0 +1,182 @@
+"""Module for a durable journal of line crossings.
+
+Crossings are appended to SQLite in WAL mode by a writer thread, in batches
+with one commit (fsync) per batch. On start, recent crossings of the camera
+are read back, so a restarted session does not photograph skiers that were
+already saved before the restart.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.5
+RESTART_SECONDS = 10.0  # crossings saved this long before the start are read back
+VISIBLE_SECONDS = 5.0  # a skier below the line has left the frame after this
+DEDUP_DISTANCE = 0.05  # x center, relative to frame width
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crossings (
+    id INTEGER PRIMARY KEY,
+    camera TEXT NOT NULL,
+    session TEXT NOT NULL,
+    track_id INTEGER NOT NULL,
+    crossing_time REAL NOT NULL,
+    x_center REAL NOT NULL,
+    file_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS crossings_camera_time ON crossings (camera, crossing_time);
+"""
+
+
+@dataclass(frozen=True)
+class Crossing:
+    """Class representing one journaled crossing."""
+
+    camera: str
+    session: str
+    track_id: int
+    crossing_time: float
+    x_center: float
+    file_name: str
+
+
+class CrossingJournal:
+    """Class appending crossings to SQLite from a writer thread."""
+
+    def __init__(self, db_path: str, camera: str, session: str) -> None:
+        """Open the journal and load recent crossings of the camera."""
+        self.db_path = db_path
+        self.camera = camera
+        self.session = session
+        self.queue: queue.Queue[Crossing | None] = queue.Queue()
+        self.failed = False
+        self.started = time.time()
+        connection = self.connect()
+        try:
+            connection.executescript(SCHEMA)
+            self.recent = self.get_crossings(
+                connection, camera, self.started - RESTART_SECONDS
+            )
+        finally:
+            connection.close()
+        logging.info(
+            f"Crossing journal {db_path}: {len(self.recent)} recent crossings "
+            f"for {camera}."
+        )
+        self.writer = threading.Thread(
+            target=self.write, name="crossing_journal", daemon=True
+        )
+        self.writer.start()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open connection in WAL mode, fsync on every commit."""
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        return connection
+
+    def append(
+        self, track_id: int, crossing_time: float, x_center: float, file_name: str
+    ) -> None:
+        """Queue crossing for the writer thread - does not block."""
+        if self.failed:
+            return
+        self.queue.put(
+            Crossing(
+                self.camera, self.session, track_id, crossing_time, x_center, file_name
+            )
+        )
+
+    def is_duplicate(self, crossing_time: float, x_center: float) -> bool:
+        """Check if a crossing was saved by an earlier session just before.
+
+        Only skiers still in the frame at the start of this session may have
+        been saved before, so later crossings are never duplicates.
+        """
+        if crossing_time > self.started + VISIBLE_SECONDS:
+            return False
+        return any(
+            abs(x_center - crossing.x_center) < DEDUP_DISTANCE
+            for crossing in self.recent
+        )
+
+    def write(self) -> None:
+        """Write queued crossings in batches - runs in writer thread.
+
+        A failed batch is logged and skipped - the photos are saved, only the
+        journal entries are lost. If the journal cannot be opened, appends are
+        dropped.
+        """
+        try:
+            connection = self.connect()
+        except sqlite3.Error:
+            logging.exception(f"Error opening crossing journal {self.db_path}")
+            self.failed = True
+            return
+        try:
+            running = True
+            while running:
+                batch = [self.queue.get()]
+                deadline = time.monotonic() + FLUSH_INTERVAL
+                while len(batch) < BATCH_SIZE and batch[-1] is not None:
+                    try:
+                        batch.append(
+                            self.queue.get(timeout=max(0, deadline - time.monotonic()))
+                        )
+                    except queue.Empty:
+                        break
+                # None is the stop marker, put last by close
+                running = None not in batch
+                crossings = [crossing for crossing in batch if crossing is not None]
+                if crossings:
+                    try:
+                        self.insert(connection, crossings)
+                    except sqlite3.Error:
+                        logging.exception(
+                            f"Error writing {len(crossings)} crossings to journal "
+                            f"{self.db_path}"
+                        )
+        finally:
+            connection.close()
+
+    @staticmethod
+    def insert(connection: sqlite3.Connection, batch: list[Crossing]) -> None:
+        """Insert crossings in one transaction."""
+        with connection:
+            connection.executemany(
+                "INSERT INTO crossings (camera, session, track_id, "
+                "crossing_time, x_center, file_name) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        c.camera,
+                        c.session,
+                        c.track_id,
+                        c.crossing_time,
+                        c.x_center,
+                        c.file_name,
+                    )
+                    for c in batch
+                ],
+            )
+
+    def close(self) -> None:
+        """Write remaining crossings and stop the writer thread."""
+        self.queue.put(None)
+        self.writer.join()
+
+    @staticmethod
+    def get_crossings(
+        connection: sqlite3.Connection, camera: str, since: float
+    ) -> list[Crossing]:
+        """Get crossings of a camera since a time (epoch seconds), by index."""
+        rows = connection.execute(
+            "SELECT camera, session, track_id, crossing_time, x_center, file_name "
+            "FROM crossings WHERE camera = ? AND crossing_time >= ? "
+            "ORDER BY crossing_time",
+            (camera, since),
+        ).fetchall()
+        return [Crossing(*row) for row in rows]
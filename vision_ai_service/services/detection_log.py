@@ -0,0 +1,210 @@
+"""Module for recording and replaying detections of a tracking session.
+
+Detections are written per column to raw binary files, and read back as
+memory-mapped numpy arrays. Replay runs the crossing logic of process_boxes
+vectorized over the whole log, so detection parameters can be tuned without
+running inference again.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from vision_ai_service.services.tracking_session import DetectionParams
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Boxes
+
+COLUMNS = {
+    "frame": ("<i4", ()),
+    "timestamp": ("<f8", ()),
+    "track_id": ("<i4", ()),
+    "cls": ("<i2", ()),
+    "conf": ("<f4", ()),
+    "xyxyn": ("<f4", (4,)),
+}
+META_FILE = "meta.json"
+FLUSH_FRAMES = 50
+NO_TRACK_ID = -1
+
+
+class DetectionRecorder:
+    """Class appending per-frame detections to a columnar log.
+
+    The metadata is written when the log is opened and updated at each
+    flush, so a log cut short by a crash can still be opened and replayed
+    up to the last flush.
+    """
+
+    def __init__(self, log_path: str) -> None:
+        """Create log directory and open one file per column.
+
+        Raises:
+            FileExistsError: if the log directory exists - logs are never appended to.
+
+        """
+        self.path = Path(log_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.mkdir()
+        self.files = {name: (self.path / f"{name}.bin").open("xb") for name in COLUMNS}
+        self.pending: dict[str, list[np.ndarray]] = {name: [] for name in COLUMNS}
+        self.pending_frames = 0
+        self.row_count = 0
+        self.frame_count = 0
+        self.write_meta(complete=False)
+
+    def add(self, frame: int, timestamp: float, boxes: "Boxes | None") -> None:
+        """Add all detections of one frame."""
+        if boxes is not None and len(boxes):
+            count = len(boxes)
+            track_id = (
+                boxes.id.int().cpu().numpy()
+                if boxes.id is not None
+                else np.full(count, NO_TRACK_ID)
+            )
+            values = {
+                "frame": np.full(count, frame),
+                "timestamp": np.full(count, timestamp),
+                "track_id": track_id,
+                "cls": boxes.cls.cpu().numpy(),
+                "conf": boxes.conf.cpu().numpy(),
+                "xyxyn": boxes.xyxyn.cpu().numpy(),
+            }
+            for name, (dtype, _shape) in COLUMNS.items():
+                self.pending[name].append(values[name].astype(dtype, copy=False))
+        self.pending_frames += 1
+        if self.pending_frames >= FLUSH_FRAMES:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows to the column files, then update metadata."""
+        self.row_count += sum(len(array) for array in self.pending["frame"])
+        for name, arrays in self.pending.items():
+            if arrays:
+                self.files[name].write(np.concatenate(arrays).tobytes())
+                arrays.clear()
+            self.files[name].flush()
+        self.frame_count += self.pending_frames
+        self.pending_frames = 0
+        self.write_meta(complete=False)
+
+    def write_meta(self, *, complete: bool) -> None:
+        """Write metadata of the rows flushed so far, replacing the file at once."""
+        meta = {
+            "rows": self.row_count,
+            "frames": self.frame_count,
+            "complete": complete,
+            "columns": {
+                name: {"dtype": dtype, "shape": list(shape)}
+                for name, (dtype, shape) in COLUMNS.items()
+            },
+        }
+        meta_file = self.path / META_FILE
+        temp_file = meta_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(meta, indent=2))
+        temp_file.replace(meta_file)
+
+    def close(self) -> None:
+        """Flush, close column files and mark the log complete."""
+        self.flush()
+        for file in self.files.values():
+            file.close()
+        self.write_meta(complete=True)
+        logging.info(
+            f"Detection log {self.path}: {self.row_count} detections, "
+            f"{self.frame_count} frames."
+        )
+
+
+def open_detection_log(log_path: str) -> dict[str, np.ndarray]:
+    """Open a detection log as memory-mapped columns."""
+    path = Path(log_path)
+    meta = json.loads((path / META_FILE).read_text())
+    columns = {}
+    for name, spec in meta["columns"].items():
+        shape = (meta["rows"], *spec["shape"])
+        if meta["rows"] == 0:
+            columns[name] = np.empty(shape, dtype=spec["dtype"])
+        else:
+            columns[name] = np.memmap(
+                path / f"{name}.bin", dtype=spec["dtype"], mode="r", shape=shape
+            )
+    return columns
+
+
+def get_crossed_lines(xyxyn: np.ndarray, params: DetectionParams) -> np.ndarray:
+    """Vectorized DetectionParams.is_below_line, 100, 90, 80 or 0 (false)."""
+    x1, y1, x2, _y2 = params.trigger_line
+    x_center_pos = (xyxyn[:, 2] + xyxyn[:, 0]) / 2
+    y_lower_pos = xyxyn[:, 3]
+    y_offset = params.slope * (x_center_pos - x1)
+    crossed = np.select(
+        [
+            y_lower_pos > y_offset + y1,
+            y_lower_pos > y_offset + params.y_line_90,
+            y_lower_pos > y_offset + params.y_line_80,
+        ],
+        [100, 90, 80],
+        default=0,
+    )
+    crossed[(x_center_pos < x1) | (x_center_pos > x2)] = 0
+    return crossed
+
+
+def get_valid_boxes(xyxyn: np.ndarray, params: DetectionParams) -> np.ndarray:
+    """Vectorized DetectionParams.validate_box."""
+    box_with = xyxyn[:, 2] - xyxyn[:, 0]
+    box_heigth = xyxyn[:, 3] - xyxyn[:, 1]
+    too_small = (box_with < params.box_minimum_size) | (
+        box_heigth < params.box_minimum_size
+    )
+    at_edge = (xyxyn[:, 2] > (1 - params.edge_margin)) | (
+        xyxyn[:, 3] > (1 - params.edge_margin)
+    )
+    too_large = (box_with > params.box_maximum_size) | (
+        box_heigth > params.box_maximum_size
+    )
+    return ~(too_small & at_edge) & ~too_large
+
+
+def replay(columns: dict[str, np.ndarray], params: DetectionParams) -> list[dict]:
+    """Run the crossing logic of process_boxes over a detection log.
+
+    Only detections recorded above the confidence used while recording are in
+    the log, lower min_confidence values give the same result as recorded.
+
+    Args:
+        columns: Detection log, see open_detection_log.
+        params: Detection parameters to evaluate.
+
+    Returns:
+        One crossing per track id, the first frame its box is valid and below
+        the trigger line, with track_id, frame and timestamp - in frame order.
+
+    """
+    candidates = (
+        (columns["cls"] == 0)
+        & (columns["conf"] > params.min_confidence)
+        & (columns["track_id"] != NO_TRACK_ID)
+    )
+    xyxyn = columns["xyxyn"][candidates]
+    crossed = (get_crossed_lines(xyxyn, params) == 100) & get_valid_boxes(  # noqa: PLR2004
+        xyxyn, params
+    )
+    track_ids = columns["track_id"][candidates][crossed]
+    # rows are in frame order, the first row per track id is the crossing
+    unique_ids, first_rows = np.unique(track_ids, return_index=True)
+    frames = columns["frame"][candidates][crossed][first_rows]
+    timestamps = columns["timestamp"][candidates][crossed][first_rows]
+    order = np.argsort(first_rows)
+    return [
+        {
+            "track_id": int(unique_ids[i]),
+            "frame": int(frames[i]),
+            "timestamp": float(timestamps[i]),
+        }
+        for i in order
+    ]
@@ -0,0 +1,99 @@
+"""Module for reading video frames with their capture timestamps."""
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from vision_ai_service.adapters import VideoStreamNotFoundError
+
+READ_TIMEOUT = 10.0
+
+
+class FrameReader:
+    """Class reading frames and capture timestamps from a video file or stream.
+
+    The timestamp of a frame is the stream presentation time (PTS) anchored to
+    the wall clock at the first frame, or the receive time if the stream has
+    no PTS. Files are read frame by frame. For live streams a reader thread
+    keeps only the latest frame, so slow processing never builds up delay.
+    """
+
+    def __init__(self, video_stream_url: str) -> None:
+        """Open the video file or stream.
+
+        Raises:
+            VideoStreamNotFoundError: If the video stream cannot be opened.
+
+        """
+        self.video_stream_url = video_stream_url
+        self.cap = cv2.VideoCapture(video_stream_url)
+        if not self.cap.isOpened():
+            informasjon = f"Error opening video stream from: {video_stream_url}"
+            logging.error(informasjon)
+            raise VideoStreamNotFoundError(informasjon)
+        self.is_file = Path(video_stream_url).is_file()
+        self.start_time: float | None = None
+        self.latest: tuple[np.ndarray, float] | None = None
+        self.new_frame = threading.Condition()
+        self.stopped = False
+        self.thread: threading.Thread | None = None
+        if not self.is_file:
+            self.thread = threading.Thread(
+                target=self.read_latest, name="frame_reader", daemon=True
+            )
+            self.thread.start()
+
+    def read(self) -> tuple[np.ndarray, float] | None:
+        """Read next frame, return frame and capture timestamp (epoch seconds)."""
+        ret_read, im = self.cap.read()
+        if not ret_read:
+            return None
+        receive_time = time.time()
+        pts = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        if self.start_time is None:
+            self.start_time = receive_time - pts
+        if pts > 0:
+            return im, self.start_time + pts
+        return im, receive_time
+
+    def read_latest(self) -> None:
+        """Keep the latest frame of a live stream - runs in reader thread."""
+        while not self.stopped:
+            frame = self.read()
+            with self.new_frame:
+                self.latest = frame
+                if frame is None:
+                    self.stopped = True
+                self.new_frame.notify()
+
+    def __iter__(self) -> Iterator[tuple[np.ndarray, float]]:
+        """Iterate frames and capture timestamps until the stream ends."""
+        if self.is_file:
+            while (frame := self.read()) is not None:
+                yield frame
+            return
+        while True:
+            with self.new_frame:
+                if self.latest is None and not self.stopped:
+                    self.new_frame.wait(READ_TIMEOUT)
+                frame, self.latest = self.latest, None
+            if frame is None:
+                if self.stopped:
+                    return
+                logging.warning(
+                    f"No frame for {READ_TIMEOUT}s from {self.video_stream_url}"
+                )
+                continue
+            yield frame
+
+    def release(self) -> None:
+        """Stop reader thread and release the stream."""
+        self.stopped = True
+        if self.thread:
+            self.thread.join(READ_TIMEOUT)
+        self.cap.release()
@@ -0,0 +1,156 @@
+"""Module for time-boxed profiling of the running process.
+
+cProfile is enabled in the analytics thread between frames, and tracemalloc
+snapshots are taken over the profiling window. The report with top-N hot
+functions, allocation growth and RSS is written to the files directory.
+"""
+
+import asyncio
+import cProfile
+import datetime
+import io
+import logging
+import os
+import pstats
+import resource
+import threading
+import tracemalloc
+from pathlib import Path
+
+TOP_N = 25
+SNAPSHOT_COUNT = 4
+TRACEMALLOC_FRAMES = 10
+HANDOVER_TIMEOUT = 5.0
+
+
+def get_rss_mb() -> float:
+    """Return current resident set size in MB, peak RSS if not on Linux."""
+    try:
+        resident_pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    """Class representing an on-demand profiling session.
+
+    The profiling window is run as a supervised job (run), the analytics
+    thread calls on_frame between frames to profile itself. With several
+    cameras, the thread of the first camera with a frame in the window is
+    profiled.
+    """
+
+    def __init__(self, output_path: str, top_n: int = TOP_N) -> None:
+        """Initialize profiler."""
+        self.output_path = output_path
+        self.top_n = top_n
+        self.active = False
+        self.profile: cProfile.Profile | None = None
+        self.profiled_thread: int | None = None
+        self.lock = threading.Lock()
+        self.finished_profile: cProfile.Profile | None = None
+        self.last_report = ""
+
+    def on_frame(self) -> None:
+        """Start or stop cProfile - called in the analytics thread."""
+        if self.active and self.profile is None:
+            with self.lock:
+                if self.profile is not None:
+                    return
+                self.profile = cProfile.Profile()
+                self.profiled_thread = threading.get_ident()
+            self.profile.enable()
+        elif (
+            not self.active
+            and self.profile is not None
+            and self.profiled_thread == threading.get_ident()
+        ):
+            self.profile.disable()
+            self.finished_profile, self.profile = self.profile, None
+
+    async def run(self, duration: float) -> str:
+        """Profile for duration seconds, return file name of the report."""
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        rss_start = get_rss_mb()
+        # snapshots of a large heap take a while - not in the event loop
+        snapshots = [await asyncio.to_thread(tracemalloc.take_snapshot)]
+        self.finished_profile = None
+        self.active = True
+        logging.info(f"Profiling started for {duration:.0f}s.")
+        try:
+            for _ in range(SNAPSHOT_COUNT):
+                await asyncio.sleep(duration / SNAPSHOT_COUNT)
+                snapshots.append(await asyncio.to_thread(tracemalloc.take_snapshot))
+        finally:
+            self.active = False
+            if started_tracemalloc:
+                tracemalloc.stop()
+        # the analytics thread hands over the profile on its next frame
+        waited = 0.0
+        while self.profile is not None and waited < HANDOVER_TIMEOUT:
+            await asyncio.sleep(0.1)
+            waited += 0.1
+        if self.profile is not None:
+            # analytics session ended during the window
+            self.profile.disable()
+            self.finished_profile, self.profile = self.profile, None
+        report = await asyncio.to_thread(
+            self.get_report, snapshots, rss_start, get_rss_mb(), duration
+        )
+        time_text = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d_%H%M%S")
+        file_name = f"{self.output_path}/profile_{time_text}.txt"
+        await asyncio.to_thread(Path(file_name).write_text, report)
+        if self.finished_profile:
+            # raw stats, e.g. for snakeviz
+            await asyncio.to_thread(
+                self.finished_profile.dump_stats,
+                f"{self.output_path}/profile_{time_text}.prof",
+            )
+        self.last_report = file_name
+        logging.info(f"Profiling report written to {file_name}")
+        return file_name
+
+    def get_report(
+        self,
+        snapshots: list[tracemalloc.Snapshot],
+        rss_start: float,
+        rss_end: float,
+        duration: float,
+    ) -> str:
+        """Create text report of hot functions and allocation growth."""
+        lines = [
+            f"Profiling window: {duration:.0f}s",
+            f"RSS: {rss_start:.1f} MB -> {rss_end:.1f} MB ({rss_end - rss_start:+.1f} MB)",
+            "",
+        ]
+        if self.finished_profile:
+            for sort_key in ["tottime", "cumulative"]:
+                stream = io.StringIO()
+                stats = pstats.Stats(self.finished_profile, stream=stream)
+                stats.sort_stats(sort_key).print_stats(self.top_n)
+                lines += [
+                    f"Top {self.top_n} functions by {sort_key}:",
+                    stream.getvalue(),
+                ]
+        else:
+            lines += ["No analytics frames in the profiling window.", ""]
+        filters = [
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)
+        ]
+        first = snapshots[0].filter_traces(filters)
+        for i, snapshot in enumerate(snapshots[1:], start=1):
+            lines.append(
+                f"Top {self.top_n} allocation growth, snapshot {i} of "
+                f"{len(snapshots) - 1} (at {duration * i / (len(snapshots) - 1):.0f}s):"
+            )
+            lines += [
+                str(stat)
+                for stat in snapshot.filter_traces(filters).compare_to(first, "lineno")[
+                    : self.top_n
+                ]
+            ]
+            lines.append("")
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+"""Module for re-identification of skiers that get a new track id.
+
+When a skier is hidden behind another skier, the tracker may give them a
+new id below the trigger line. An appearance signature of each saved
+crossing is kept in a fixed-size matrix, and a new id is matched against
+the recent signatures before a photo is saved.
+The signature is a hue/saturation histogram of the upper and lower half of
+the crop - jacket and trousers - on a downscaled crop.
+"""
+
+import cv2
+import numpy as np
+
+CAPACITY = 64
+MAX_AGE_SECONDS = 5.0
+MAX_DISTANCE = 0.15  # x center, relative to frame width
+MIN_SIMILARITY = 0.95
+SIGNATURE_SIZE = (32, 64)  # width, height of the downscaled crop
+HUE_BINS = 12
+SATURATION_BINS = 4
+MIN_SATURATION = 30  # dark and grey pixels (snow, shadow) are not counted
+MIN_VALUE = 40
+SIGNATURE_DIMENSIONS = 2 * HUE_BINS * SATURATION_BINS
+
+
+def get_signature(crop: np.ndarray) -> np.ndarray:
+    """Return L2 normalized appearance signature of a crop (BGR)."""
+    if crop.size == 0:
+        return np.zeros(SIGNATURE_DIMENSIONS, dtype=np.float32)
+    small = cv2.resize(crop, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, (0, MIN_SATURATION, MIN_VALUE), (180, 255, 255))
+    half = SIGNATURE_SIZE[1] // 2
+    histograms = [
+        cv2.calcHist(
+            [hsv[rows]],
+            [0, 1],
+            mask[rows],
+            [HUE_BINS, SATURATION_BINS],
+            [0, 180, 0, 256],
+        ).ravel()
+        for rows in [slice(0, half), slice(half, None)]
+    ]
+    signature = np.concatenate(histograms).astype(np.float32)
+    norm = np.linalg.norm(signature)
+    return signature / norm if norm else signature
+
+
+class ReIdCache:
+    """Class representing signatures of recently saved crossings.
+
+    Signatures are kept in a preallocated matrix, oldest entries are
+    overwritten. A lookup is one matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        capacity: int = CAPACITY,
+        max_age: float = MAX_AGE_SECONDS,
+        max_distance: float = MAX_DISTANCE,
+        min_similarity: float = MIN_SIMILARITY,
+    ) -> None:
+        """Initialize cache."""
+        self.max_age = max_age
+        self.max_distance = max_distance
+        self.min_similarity = min_similarity
+        self.signatures = np.zeros((capacity, SIGNATURE_DIMENSIONS), dtype=np.float32)
+        self.track_ids = np.full(capacity, -1, dtype=np.int64)
+        self.times = np.full(capacity, -np.inf)
+        self.x_centers = np.zeros(capacity)
+        self.next_index = 0
+        self.merged: dict[int, int] = {}
+
+    def add(
+        self,
+        track_id: int,
+        signature: np.ndarray,
+        crossing_time: float,
+        x_center: float,
+    ) -> None:
+        """Add signature of a saved crossing, overwriting the oldest."""
+        index = self.next_index % len(self.track_ids)
+        self.signatures[index] = signature
+        self.track_ids[index] = track_id
+        self.times[index] = crossing_time
+        self.x_centers[index] = x_center
+        self.next_index += 1
+
+    def match(
+        self,
+        track_id: int,
+        signature: np.ndarray,
+        crossing_time: float,
+        x_center: float,
+    ) -> int | None:
+        """Return id of a recent crossing with the same appearance, None if new.
+
+        Matched ids are remembered, so the new id is merged with the first.
+        """
+        candidates = (
+            (np.abs(self.times - crossing_time) < self.max_age)
+            & (np.abs(self.x_centers - x_center) < self.max_distance)
+            & (self.track_ids != track_id)
+        )
+        if not candidates.any() or not signature.any():
+            return None
+        similarity = np.where(candidates, self.signatures @ signature, -1.0)
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.min_similarity:
+            return None
+        original_id = int(self.track_ids[best])
+        self.merged[track_id] = self.merged.get(original_id, original_id)
+        return self.merged[track_id]
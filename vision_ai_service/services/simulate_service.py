@@ -1,19 +1,35 @@
 """Module for video services."""
 
+import asyncio
+import codecs
+import collections
+import csv
 import datetime
+import functools
 import logging
+import multiprocessing
+import os
 import random
+import statistics
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
+import aiofiles
 from PIL import Image, ImageDraw, ImageFont
 
 from vision_ai_service.adapters.config_adapter import ConfigAdapter
+from vision_ai_service.adapters.exif_adapter import ExifAdapter
+from vision_ai_service.adapters.http_client import get_client_session
 from vision_ai_service.adapters.status_adapter import StatusAdapter
-from vision_ai_service.adapters.vision_ai_service import VisionAIService
+from vision_ai_service.adapters.token_manager import TokenManager
 
+CHUNK_SIZE = 64 * 1024
 MAX_ERROR_COUNT = 3
+MIN_PARALLEL_CONTESTANTS = 50
+PACED_WORKERS = 4
+START_MODELS = ["mass", "interval"]
 
 
 class SimulateService:
@@ -21,7 +37,7 @@ class SimulateService:
 
     async def simulate_crossings(
         self,
-        token: str,
+        token_manager: TokenManager,
         event: dict,
         status_type: str,
         photos_file_path: str,
@@ -29,7 +45,8 @@ class SimulateService:
         """Simulate line crossings for contestants from an input file.
 
         Args:
-            token: To update databes
+            token_manager: Login token for the services, refreshed during
+                the simulation.
             event: (dict) Event details
             status_type: To update status messages
             photos_file_path: The path to the directory where simulated photos will be saved.
@@ -39,25 +56,39 @@ class SimulateService:
 
         """
         informasjon = ""
-        input_file = await ConfigAdapter().get_config(
-            token, event["id"], "SIMULATION_START_LIST_FILE"
+        input_file = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "SIMULATION_START_LIST_FILE"
         )
-        await ConfigAdapter().update_config(
-            token, event["id"], "SIMULATION_CROSSINGS_START", "False"
+        camera_location = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "CAMERA_LOCATION"
         )
-        camera_location = await ConfigAdapter().get_config(
-            token, event["id"], "CAMERA_LOCATION"
+        fastest_time = await token_manager.call(
+            ConfigAdapter().get_config_int, event["id"], "SIMULATION_FASTEST_TIME"
         )
-        fastest_time = await ConfigAdapter().get_config_int(
-            token, event["id"], "SIMULATION_FASTEST_TIME"
+        mode = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "SIMULATION_MODE"
+        )
+        start_model = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "SIMULATION_START_MODEL"
+        )
+        time_spread = await token_manager.call(
+            ConfigAdapter().get_config_int, event["id"], "SIMULATION_TIME_SPREAD"
+        )
+        start_interval = await token_manager.call(
+            ConfigAdapter().get_config_int, event["id"], "SIMULATION_START_INTERVAL"
         )
         try:
-            contestants = get_contestant_list(input_file)
-            contestants = add_random_crossing_time(contestants, fastest_time)
+            contestants = await get_contestant_list(input_file)
+            if start_model == "list":
+                contestants = add_random_crossing_time(contestants, fastest_time)
+            else:
+                contestants = add_modelled_crossing_time(
+                    contestants, fastest_time, start_model, time_spread, start_interval
+                )
         except Exception as e:
             err_message = f"Error processing file {input_file} - {e}"
-            await StatusAdapter().create_status(
-                token,
+            await token_manager.call(
+                StatusAdapter().create_status,
                 event,
                 status_type,
                 err_message,
@@ -65,20 +96,143 @@ class SimulateService:
             logging.exception(err_message)
             return err_message
 
-        for contestant in contestants:
-            SimulateService().save_image(
-                camera_location,
-                photos_file_path,
-                contestant,
+        if mode == "paced":
+            speedup = parse_speedup(
+                await token_manager.call(
+                    ConfigAdapter().get_config, event["id"], "SIMULATION_SPEEDUP"
+                )
+            )
+            await token_manager.call(
+                StatusAdapter().create_status,
+                event,
+                status_type,
+                f"Simulering startet - {len(contestants)} passeringer i sanntid "
+                f"(x{speedup:g}, {start_model}).",
+            )
+            report = await self.emit_paced(
+                camera_location, photos_file_path, contestants, speedup
             )
-        await StatusAdapter().create_status(
-            token,
+            await token_manager.call(
+                StatusAdapter().create_status,
+                event,
+                status_type,
+                f"Simulering fullført for {report['count']} passeringer. "
+                f"Rate {report['achieved_rate']:.2f}/s (mål {report['target_rate']:.2f}/s), "
+                f"forsinkelse snitt {report['lag_mean_s']:.3f}s, "
+                f"p95 {report['lag_p95_s']:.3f}s, maks {report['lag_max_s']:.3f}s.",
+            )
+            return f"Simulation completed {report}."
+
+        # render in a worker thread, other jobs keep running meanwhile
+        rate = await asyncio.to_thread(
+            self.save_images, camera_location, photos_file_path, contestants
+        )
+        await token_manager.call(
+            StatusAdapter().create_status,
             event,
             status_type,
-            f"Simulering fullført for {len(contestants)} passeringer.",
+            f"Simulering fullført for {len(contestants)} passeringer ({rate:.0f}/s).",
         )
         return f"Simulation completed {informasjon}."
 
+    async def emit_paced(
+        self,
+        camera_location: str,
+        photos_file_path: str,
+        contestants: list,
+        speedup: float,
+    ) -> dict:
+        """Emit crossings on the wall clock according to their crossing times.
+
+        The first crossing is emitted at once, the others when their crossing
+        time (divided by speedup) has passed. Images are rendered in a small
+        thread pool so bursts do not queue behind each other.
+
+        Returns:
+            Report with target and achieved emission rate and lag (seconds
+            from scheduled emission to image written).
+
+        """
+        scheduled = get_emission_schedule(contestants, speedup)
+        loop = asyncio.get_running_loop()
+        lags: list[float] = []
+        start_time = loop.time()
+
+        with ThreadPoolExecutor(
+            max_workers=PACED_WORKERS, thread_name_prefix="simulation"
+        ) as executor:
+
+            async def emit(contestant: dict, due: float) -> None:
+                await loop.run_in_executor(
+                    executor,
+                    render_contestant,
+                    camera_location,
+                    photos_file_path,
+                    contestant,
+                )
+                lags.append(loop.time() - due)
+
+            emissions = []
+            for offset, contestant in scheduled:
+                due = start_time + offset
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                emissions.append(asyncio.create_task(emit(contestant, due)))
+            await asyncio.gather(*emissions)
+
+        elapsed = loop.time() - start_time
+        span = scheduled[-1][0] if scheduled else 0.0
+        report = {
+            "count": len(scheduled),
+            "target_rate": len(scheduled) / span if span else 0.0,
+            "achieved_rate": len(scheduled) / elapsed if elapsed else 0.0,
+            "lag_mean_s": statistics.fmean(lags) if lags else 0.0,
+            "lag_p95_s": get_percentile(lags, 95),
+            "lag_max_s": max(lags, default=0.0),
+        }
+        logging.info(f"Paced simulation report: {report}")
+        return report
+
+    def save_images(
+        self,
+        camera_location: str,
+        photos_file_path: str,
+        contestants: list,
+        max_workers: int | None = None,
+    ) -> float:
+        """Generate and save simulated images for all contestants.
+
+        Contestants are rendered and encoded in a process pool, small lists
+        in process. Returns the number of contestants rendered per second.
+        """
+        start_time = time.perf_counter()
+        max_workers = max_workers or os.cpu_count() or 1
+        if len(contestants) < MIN_PARALLEL_CONTESTANTS or max_workers == 1:
+            for contestant in contestants:
+                self.save_image(camera_location, photos_file_path, contestant)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                chunksize = max(1, len(contestants) // (4 * max_workers))
+                # consume results to surface errors from the workers
+                list(
+                    executor.map(
+                        functools.partial(
+                            render_contestant, camera_location, photos_file_path
+                        ),
+                        contestants,
+                        chunksize=chunksize,
+                    )
+                )
+        elapsed = time.perf_counter() - start_time
+        rate = len(contestants) / elapsed if elapsed else 0.0
+        logging.info(
+            f"Rendered {len(contestants)} contestants in {elapsed:.2f}s - {rate:.1f}/s"
+        )
+        return rate
+
     def save_image(
         self,
         camera_location: str,
@@ -93,38 +247,160 @@ class SimulateService:
             contestant: A dictionary containing contestant information.
 
         """
-        current_time = datetime.datetime.now(datetime.UTC)
-        time_text = f"{contestant['crossing_time']}"
-        exif_bytes = VisionAIService().get_image_info(camera_location, time_text)
-
-        # Write info on image
-        im = Image.new("RGB", (800, 600), color="yellow")
-        font = ImageFont.load_default(size=25)
-        draw = ImageDraw.Draw(im)
-        info_1 = f"{contestant['name']}, {contestant['club']}"
-        draw.text((50, 50), info_1, font=font, fill="black")
-        info_2 = f"Start: {contestant['start_time']} - passering: {contestant['crossing_time']}"
-        draw.text((50, 100), info_2, font=font, fill="black")
-        info_3 = f"Lokasjon: {camera_location}"
-        draw.text((50, 150), info_3, font=font, fill="black")
-        font = ImageFont.load_default(size=100)
-        draw.text((400, 300), str(contestant["bib"]), font=font, fill="black")
-
-        # save image to file - full size
-        timestamp = current_time.strftime("%Y%m%d_%H%M%S")
-        im.save(
-            f"{photos_file_path}/{camera_location}_{timestamp}_{contestant['bib']}.jpg",
-            exif=exif_bytes,
-        )
+        render_contestant(camera_location, photos_file_path, contestant)
+
+
+@functools.lru_cache(maxsize=8)
+def get_font(size: int) -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    """Load default font once per size."""
+    return ImageFont.load_default(size=size)
+
+
+@functools.lru_cache(maxsize=8)
+def get_image_template(camera_location: str) -> Image.Image:
+    """Pre-render yellow background with the location text."""
+    im = Image.new("RGB", (800, 600), color="yellow")
+    draw = ImageDraw.Draw(im)
+    info_3 = f"Lokasjon: {camera_location}"
+    draw.text((50, 150), info_3, font=get_font(25), fill="black")
+    return im
+
+
+@functools.lru_cache(maxsize=1)
+def get_crop_template() -> Image.Image:
+    """Pre-render yellow background of crop image."""
+    return Image.new("RGB", (400, 300), color="yellow")
+
+
+def render_contestant(
+    camera_location: str,
+    photos_file_path: str,
+    contestant: dict,
+) -> None:
+    """Render and save image and crop image for a contestant.
 
-        # crop image
-        im_c = Image.new("RGB", (400, 300), color="yellow")
-        draw_c = ImageDraw.Draw(im_c)
-        draw_c.text((150, 100), str(contestant["bib"]), font=font, fill="black")
-        im_c.save(
-            f"{photos_file_path}/{camera_location}_{timestamp}_{contestant['bib']}_crop.jpg",
-            exif=exif_bytes,
+    Module level function, so it can run in a process pool.
+    """
+    current_time = datetime.datetime.now(datetime.UTC)
+    time_text = f"{contestant['crossing_time']}"
+    exif_bytes = ExifAdapter().get_image_info(camera_location, time_text)
+
+    # Write info on image
+    im = get_image_template(camera_location).copy()
+    font = get_font(25)
+    draw = ImageDraw.Draw(im)
+    info_1 = f"{contestant['name']}, {contestant['club']}"
+    draw.text((50, 50), info_1, font=font, fill="black")
+    info_2 = (
+        f"Start: {contestant['start_time']} - passering: {contestant['crossing_time']}"
+    )
+    draw.text((50, 100), info_2, font=font, fill="black")
+    font = get_font(100)
+    draw.text((400, 300), str(contestant["bib"]), font=font, fill="black")
+
+    # save image to file - full size
+    timestamp = current_time.strftime("%Y%m%d_%H%M%S")
+    im.save(
+        f"{photos_file_path}/{camera_location}_{timestamp}_{contestant['bib']}.jpg",
+        exif=exif_bytes,
+    )
+
+    # crop image
+    im_c = get_crop_template().copy()
+    draw_c = ImageDraw.Draw(im_c)
+    draw_c.text((150, 100), str(contestant["bib"]), font=font, fill="black")
+    im_c.save(
+        f"{photos_file_path}/{camera_location}_{timestamp}_{contestant['bib']}_crop.jpg",
+        exif=exif_bytes,
+    )
+
+
+def add_modelled_crossing_time(
+    contestants: list,
+    fastest_time: int,
+    start_model: str,
+    time_spread: int,
+    start_interval: int,
+) -> list:
+    """Add crossing times following a start model.
+
+    Args:
+        contestants: (list) A list of contestant dictionaries.
+        fastest_time: (int) The time in seconds. Crossing time for fastest racer.
+        start_model: (str) mass - everybody starts at the first start time and
+            arrives in a bunch with a tail. interval - one start every
+            start_interval seconds in bib order, spread evenly.
+        time_spread: (int) Seconds between fastest and slowest racer.
+        start_interval: (int) Seconds between starts, interval start only.
+
+    Returns:
+        A list of contestant dictionaries with start and crossing times.
+
+    """
+    if start_model not in START_MODELS:
+        informasjon = (
+            f"Unknown SIMULATION_START_MODEL {start_model}, use {START_MODELS}."
         )
+        raise ValueError(informasjon)
+    first_start = min(contestant["start_time"] for contestant in contestants)
+    ordered = sorted(contestants, key=lambda contestant: contestant["bib"])
+    for i, contestant in enumerate(ordered):
+        if start_model == "mass":
+            contestant["start_time"] = first_start
+            # gamma distribution - a bunch close to the fastest and a long tail
+            race_time = fastest_time + random.gammavariate(2, time_spread / 8)
+        else:
+            contestant["start_time"] = add_seconds_to_time(
+                first_start, i * start_interval
+            )
+            race_time = fastest_time + random.uniform(0, time_spread)  # noqa: S311
+        contestant["crossing_time"] = add_seconds_to_time(
+            contestant["start_time"], round(race_time)
+        )
+    return ordered
+
+
+def parse_speedup(value: str) -> float:
+    """Return SIMULATION_SPEEDUP as a number above 0, 1 if it is not."""
+    try:
+        speedup = float(value)
+    except ValueError:
+        speedup = 0.0
+    if speedup > 0:
+        return speedup
+    logging.warning(f"Invalid SIMULATION_SPEEDUP {value}, must be above 0 - using 1.")
+    return 1.0
+
+
+def get_emission_schedule(
+    contestants: list, speedup: float
+) -> list[tuple[float, dict]]:
+    """Return (seconds from first crossing / speedup, contestant) in time order."""
+    timed = []
+    for contestant in contestants:
+        try:
+            crossing_time = datetime.datetime.fromisoformat(contestant["crossing_time"])
+        except ValueError:
+            logging.warning(
+                f"Invalid crossing time {contestant['crossing_time']} - skipped."
+            )
+            continue
+        timed.append((crossing_time, contestant))
+    timed.sort(key=lambda item: item[0])
+    if not timed:
+        return []
+    first_crossing = timed[0][0]
+    return [
+        ((crossing_time - first_crossing).total_seconds() / speedup, contestant)
+        for crossing_time, contestant in timed
+    ]
+
+
+def get_percentile(values: list[float], percentile: int) -> float:
+    """Return percentile of values, 0.0 for an empty list."""
+    if len(values) < 2:  # noqa: PLR2004
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percentile - 1]
 
 
 def add_random_crossing_time(contestants: list, fastest_time: int) -> list:
@@ -148,11 +424,11 @@ def add_random_crossing_time(contestants: list, fastest_time: int) -> list:
     return contestants_with_crossing_time
 
 
-def get_contestant_list(file_name: str) -> list:
-    """Load contestant data from a CSV file.
+async def get_contestant_list(file_name: str) -> list:
+    """Load contestant data from a CSV file or url.
 
     Args:
-        file_name: The path to the CSV file.
+        file_name: The path or url to the CSV file.
 
     Returns:
         A list of dictionaries, each containing data for one contestant.
@@ -160,25 +436,46 @@ def get_contestant_list(file_name: str) -> list:
     Raises:
         Exception: If there are errors opening or parsing the file.
 
+    """
+    return [contestant async for contestant in read_contestants(file_name)]
+
+
+async def read_contestants(file_name: str) -> AsyncIterator[dict]:
+    """Stream contestant data from a CSV file or url.
+
+    The start list is read in chunks and parsed one line at a time, memory use
+    does not grow with the size of the list. Columns are separated by ; or ,
+    as found in the header line.
+
+    Args:
+        file_name: The path or url to the CSV file.
+
+    Yields:
+        A dictionary containing data for one contestant.
+
+    Raises:
+        Exception: If there are errors opening or parsing the file.
+
     """
     error_text = ""
     index_row = 0
     headers = {}
     i_errors = 0
-    contestant_list = []
-
-    input_list = get_input_as_list(file_name)
-
-    for raw_line in input_list:
-        str_oneline = raw_line.replace("\n", "")
+    # one reader for the file, fed the lines one at a time as they are read
+    pending: collections.deque[str] = collections.deque()
+    reader = None
+
+    async for raw_line in read_lines(file_name):
+        str_oneline = raw_line.rstrip("\r")
+        if not str_oneline.strip():
+            continue
+        index_row += 1
+        if reader is None:
+            delimiter = ";" if str_oneline.find(";") != -1 else ","
+            reader = csv.reader(iter(pending.popleft, None), delimiter=delimiter)
+        pending.append(str_oneline)
         try:
-            index_row += 1
-            # split by ; or ,
-            if str_oneline.find(";") == -1:
-                clean_line = str_oneline.replace(",", ";")
-                elements = clean_line.split(";")
-            else:
-                elements = str_oneline.split(";")
+            elements = next(reader)
             # identify headers
             if index_row == 1:
                 for index_column, element in enumerate(elements):
@@ -187,45 +484,42 @@ def get_contestant_list(file_name: str) -> list:
                         headers["bib"] = 0
                     headers[element] = index_column
             else:
-                request_body = get_contestant_dict(elements, headers)
-                contestant_list.append(request_body)
-
+                yield get_contestant_dict(elements, headers)
         except Exception as e:
-            if "401" in str(e):
-                error_text = f"401 Ingen tilgang, vennligst logg inn på nytt. {e}"
-                break
             i_errors += 1
             error_text = f"Feil i linje {index_row}: {str_oneline}. {e}"
             logging.exception(error_text)
-            error_text += f"<br>{e}"
         if i_errors > MAX_ERROR_COUNT:
             error_text = f"For mange feil i filen - avsluttet import. {error_text}"
             raise Exception(error_text)
 
-    return contestant_list
 
+async def read_lines(file_name: str) -> AsyncIterator[str]:
+    """Read text lines from a file or url without loading it all."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    rest = ""
+    async for chunk in read_chunks(file_name):
+        *lines, rest = (rest + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line
+    rest += decoder.decode(b"", final=True)
+    if rest:
+        yield rest
 
-def get_input_as_list(file_name: str) -> list:
-    """Retrieve input as a list from a file or url."""
-    input_list = []
 
+async def read_chunks(file_name: str) -> AsyncIterator[bytes]:
+    """Read bytes in chunks from a file (aiofiles) or url (pooled session)."""
     if file_name.startswith("http"):
-        # read from url
-        response = requests.get(file_name, timeout=10)
-        if response.status_code == HTTPStatus.OK:
-            text_content = response.text
-            # Directly create the list from split lines
-            input_list = text_content.splitlines()
-        else:
-            error_text = f"Fant ikke filen på url: {file_name}. {response}"
-            raise Exception(error_text)
+        async with get_client_session().get(file_name) as response:
+            if response.status != HTTPStatus.OK:
+                error_text = f"Fant ikke filen på url: {file_name}. {response}"
+                raise Exception(error_text)
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                yield chunk
     else:
-        file_path = Path(file_name)
-        with file_path.open() as file:
-            for line in file:
-                cleaned_line = line.replace("\n", "")
-                input_list.append(cleaned_line)
-    return input_list
+        async with aiofiles.open(file_name, "rb") as file:
+            while chunk := await file.read(CHUNK_SIZE):
+                yield chunk
 
 
 def get_contestant_dict(elements: list, headers: dict) -> dict:
@@ -0,0 +1,166 @@
+"""Module for the startup sequence of the service."""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from vision_ai_service.adapters.config_adapter import ConfigAdapter
+from vision_ai_service.adapters.events_adapter import EventsAdapter
+from vision_ai_service.adapters.exceptions import CircuitOpenError
+from vision_ai_service.adapters.status_adapter import StatusAdapter
+from vision_ai_service.adapters.token_manager import TokenManager
+
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10.0
+
+
+class StartupService:
+    """Class representing the startup sequence.
+
+    Independent steps run concurrently: with warm-up, the vision model is
+    loaded in a worker thread while login and event discovery are in
+    progress, and the ready status is posted at the same time as the service
+    is flagged available. Each step is timed and a time-to-ready breakdown
+    is logged. The service is ready when the warm-up is done.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the startup sequence."""
+        self.timings: dict[str, float] = {}
+        self.inference_seconds: float | None = None
+
+    async def start(
+        self,
+        token_manager: TokenManager,
+        warm_up: Callable[[], Any] | None = None,
+    ) -> tuple[dict, str]:
+        """Run the startup sequence, return event and status type."""
+        start_time = time.perf_counter()
+        model_task = None
+        if warm_up:
+            model_task = asyncio.create_task(
+                self.timed("model", asyncio.to_thread(warm_up))
+            )
+
+        await self.timed("login", self.do_login(token_manager))
+        event = await self.timed("event", self.get_event(token_manager))
+        status_type = await self.timed(
+            "status_type",
+            retry_with_backoff(
+                "get status type",
+                lambda: token_manager.call(
+                    ConfigAdapter().get_config,
+                    event["id"],
+                    "VIDEO_ANALYTICS_STATUS_TYPE",
+                ),
+            ),
+        )
+        if model_task:
+            try:
+                self.inference_seconds = await model_task
+            except Exception:
+                # analytics will load the model again on first start
+                logging.exception("Vision model warm-up failed.")
+
+        information = (
+            f"vision-ai-service is ready! - {event['name']}, {event['date_of_event']}"
+        )
+        await self.timed(
+            "announce",
+            asyncio.gather(
+                token_manager.call(
+                    StatusAdapter().create_status, event, status_type, information
+                ),
+                token_manager.call(
+                    ConfigAdapter().update_config,
+                    event["id"],
+                    "VIDEO_ANALYTICS_AVAILABLE",
+                    "True",
+                ),
+            ),
+        )
+        self.timings["total"] = time.perf_counter() - start_time
+        logging.info(self.get_time_to_ready_text())
+        return event, status_type
+
+    async def timed(self, name: str, aw: Awaitable[Any]) -> Any:
+        """Await and record duration of a startup step."""
+        step_start = time.perf_counter()
+        try:
+            return await aw
+        finally:
+            self.timings[name] = time.perf_counter() - step_start
+
+    def get_time_to_ready_text(self) -> str:
+        """Return time-to-ready breakdown as text."""
+        steps = ", ".join(
+            f"{name} {seconds:.2f}s"
+            for name, seconds in self.timings.items()
+            if name != "total"
+        )
+        return f"Time to ready {self.timings.get('total', 0):.2f}s - {steps}"
+
+    async def do_login(self, token_manager: TokenManager) -> str:
+        """Login to data-source."""
+        return await retry_with_backoff(
+            "login", token_manager.get_token, "Vision AI is waiting for db connection"
+        )
+
+    async def get_event(self, token_manager: TokenManager) -> dict:
+        """Get event_details - use info from config and db."""
+
+        async def find_event() -> dict:
+            events_db = await token_manager.call(EventsAdapter().get_all_events)
+            event_id_config = os.getenv("EVENT_ID")
+            if len(events_db) == 1:
+                return events_db[0]
+            if len(events_db) > 1:
+                for _event in events_db:
+                    if _event["id"] == event_id_config:
+                        return _event
+                information = f"Multiple events found. Please specify an EVENT_ID in .env: {events_db}"
+                raise Exception(information)
+            information = "No events found."
+            raise Exception(information)
+
+        return await retry_with_backoff(
+            "get event",
+            find_event,
+            "vision-ai-service is waiting for an event to work on.",
+        )
+
+
+async def retry_with_backoff(
+    name: str,
+    func: Callable[[], Awaitable[Any]],
+    waiting_message: str = "",
+) -> Any:
+    """Call func until it succeeds, sleep with jittered exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except CircuitOpenError as e:
+            delay = e.retry_after
+            logging.info(str(e))
+        except Exception as e:
+            delay = get_backoff_delay(attempt)
+            logging.info(f"{name} failed: {e}")
+        if waiting_message:
+            logging.info(waiting_message)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def get_backoff_delay(
+    attempt: int,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+) -> float:
+    """Return exponential backoff delay with jitter for a retry attempt."""
+    delay = min(max_delay, base_delay * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311
@@ -0,0 +1,87 @@
+"""Module for supervising concurrent jobs."""
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+STOP_GRACE_PERIOD = 10.0
+
+
+class TaskSupervisor:
+    """Class representing supervised jobs running as asyncio tasks.
+
+    Each job (analytics, trigger line, simulation) has its own task, at most
+    one per name. Failures are logged and reported through the on_error
+    callback, and jobs can be cancelled individually or all at shutdown.
+    """
+
+    def __init__(
+        self,
+        on_error: Callable[[str, BaseException], Coroutine[Any, Any, None]]
+        | None = None,
+    ) -> None:
+        """Initialize the supervisor."""
+        self.on_error = on_error
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.status: dict[str, str] = {}
+        self._callbacks: set[asyncio.Task] = set()
+
+    def is_running(self, name: str) -> bool:
+        """Check if job is running."""
+        task = self.tasks.get(name)
+        return task is not None and not task.done()
+
+    def start(self, name: str, coro: Coroutine[Any, Any, Any]) -> bool:
+        """Start job as a task, return False if it is already running."""
+        if self.is_running(name):
+            coro.close()
+            logging.info(f"Job {name} is already running.")
+            return False
+        task = asyncio.create_task(coro, name=name)
+        task.add_done_callback(self._on_done)
+        self.tasks[name] = task
+        self.status[name] = "running"
+        logging.info(f"Job {name} started.")
+        return True
+
+    async def cancel(self, name: str, grace_period: float = 0.0) -> bool:
+        """Cancel job, waiting up to grace_period for it to finish by itself."""
+        task = self.tasks.get(name)
+        if task is None or task.done():
+            return False
+        if grace_period:
+            done, _pending = await asyncio.wait({task}, timeout=grace_period)
+            if done:
+                return True
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel all jobs."""
+        for name in list(self.tasks):
+            await self.cancel(name)
+
+    def get_status(self) -> dict[str, str]:
+        """Return status per job - running, completed, cancelled or failed."""
+        return dict(self.status)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        """Record job result and report failures."""
+        name = task.get_name()
+        if task.cancelled():
+            self.status[name] = "cancelled"
+            logging.info(f"Job {name} cancelled.")
+            return
+        error = task.exception()
+        if error is None:
+            self.status[name] = "completed"
+            logging.info(f"Job {name} completed: {task.result()}")
+            return
+        self.status[name] = "failed"
+        logging.error(f"Job {name} failed: {error}", exc_info=error)
+        if self.on_error:
+            callback = asyncio.create_task(self.on_error(name, error))
+            self._callbacks.add(callback)
+            callback.add_done_callback(self._callbacks.discard)
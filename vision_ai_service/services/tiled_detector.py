@@ -0,0 +1,162 @@
+"""Module for tiled detection on high resolution frames.
+
+The band around the trigger line is split in overlapping tiles, detected in
+one batch together with a downscaled full frame, merged with NMS and then
+tracked. Distant skiers are detected at native resolution, while the cost
+stays close to a handful of low resolution frames.
+"""
+
+import functools
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from vision_ai_service.services.trackers import (
+    ByteTracker,
+    Tracker,
+    get_tracked_result,
+)
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+    from ultralytics.engine.results import Results
+
+TILE_SIZE = 640
+TILE_OVERLAP = 0.2
+NMS_IOU = 0.5
+EDGE_PIXELS = 2  # boxes this close to an inner tile edge are cut by the tile
+
+
+@functools.lru_cache(maxsize=8)
+def get_tile_layout(
+    width: int,
+    height: int,
+    trigger_line: tuple[float, float, float, float],
+    tile_size: int = TILE_SIZE,
+    overlap: float = TILE_OVERLAP,
+) -> tuple[tuple[int, int, int, int], ...]:
+    """Return tiles (x1, y1, x2, y2) covering the trigger line band.
+
+    The band reaches 3/4 tile above the line, where skiers approach, and 1/4
+    tile below. Computed once per resolution and trigger line.
+    """
+    x1, y1, x2, y2 = trigger_line
+    tile_w = min(tile_size, width)
+    tile_h = min(tile_size, height)
+    band_left = int(max(0.0, x1) * width)
+    band_right = int(min(1.0, x2) * width)
+    band_top = max(0, int(min(y1, y2) * height - 0.75 * tile_h))
+    band_bottom = min(height, int(max(y1, y2) * height + 0.25 * tile_h))
+
+    def get_starts(start: int, end: int, size: int, limit: int) -> list[int]:
+        """Tile start positions from start to end, with overlap."""
+        end = max(end, start + size)
+        step = max(1, int(size * (1 - overlap)))
+        starts = list(range(start, max(start, end - size) + 1, step))
+        if starts[-1] + size < end:
+            starts.append(end - size)
+        return sorted({min(max(0, s), limit - size) for s in starts})
+
+    return tuple(
+        (tx, ty, tx + tile_w, ty + tile_h)
+        for ty in get_starts(band_top, band_bottom, tile_h, height)
+        for tx in get_starts(band_left, band_right, tile_w, width)
+    )
+
+
+def non_max_suppression(detections: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Class agnostic NMS of detections (x1, y1, x2, y2, conf, cls)."""
+    order = detections[:, 4].argsort()[::-1]
+    areas = (detections[:, 2] - detections[:, 0]) * (
+        detections[:, 3] - detections[:, 1]
+    )
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(
+            np.minimum(detections[i, 2], detections[rest, 2])
+            - np.maximum(detections[i, 0], detections[rest, 0]),
+            0,
+            None,
+        )
+        h = np.clip(
+            np.minimum(detections[i, 3], detections[rest, 3])
+            - np.maximum(detections[i, 1], detections[rest, 1]),
+            0,
+            None,
+        )
+        intersection = w * h
+        iou = intersection / (areas[i] + areas[rest] - intersection + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return detections[keep]
+
+
+class TiledDetector:
+    """Class detecting on tiles of the trigger line band and tracking the result."""
+
+    def __init__(
+        self,
+        model: "YOLO",
+        tile_size: int = TILE_SIZE,
+        overlap: float = TILE_OVERLAP,
+        tracker: Tracker | None = None,
+    ) -> None:
+        """Initialize detector, ByteTrack is used if no tracker is given."""
+        self.model = model
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.tracker = tracker or ByteTracker()
+
+    def detect(
+        self,
+        im: np.ndarray,
+        trigger_line: tuple[float, float, float, float],
+        conf: float,
+        classes: list[int],
+    ) -> np.ndarray:
+        """Detect on tiles and full frame in one batch, return merged detections.
+
+        All images are letterboxed to tile size - tiles keep native resolution,
+        the full frame (for skiers larger than a tile) is downscaled.
+        """
+        height, width = im.shape[:2]
+        tiles = get_tile_layout(
+            width, height, trigger_line, self.tile_size, self.overlap
+        )
+        crops = [im] + [im[ty1:ty2, tx1:tx2] for tx1, ty1, tx2, ty2 in tiles]
+        results = self.model.predict(
+            crops, conf=conf, classes=classes, imgsz=self.tile_size, verbose=False
+        )
+        detections = [results[0].boxes.data.cpu().numpy()]
+        for (tx1, ty1, tx2, ty2), result in zip(tiles, results[1:], strict=True):
+            data = result.boxes.data.cpu().numpy().copy()
+            if not len(data):
+                continue
+            # drop boxes cut by an inner tile edge, found whole in a neighbour tile
+            cut = (
+                ((data[:, 0] < EDGE_PIXELS) & (tx1 > 0))
+                | ((data[:, 1] < EDGE_PIXELS) & (ty1 > 0))
+                | ((data[:, 2] > tx2 - tx1 - EDGE_PIXELS) & (tx2 < width))
+                | ((data[:, 3] > ty2 - ty1 - EDGE_PIXELS) & (ty2 < height))
+            )
+            data = data[~cut]
+            data[:, [0, 2]] += tx1
+            data[:, [1, 3]] += ty1
+            detections.append(data)
+        merged = np.concatenate(detections)
+        if not len(merged):
+            return merged.reshape(0, 6)
+        return non_max_suppression(merged, NMS_IOU)
+
+    def track(
+        self,
+        im: np.ndarray,
+        trigger_line: tuple[float, float, float, float],
+        conf: float,
+        classes: list[int],
+    ) -> "Results":
+        """Detect and track one frame, return result with track ids."""
+        detections = self.detect(im, trigger_line, conf, classes)
+        return get_tracked_result(self.model, self.tracker, im, detections)
@@ -0,0 +1,238 @@
+"""Module for pluggable multi-object trackers.
+
+A tracker takes the detections of one frame, rows of (x1, y1, x2, y2, conf,
+cls), and returns the tracked boxes of the frame, rows of (x1, y1, x2, y2,
+track id, conf, cls, detection index) - the format of the ultralytics
+trackers.
+"""
+
+import logging
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Protocol
+
+import lap
+import numpy as np
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+    from ultralytics.engine.results import Results
+
+TRACKERS = ["ultralytics", "bytetrack", "lap"]
+MAX_AGE = 30
+MAX_TRACKS = 256
+MIN_IOU = 0.3
+MAX_CENTROID_DISTANCE = 0.5  # relative to track box diagonal
+CENTROID_WEIGHT = 0.5
+NEW_TRACK_CONFIDENCE = 0.25
+VELOCITY_SMOOTHING = 0.5
+GATED_COST = 1e6
+# defaults of ultralytics bytetrack.yaml
+BYTETRACK_ARGS = SimpleNamespace(
+    tracker_type="bytetrack",
+    track_high_thresh=0.25,
+    track_low_thresh=0.1,
+    new_track_thresh=0.25,
+    track_buffer=MAX_AGE,
+    match_thresh=0.8,
+    fuse_score=True,
+)
+
+
+class Tracker(Protocol):
+    """Interface of a tracker."""
+
+    def update(
+        self, detections: np.ndarray, im: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Associate detections (N, 6) of one frame, return tracks (M, 8)."""
+        ...
+
+
+class ByteTracker:
+    """Class wrapping the ByteTrack implementation of ultralytics."""
+
+    def __init__(self, frame_rate: int = 30, max_age: int = MAX_AGE) -> None:
+        """Initialize tracker."""
+        from ultralytics.trackers.byte_tracker import BYTETracker
+
+        args = SimpleNamespace(**vars(BYTETRACK_ARGS))
+        args.track_buffer = max_age
+        self.tracker = BYTETracker(args=args, frame_rate=frame_rate)
+
+    def update(
+        self, detections: np.ndarray, im: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Associate detections of one frame, return tracks."""
+        from ultralytics.engine.results import Boxes
+
+        shape = im.shape[:2] if im is not None else (1, 1)
+        tracks = self.tracker.update(Boxes(detections, shape), im)
+        return tracks if len(tracks) else np.empty((0, 8))
+
+
+class LapTracker:
+    """Class for a lean IoU and centroid tracker, solved with lap.lapjv.
+
+    Track state is kept in preallocated arrays. Track boxes are predicted
+    with constant velocity, so fast skiers are matched also at low frame rate.
+    Tracks not matched for max_age frames are removed.
+    """
+
+    def __init__(
+        self,
+        max_age: int = MAX_AGE,
+        min_iou: float = MIN_IOU,
+        max_distance: float = MAX_CENTROID_DISTANCE,
+        new_track_confidence: float = NEW_TRACK_CONFIDENCE,
+        capacity: int = MAX_TRACKS,
+    ) -> None:
+        """Initialize tracker."""
+        self.max_age = max_age
+        self.min_iou = min_iou
+        self.max_distance = max_distance
+        self.new_track_confidence = new_track_confidence
+        self.boxes = np.zeros((capacity, 4))
+        self.velocity = np.zeros((capacity, 4))
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.age = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.next_id = 1
+
+    def update(
+        self,
+        detections: np.ndarray,
+        im: np.ndarray | None = None,  # noqa: ARG002
+    ) -> np.ndarray:
+        """Associate detections of one frame, return tracks."""
+        slots = np.flatnonzero(self.active)
+        predicted = (
+            self.boxes[slots] + self.velocity[slots] * (self.age[slots] + 1)[:, None]
+        )
+        track_for_detection = np.full(len(detections), -1)
+        if len(slots) and len(detections):
+            cost = get_cost_matrix(
+                predicted, detections[:, :4], self.min_iou, self.max_distance
+            )
+            _, detection_for_track, _ = lap.lapjv(
+                cost, extend_cost=True, cost_limit=GATED_COST / 2
+            )
+            for row, column in enumerate(detection_for_track):
+                if column >= 0:
+                    track_for_detection[column] = slots[row]
+
+        matched = track_for_detection >= 0
+        matched_slots = track_for_detection[matched]
+        new_boxes = detections[matched, :4]
+        velocity = (new_boxes - self.boxes[matched_slots]) / (
+            self.age[matched_slots] + 1
+        )[:, None]
+        self.velocity[matched_slots] = (
+            VELOCITY_SMOOTHING * self.velocity[matched_slots]
+            + (1 - VELOCITY_SMOOTHING) * velocity
+        )
+        self.boxes[matched_slots] = new_boxes
+
+        # age unmatched tracks, remove the old ones
+        unmatched_slots = np.setdiff1d(slots, matched_slots)
+        self.age[unmatched_slots] += 1
+        self.active[unmatched_slots[self.age[unmatched_slots] > self.max_age]] = False
+        self.age[matched_slots] = 0
+
+        # new tracks for confident unmatched detections
+        new = np.flatnonzero(~matched & (detections[:, 4] >= self.new_track_confidence))
+        free_slots = np.flatnonzero(~self.active)[: len(new)]
+        if len(free_slots) < len(new):
+            logging.warning(
+                f"Tracker full - {len(new) - len(free_slots)} tracks dropped."
+            )
+            new = new[: len(free_slots)]
+        self.boxes[free_slots] = detections[new, :4]
+        self.velocity[free_slots] = 0
+        self.age[free_slots] = 0
+        self.active[free_slots] = True
+        self.ids[free_slots] = np.arange(self.next_id, self.next_id + len(new))
+        self.next_id += len(new)
+        track_for_detection[new] = free_slots
+
+        tracked = np.flatnonzero(track_for_detection >= 0)
+        return np.column_stack(
+            [
+                detections[tracked, :4],
+                self.ids[track_for_detection[tracked]],
+                detections[tracked, 4:6],
+                tracked,
+            ]
+        )
+
+
+def get_cost_matrix(
+    tracks: np.ndarray, detections: np.ndarray, min_iou: float, max_distance: float
+) -> np.ndarray:
+    """Return association cost of tracks (rows) and detections (columns).
+
+    Cost is 1 - IoU plus centroid distance relative to the track diagonal.
+    Pairs with low IoU and far centroids are gated out.
+    """
+    x1 = np.maximum(tracks[:, None, 0], detections[None, :, 0])
+    y1 = np.maximum(tracks[:, None, 1], detections[None, :, 1])
+    x2 = np.minimum(tracks[:, None, 2], detections[None, :, 2])
+    y2 = np.minimum(tracks[:, None, 3], detections[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    track_area = (tracks[:, 2] - tracks[:, 0]) * (tracks[:, 3] - tracks[:, 1])
+    detection_area = (detections[:, 2] - detections[:, 0]) * (
+        detections[:, 3] - detections[:, 1]
+    )
+    iou = intersection / (
+        track_area[:, None] + detection_area[None, :] - intersection + 1e-9
+    )
+
+    track_centers = (tracks[:, :2] + tracks[:, 2:]) / 2
+    detection_centers = (detections[:, :2] + detections[:, 2:]) / 2
+    diagonal = np.hypot(tracks[:, 2] - tracks[:, 0], tracks[:, 3] - tracks[:, 1]) + 1e-9
+    distance = (
+        np.linalg.norm(
+            track_centers[:, None, :] - detection_centers[None, :, :], axis=2
+        )
+        / diagonal[:, None]
+    )
+    cost = 1 - iou + CENTROID_WEIGHT * distance
+    cost[(iou < min_iou) & (distance > max_distance)] = GATED_COST
+    return cost
+
+
+def get_tracker(name: str, frame_rate: int = 30, max_age: int = MAX_AGE) -> Tracker:
+    """Create tracker by name, bytetrack or lap."""
+    if name == "bytetrack":
+        return ByteTracker(frame_rate, max_age)
+    if name == "lap":
+        return LapTracker(max_age)
+    informasjon = f"Unknown TRACKER {name}, use {TRACKERS}."
+    raise ValueError(informasjon)
+
+
+def track_frame(
+    model: "YOLO",
+    tracker: Tracker,
+    im: np.ndarray,
+    conf: float,
+    classes: list[int],
+    image_size: tuple,
+) -> "Results":
+    """Detect on one frame and track with the given tracker."""
+    result = model.predict(
+        im, conf=conf, classes=classes, imgsz=image_size, verbose=False
+    )[0]
+    return get_tracked_result(model, tracker, im, result.boxes.data.cpu().numpy())
+
+
+def get_tracked_result(
+    model: "YOLO", tracker: Tracker, im: np.ndarray, detections: np.ndarray
+) -> "Results":
+    """Track detections (x1, y1, x2, y2, conf, cls), return result with track ids."""
+    import torch
+    from ultralytics.engine.results import Results
+
+    tracks = tracker.update(detections, im)
+    # drop the detection index, boxes are (x1, y1, x2, y2, id, conf, cls)
+    boxes = torch.as_tensor(tracks[:, :-1] if len(tracks) else np.empty((0, 7)))
+    return Results(im, path="", names=model.names, boxes=boxes)
@@ -0,0 +1,183 @@
+"""Module for tracking session parameters that can be changed mid-session."""
+
+import logging
+from dataclasses import dataclass, field
+
+from vision_ai_service.adapters.config_adapter import ConfigAdapter
+
+DETECTION_BOX_MINIMUM_SIZE = 0.08
+DETECTION_BOX_MAXIMUM_SIZE = 0.9
+EDGE_MARGIN = 0.02
+MIN_CONFIDENCE = 0.6
+TRIGGER_LINE = (0.0, 0.75, 1.0, 0.75)
+COUNT_COORDINATES = 4
+PARAMETER_KEYS = {
+    "trigger_line": "TRIGGER_LINE_XYXYN",
+    "min_confidence": "MIN_CONFIDENCE",
+    "box_minimum_size": "DETECTION_BOX_MINIMUM_SIZE",
+    "box_maximum_size": "DETECTION_BOX_MAXIMUM_SIZE",
+    "edge_margin": "EDGE_MARGIN",
+}
+
+
+@dataclass(frozen=True)
+class DetectionParams:
+    """Class representing detection parameters with precomputed line geometry."""
+
+    trigger_line: tuple[float, float, float, float] = TRIGGER_LINE
+    min_confidence: float = MIN_CONFIDENCE
+    box_minimum_size: float = DETECTION_BOX_MINIMUM_SIZE
+    box_maximum_size: float = DETECTION_BOX_MAXIMUM_SIZE
+    edge_margin: float = EDGE_MARGIN
+    slope: float = field(init=False, compare=False)
+    y_line_80: float = field(init=False, compare=False)
+    y_line_90: float = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute trigger line geometry."""
+        x1, y1, x2, y2 = self.trigger_line
+        if x2 <= x1:
+            informasjon = "TRIGGER_LINE_XYXYN must have x2 larger than x1."
+            raise ValueError(informasjon)
+        object.__setattr__(self, "slope", (y2 - y1) / (x2 - x1))
+        object.__setattr__(self, "y_line_80", y1 * 0.8)
+        object.__setattr__(self, "y_line_90", y1 * 0.9)
+
+    def is_below_line(self, xyxyn: list[float]) -> str:
+        """Check if a point is below the trigger line."""
+        x1, y1, x2, _y2 = self.trigger_line
+        x_center_pos = (xyxyn[2] + xyxyn[0]) / 2
+        y_lower_pos = xyxyn[3]
+        # check if more than half of the box is outside line x values
+        if (x_center_pos < x1) or (x_center_pos > x2):
+            return "false"
+        # get line y value at point x and check if point y is below
+        y_offset = self.slope * (x_center_pos - x1)
+        if y_lower_pos > y_offset + y1:
+            return "100"
+        if y_lower_pos > y_offset + self.y_line_90:
+            return "90"
+        if y_lower_pos > y_offset + self.y_line_80:
+            return "80"
+        return "false"
+
+    def get_line_offset(self, xyxyn: list[float]) -> float:
+        """Return vertical distance from trigger line to box bottom, positive below."""
+        x1, y1, _x2, _y2 = self.trigger_line
+        x_center_pos = (xyxyn[2] + xyxyn[0]) / 2
+        return xyxyn[3] - (y1 + self.slope * (x_center_pos - x1))
+
+    def validate_box(self, xyxyn: list[float]) -> bool:
+        """Filter out boxes not relevant."""
+        box_with = xyxyn[2] - xyxyn[0]
+        box_heigth = xyxyn[3] - xyxyn[1]
+
+        # check if box is too small and at the edge
+        if (box_with < self.box_minimum_size) or (box_heigth < self.box_minimum_size):
+            if (xyxyn[2] > (1 - self.edge_margin)) or (
+                xyxyn[3] > (1 - self.edge_margin)
+            ):
+                return False
+
+        return not (
+            (box_with > self.box_maximum_size) or (box_heigth > self.box_maximum_size)
+        )
+
+
+class TrackingSession:
+    """Class representing parameters of a running tracking session.
+
+    The config watcher applies changes between frames by swapping in a new
+    immutable DetectionParams, so a frame always sees one consistent set and
+    the line geometry is only computed again when a value changes.
+    """
+
+    def __init__(
+        self,
+        params: DetectionParams | None = None,
+        overrides: dict[str, str] | None = None,
+    ) -> None:
+        """Initialize the session.
+
+        Overrides are config values used instead of those of the event, e.g.
+        the trigger line of one camera.
+        """
+        self.params = params or DetectionParams()
+        self.overrides = overrides or {}
+
+    async def load(self, token: str, event_id: str) -> DetectionParams:
+        """Load all parameters from config, creating defaults if missing."""
+        configs = {}
+        for key in PARAMETER_KEYS.values():
+            configs[key] = await ConfigAdapter().get_config(token, event_id, key)
+        configs.update(self.overrides)
+        self.params = get_detection_params(configs, DetectionParams())
+        return self.params
+
+    def apply_configs(self, configs: dict[str, str]) -> bool:
+        """Apply changed config values, return True if parameters changed.
+
+        Invalid values are logged and the current parameters are kept.
+        """
+        try:
+            params = get_detection_params({**configs, **self.overrides}, self.params)
+        except ValueError:
+            logging.exception("Invalid detection parameters - keeping current.")
+            return False
+        if params == self.params:
+            return False
+        self.params = params
+        logging.info(f"Detection parameters updated: {params}")
+        return True
+
+
+def get_detection_params(
+    configs: dict[str, str], current: DetectionParams
+) -> DetectionParams:
+    """Create detection parameters from config values, current for missing keys."""
+    values = {}
+    for name, key in PARAMETER_KEYS.items():
+        if key not in configs:
+            values[name] = getattr(current, name)
+        elif name == "trigger_line":
+            values[name] = parse_trigger_line(configs[key])
+        else:
+            values[name] = float(configs[key])
+    return DetectionParams(**values)
+
+
+def get_crossing_time(
+    previous: tuple[float, float] | None, frame_time: float, line_offset: float
+) -> float:
+    """Interpolate when the box bottom crossed the trigger line.
+
+    Args:
+        previous: (frame_time, line_offset) of the track in its last frame, if any.
+        frame_time: Capture time of the first frame below the line.
+        line_offset: Distance below the line in this frame.
+
+    Returns:
+        Crossing time, linear between the two frames - frame_time if the track
+        has no earlier frame above the line.
+
+    """
+    if previous is None:
+        return frame_time
+    previous_time, previous_offset = previous
+    if previous_offset > 0 or line_offset <= previous_offset:
+        return frame_time
+    share = -previous_offset / (line_offset - previous_offset)
+    return previous_time + (frame_time - previous_time) * share
+
+
+def parse_trigger_line(value: str) -> tuple[float, float, float, float]:
+    """Parse TRIGGER_LINE_XYXYN, 4 numbers colon-separated."""
+    try:
+        coordinates = tuple(float(i) for i in value.split(":"))
+    except ValueError as e:
+        informasjon = f"Error reading TRIGGER_LINE_XYXYN: {e}"
+        raise ValueError(informasjon) from e
+    if len(coordinates) != COUNT_COORDINATES:
+        informasjon = "TRIGGER_LINE_XYXYN must have 4 numbers, colon-separated."
+        raise ValueError(informasjon)
+    return coordinates  # type: ignore[return-value]
@@ -1,9 +1,17 @@
 """Module for video services."""
 
+import asyncio
 import datetime
+import functools
 import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 
 import cv2
+import numpy as np
 from torch import Tensor
 from ultralytics import YOLO
 from ultralytics.engine.results import Results
@@ -11,35 +19,316 @@ from ultralytics.engine.results import Results
 from vision_ai_service.adapters import (
     ConfigAdapter,
     StatusAdapter,
+    TokenManager,
     VideoStreamNotFoundError,
     VisionAIService,
 )
+from vision_ai_service.adapters.photo_encoding import PhotoSettings, load_photo_settings
+from vision_ai_service.adapters.photo_upload_adapter import PhotoUploader
+from vision_ai_service.services.batch_detector import BatchDetector
+from vision_ai_service.services.best_frame import BestFrameSelector
+from vision_ai_service.services.camera_leases import Camera
+from vision_ai_service.services.crossing_journal import CrossingJournal
+from vision_ai_service.services.detection_log import DetectionRecorder
+from vision_ai_service.services.frame_reader import FrameReader
+from vision_ai_service.services.profiler import Profiler
+from vision_ai_service.services.reid_cache import ReIdCache, get_signature
+from vision_ai_service.services.tiled_detector import TiledDetector
+from vision_ai_service.services.trackers import (
+    Tracker,
+    get_tracked_result,
+    get_tracker,
+    track_frame,
+)
+from vision_ai_service.services.tracking_session import (
+    DetectionParams,
+    TrackingSession,
+    get_crossing_time,
+    parse_trigger_line,
+)
 
-DETECTION_BOX_MINIMUM_SIZE = 0.08
-DETECTION_BOX_MAXIMUM_SIZE = 0.9
-EDGE_MARGIN = 0.02
-MIN_CONFIDENCE = 0.6
 DETECTION_CLASSES = [0]  # person
+MAX_TRACK_HISTORY = 1000
+TRACK_HISTORY_SECONDS = 10
+MODEL_NAME = "yolov8n.pt"
+WARM_UP_IMAGE_SIZE = (480, 640)
+WARM_UP_TIMED_INFERENCES = 3
+# model loaded at warm-up, taken by the first session
+warm_models: list[YOLO] = []
+
+
+def load_model() -> YOLO:
+    """Load an official or custom model, the warmed up model if not taken.
+
+    A model is not shared by sessions running at the same time, model.track
+    keeps the tracks of the session in the model.
+    """
+    try:
+        return warm_models.pop()
+    except IndexError:
+        return YOLO(MODEL_NAME)
+
+
+def warm_up_model() -> float:
+    """Load model weights and run dummy inferences, return seconds per inference.
+
+    Downloads the weights if missing and initializes the inference backend.
+    The model is kept, so the first analytics session starts without delay.
+    The inferences after the first are timed, to measure the capacity of the
+    machine. Blocking - run in a worker thread.
+    """
+    model = load_model()
+    im = np.zeros((*WARM_UP_IMAGE_SIZE, 3), dtype=np.uint8)
+    model.predict(im, classes=DETECTION_CLASSES, verbose=False)
+    start_time = time.perf_counter()
+    for _ in range(WARM_UP_TIMED_INFERENCES):
+        model.predict(im, classes=DETECTION_CLASSES, verbose=False)
+    seconds = (time.perf_counter() - start_time) / WARM_UP_TIMED_INFERENCES
+    warm_models.append(model)
+    return seconds
+
+
+@dataclass(eq=False)
+class FrameSource:
+    """Class detecting and tracking the frames of a session.
+
+    Frames are detected by the tiled detector, by the batch detector shared
+    with other cameras or by the model, and tracked by our tracker - by
+    model.track if no tracker is given.
+    """
+
+    model: YOLO
+    image_size: tuple[int, int]
+    show_video: bool = False
+    tracker: Tracker | None = None
+    detector: TiledDetector | None = None
+    batch_detector: BatchDetector | None = None
+
+    def start(self) -> None:
+        """Add the session to the batch detector, if any."""
+        if self.batch_detector:
+            self.batch_detector.add_camera()
+
+    def stop(self) -> None:
+        """Remove the session from the batch detector, close the video window."""
+        if self.batch_detector:
+            self.batch_detector.remove_camera()
+        if self.show_video:
+            cv2.destroyAllWindows()
 
+    def track(self, im: np.ndarray, params: DetectionParams) -> Results:
+        """Detect and track one frame - blocking."""
+        if self.detector:
+            return self.detector.track(
+                im, params.trigger_line, params.min_confidence, DETECTION_CLASSES
+            )
+        if self.batch_detector:
+            if self.tracker is None:
+                # ultralytics is replaced by bytetrack in batch mode
+                informasjon = "Batch inference needs a tracker per session."
+                raise ValueError(informasjon)
+            detections = self.batch_detector.detect(
+                im, params.min_confidence, DETECTION_CLASSES, self.image_size
+            )
+            return get_tracked_result(self.model, self.tracker, im, detections)
+        if self.tracker:
+            return track_frame(
+                self.model,
+                self.tracker,
+                im,
+                params.min_confidence,
+                DETECTION_CLASSES,
+                self.image_size,
+            )
+        return self.model.track(
+            im,
+            show=self.show_video,
+            conf=params.min_confidence,
+            classes=DETECTION_CLASSES,
+            imgsz=self.image_size,
+            persist=True,
+            verbose=False,
+        )[0]
+
+
+async def load_frame_source(
+    token: str,
+    event_id: str,
+    model: YOLO,
+    batch_detector: BatchDetector | None = None,
+) -> FrameSource:
+    """Load detection and tracking settings of an event."""
+    # ultralytics - model.track, else detect and track with our tracker
+    tracker_name = await ConfigAdapter().get_config(token, event_id, "TRACKER")
+    if batch_detector and tracker_name == "ultralytics":
+        # model.track keeps the tracks in the model, which is shared
+        tracker_name = "bytetrack"
+    tracker = None
+    if tracker_name != "ultralytics":
+        tracker = get_tracker(
+            tracker_name,
+            max_age=await ConfigAdapter().get_config_int(
+                token, event_id, "TRACKER_MAX_AGE"
+            ),
+        )
+    detector = None
+    detection_mode = await ConfigAdapter().get_config(token, event_id, "DETECTION_MODE")
+    if batch_detector and detection_mode == "tiled":
+        logging.warning("Tiled detection is not batched, full frames are used.")
+    elif detection_mode == "tiled":
+        detector = TiledDetector(
+            model,
+            await ConfigAdapter().get_config_int(token, event_id, "TILE_SIZE"),
+            float(await ConfigAdapter().get_config(token, event_id, "TILE_OVERLAP")),
+            tracker,
+        )
+    return FrameSource(
+        model,
+        # the desired image size as a tuple (width, height)
+        await ConfigAdapter().get_config_img_res_tuple(
+            token, event_id, "VIDEO_ANALYTICS_IMAGE_SIZE"
+        ),
+        await ConfigAdapter().get_config_bool(token, event_id, "SHOW_VIDEO"),
+        tracker,
+        detector,
+        batch_detector,
+    )
+
+
+async def load_crossing_selectors(
+    token: str, event_id: str
+) -> tuple[ReIdCache | None, BestFrameSelector | None]:
+    """Load re-identification cache and best frame selector, if enabled."""
+    reid_cache = None
+    if await ConfigAdapter().get_config_bool(token, event_id, "REID_CACHE"):
+        reid_cache = ReIdCache()
+    best_frame = None
+    best_frame_window = await ConfigAdapter().get_config_int(
+        token, event_id, "BEST_FRAME_WINDOW"
+    )
+    if best_frame_window > 0:
+        best_frame = BestFrameSelector(best_frame_window)
+    return reid_cache, best_frame
+
+
+async def load_photo_uploader(
+    token_manager: TokenManager, event_id: str, spool_path: str
+) -> PhotoUploader | None:
+    """Create photo uploader if PHOTO_DELIVERY is upload, else None."""
+    photo_delivery = await token_manager.call(
+        ConfigAdapter().get_config, event_id, "PHOTO_DELIVERY"
+    )
+    if photo_delivery != "upload":
+        return None
+    return PhotoUploader(
+        token_manager,
+        event_id,
+        spool_path,
+        await token_manager.call(
+            ConfigAdapter().get_config_int, event_id, "PHOTO_UPLOAD_CONCURRENCY"
+        ),
+    )
+
+
+async def load_detection_recorder(
+    token: str, event_id: str, log_path: str
+) -> DetectionRecorder | None:
+    """Create detection recorder if DETECTION_LOG is set, else None."""
+    if not await ConfigAdapter().get_config_bool(token, event_id, "DETECTION_LOG"):
+        return None
+    time_text = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d_%H%M%S")
+    log_path = f"{log_path}_{time_text}"
+    try:
+        return DetectionRecorder(log_path)
+    except FileExistsError:
+        logging.exception(f"Detection log {log_path} exists, not recorded.")
+    return None
+
+
+def open_journal(photos_file_path: str, camera_location: str) -> CrossingJournal:
+    """Open journal of a new session - blocking.
+
+    Saved crossings are journaled, and recent ones read back after a restart.
+    """
+    session_id = datetime.datetime.now(datetime.UTC).strftime("%Y%m%d_%H%M%S")
+    return CrossingJournal(
+        f"{photos_file_path}/crossings.db", camera_location, session_id
+    )
+
+
+async def update_session_flag(
+    token_manager: TokenManager,
+    event: dict,
+    camera: Camera | None,
+    key: str,
+    value: str,
+) -> None:
+    """Update analytics flag, the flags of leased cameras are set by the app."""
+    if camera is None:
+        await token_manager.call(ConfigAdapter().update_config, event["id"], key, value)
+
+
+async def is_stopped(
+    token_manager: TokenManager,
+    event: dict,
+    status_type: str,
+    stop_event: asyncio.Event | None = None,
+) -> bool:
+    """Return True on stop command, VIDEO_ANALYTICS_STOP if no stop event."""
+    if stop_event is None:
+        return await token_manager.call(
+            VisionAIService().check_stop_tracking, event, status_type
+        )
+    if stop_event.is_set():
+        await token_manager.call(
+            StatusAdapter().create_status,
+            event,
+            status_type,
+            "Video analytics stopped.",
+        )
+        return True
+    return False
 
 
 class VideoAIService:
     """Class representing video analytics with high definition photos."""
 
+    def __init__(self) -> None:
+        """Initialize the service."""
+        # latest decoded frame of the running tracking sessions, by camera
+        self.latest_frames: dict[str, np.ndarray] = {}
+        # leased cameras with a running tracking session, by location
+        self.cameras: dict[str, Camera] = {}
+
     async def detect_crossings_with_ultraltyics(
         self,
-        token: str,
+        token_manager: TokenManager,
         event: dict,
         status_type: str,
         photos_file_path: str,
+        stop_event: asyncio.Event | None = None,
+        session: TrackingSession | None = None,
+        profiler: Profiler | None = None,
+        camera: Camera | None = None,
+        batch_detector: BatchDetector | None = None,
     ) -> str:
         """Analyze video and capture screenshots of line crossings.
 
         Args:
-            token: To update databes
+            token_manager: Login token for the services, refreshed during
+                the session.
             event: Event details
             status_type: To update status messages
             photos_file_path: The path to the directory where the photos will be saved.
+            stop_event: Stop command, checked between frames. If not given the
+                VIDEO_ANALYTICS_STOP config is checked on every frame.
+            session: Detection parameters, may be updated between frames by
+                the config watcher. Loaded from config at start.
+            profiler: On-demand profiling, started and stopped between frames.
+            camera: Camera leased by this instance. If not given the
+                CAMERA_LOCATION and VIDEO_URL configs are used.
+            batch_detector: Model shared with the sessions of other cameras,
+                frames are detected in batches and tracked by this session.
 
         Returns:
             A string indicating the status of the video analytics.
@@ -49,241 +338,608 @@ class VideoAIService:
 
         """
         crossings = {"100": [], "90": {}, "80": {}}
-        first_detection = True
-        informasjon = ""
-        camera_location = await ConfigAdapter().get_config(
-            token, event["id"], "CAMERA_LOCATION"
+        camera_location, video_stream_url = await self.open_camera(
+            token_manager, event, camera
         )
-        show_video = await ConfigAdapter().get_config_bool(token, event["id"], "SHOW_VIDEO")
-        video_stream_url = await ConfigAdapter().get_config(token, event["id"], "VIDEO_URL")
-        await StatusAdapter().create_status(
-            token,
+        await token_manager.call(
+            StatusAdapter().create_status,
             event,
             status_type,
             f"Starter AI analyse av <a href={video_stream_url}>video</a>.",
         )
-        await ConfigAdapter().update_config(
-            token, event["id"], "VIDEO_ANALYTICS_START", "False"
+        await update_session_flag(
+            token_manager, event, camera, "VIDEO_ANALYTICS_START", "False"
         )
 
-        # Load an official or custom model
-        model = YOLO("yolov8n.pt")  # Load an official Detect model
+        model = batch_detector.model if batch_detector else load_model()
+        frame_source = await token_manager.call(
+            load_frame_source, event["id"], model, batch_detector
+        )
+        session = session or TrackingSession()
+        await token_manager.call(session.load, event["id"])
+        photo_settings = await token_manager.call(load_photo_settings, event["id"])
+        reid_cache, best_frame = await token_manager.call(
+            load_crossing_selectors, event["id"]
+        )
+        # one spool per camera, drained by its own session
+        uploader = await load_photo_uploader(
+            token_manager, event["id"], f"{photos_file_path}/spool/{camera_location}"
+        )
+        recorder = await token_manager.call(
+            load_detection_recorder,
+            event["id"],
+            f"{photos_file_path}/detections/{camera_location}",
+        )
 
-        # Define the desired image size as a tuple (width, height)
-        image_size = await ConfigAdapter().get_config_img_res_tuple(
-            token, event["id"], "VIDEO_ANALYTICS_IMAGE_SIZE"
+        # frames are read with their capture timestamps
+        frame_reader = await asyncio.to_thread(FrameReader, video_stream_url)
+
+        journal = await asyncio.to_thread(
+            open_journal, photos_file_path, camera_location
         )
-        trigger_line = (
-            await VisionAIService().get_trigger_line_xyxy_list(
-                token, event
-            )
+        if uploader:
+            await uploader.start()
+        await update_session_flag(
+            token_manager, event, camera, "VIDEO_ANALYTICS_RUNNING", "True"
         )
 
-        # Perform tracking with the model
+        # frames are decoded, tracked and processed in a dedicated worker
+        # thread - the event loop stays free for other jobs meanwhile
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analytics")
+        frames = enumerate(frame_reader)
+        track_history: dict[int, tuple[float, float]] = {}
+        save_args = (
+            crossings,
+            camera_location,
+            photos_file_path,
+            journal,
+            photo_settings,
+            uploader,
+        )
+
+        def next_result() -> Results | None:
+            """Track next frame and process its boxes."""
+            if profiler:
+                profiler.on_frame()
+            frame = next(frames, None)
+            if frame is None:
+                return None
+            frame_index, (im, frame_time) = frame
+            # parameters may be changed by the config watcher between frames
+            params = session.params
+            result = frame_source.track(im, params)
+            self.latest_frames[camera_location] = result.orig_img
+            if recorder:
+                recorder.add(frame_index, frame_time, result.boxes)
+            self.process_boxes(
+                result,
+                params,
+                crossings,
+                camera_location,
+                photos_file_path,
+                frame_time,
+                track_history,
+                journal,
+                photo_settings,
+                uploader,
+                reid_cache,
+                best_frame,
+            )
+            return result
+
+        frame_source.start()
         try:
-            results = model.track(
-                source=video_stream_url,
-                show=show_video,
-                conf=MIN_CONFIDENCE,
-                classes=DETECTION_CLASSES,
-                stream=True,
-                imgsz=image_size,
-                persist=True
+            informasjon = await self.run_frames(
+                token_manager,
+                event,
+                status_type,
+                photos_file_path,
+                executor,
+                next_result,
+                stop_event,
+                camera,
             )
-        except Exception as e:
-            informasjon = f"Error opening video stream from: {video_stream_url}"
-            logging.exception(informasjon)
-            raise VideoStreamNotFoundError(informasjon) from e
+        finally:
+            # closed in the worker thread, after the frame it may be processing
+            executor.submit(
+                self.close_outputs, frame_reader, recorder, best_frame, save_args
+            )
+            executor.shutdown(wait=False)
+            frame_source.stop()
+            self.latest_frames.pop(camera_location, None)
+            if camera:
+                self.cameras.pop(camera.location, None)
+            if uploader:
+                # photos saved after this are spooled for the next session
+                await uploader.close()
+            await update_session_flag(
+                token_manager, event, camera, "VIDEO_ANALYTICS_RUNNING", "false"
+            )
+            await token_manager.call(
+                StatusAdapter().create_status,
+                event,
+                status_type,
+                "Avsluttet AI video analyse.",
+            )
+        return f"Analytics completed {informasjon}."
 
-        await ConfigAdapter().update_config(
-            token, event["id"], "VIDEO_ANALYTICS_RUNNING", "True"
+    async def open_camera(
+        self, token_manager: TokenManager, event: dict, camera: Camera | None
+    ) -> tuple[str, str]:
+        """Return location and video stream url, registering a leased camera."""
+        if camera:
+            self.cameras[camera.location] = camera
+            return camera.location, camera.url
+        camera_location = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "CAMERA_LOCATION"
         )
-        for result in results:
+        video_stream_url = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "VIDEO_URL"
+        )
+        return camera_location, video_stream_url
 
+    async def run_frames(
+        self,
+        token_manager: TokenManager,
+        event: dict,
+        status_type: str,
+        photos_file_path: str,
+        executor: ThreadPoolExecutor,
+        next_result: Callable[[], Results | None],
+        stop_event: asyncio.Event | None = None,
+        camera: Camera | None = None,
+    ) -> str:
+        """Process frames in the worker until the end of the video or stop."""
+        loop = asyncio.get_running_loop()
+        first_detection = True
+        while await loop.run_in_executor(executor, next_result) is not None:
             if first_detection:
                 first_detection = False
                 await self.print_image_with_trigger_line_v2(
-                    token, event, status_type, photos_file_path
+                    token_manager, event, status_type, photos_file_path, camera
                 )
+            if await is_stopped(token_manager, event, status_type, stop_event):
+                return "Tracking terminated on stop command."
+        return ""
 
-            self.process_boxes(result, trigger_line, crossings, camera_location, photos_file_path)
-
-            check_stop_tracking = await VisionAIService().check_stop_tracking(
-                token, event, status_type
-            )
-            if check_stop_tracking:
-                informasjon = "Tracking terminated on stop command."
-                break
-
-        await ConfigAdapter().update_config(
-            token, event["id"], "VIDEO_ANALYTICS_RUNNING", "false"
-        )
-        await StatusAdapter().create_status(
-            token, event, status_type, "Avsluttet AI video analyse."
-        )
-
-        if show_video:
-            cv2.destroyAllWindows()
-        return f"Analytics completed {informasjon}."
+    def close_outputs(
+        self,
+        frame_reader: FrameReader,
+        recorder: DetectionRecorder | None,
+        best_frame: BestFrameSelector | None,
+        save_args: tuple,
+    ) -> None:
+        """Release the video stream and close the outputs - blocking."""
+        frame_reader.release()
+        if recorder:
+            recorder.close()
+        if best_frame:
+            # crossings waiting for the frames after them on stop
+            self.save_best_frames(best_frame, *save_args, flush=True)
+        journal = save_args[3]
+        journal.close()
+
+    def process_boxes(
+        self,
+        result: Results,
+        params: DetectionParams,
+        crossings: dict,
+        camera_location: str,
+        photos_file_path: str,
+        frame_time: float | None = None,
+        track_history: dict[int, tuple[float, float]] | None = None,
+        journal: CrossingJournal | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: PhotoUploader | None = None,
+        reid_cache: ReIdCache | None = None,
+        best_frame: BestFrameSelector | None = None,
+    ) -> None:
+        """Process result from video analytics.
 
-    def process_boxes(self, result: Results, trigger_line: list, crossings: dict, camera_location: str, photos_file_path: str) -> None:
-        """Process result from video analytics."""
-        boxes = result.boxes
-        if boxes:
-            class_values = boxes.cls
+        Args:
+            result: Tracking result of one frame.
+            params: Detection parameters.
+            crossings: Tracks seen at 80, 90 and 100 percent of the line.
+            camera_location: Name of the camera location.
+            photos_file_path: The path to the directory where the photos will be saved.
+            frame_time: Capture time of the frame (epoch seconds), now if not given.
+            track_history: Last (frame_time, line offset) per track id, used to
+                interpolate the crossing time between frames. Updated in place.
+            journal: Durable record of saved crossings, also used to skip
+                skiers saved before a restart.
+            photo_settings: Format, quality and size of saved photos.
+            uploader: Sends photos to photo-service, written to file if not given.
+            reid_cache: Appearance of recent crossings, used to merge a skier
+                given a new track id below the line with the first id.
+            best_frame: Recent frames - crossings are saved from the sharpest,
+                least occluded frame around the crossing, a few frames late.
 
-            for y in range(len(class_values)):
+        """
+        frame_time = frame_time or time.time()
+        if best_frame:
+            best_frame.add_frame(result.orig_img, get_person_boxes(result))
+        if result.boxes:
+            for y in range(len(result.boxes.cls)):
                 try:
-
-                    d_id = int(boxes.id[y].item())  # type: ignore[attr-defined]
-                    # identify person - class value 0
-                    if (class_values[y] == 0) and (boxes.conf[y].item() > MIN_CONFIDENCE):
-                        xyxyn = boxes.xyxyn[y]
-                        crossed_line = self.is_below_line(
-                            xyxyn, trigger_line
-                        )
-                        # ignore small boxes
-                        box_validation = self.validate_box(xyxyn)
-                        if (crossed_line != "false") and box_validation:
-                            # Extract screenshot image from the results
-                            xyxy = boxes.xyxy[y]
-                            if crossed_line != "100":
-                                if d_id not in crossings[crossed_line]:
-                                    crossings[crossed_line][d_id] = (
-                                        VisionAIService().get_crop_image(result.orig_img, xyxy)
-                                    )
-                            elif d_id not in crossings[crossed_line]:
-                                crossings[crossed_line].append(d_id)
-                                VisionAIService().save_image(
-                                    result,
-                                    camera_location,
-                                    photos_file_path,
-                                    d_id,
-                                    crossings,
-                                    xyxy,
-                                )
-
+                    self.process_box(
+                        result,
+                        y,
+                        params,
+                        crossings,
+                        camera_location,
+                        photos_file_path,
+                        frame_time,
+                        track_history,
+                        journal,
+                        photo_settings,
+                        uploader,
+                        reid_cache,
+                        best_frame,
+                    )
                 except TypeError as e:
                     logging.debug(f"TypeError: {e}")
                     # ignore
+        if track_history is not None and len(track_history) > MAX_TRACK_HISTORY:
+            for d_id, (seen_time, _offset) in list(track_history.items()):
+                if seen_time < frame_time - TRACK_HISTORY_SECONDS:
+                    del track_history[d_id]
+        if best_frame:
+            self.save_best_frames(
+                best_frame,
+                crossings,
+                camera_location,
+                photos_file_path,
+                journal,
+                photo_settings,
+                uploader,
+            )
 
+    def process_box(
+        self,
+        result: Results,
+        y: int,
+        params: DetectionParams,
+        crossings: dict,
+        camera_location: str,
+        photos_file_path: str,
+        frame_time: float,
+        track_history: dict[int, tuple[float, float]] | None = None,
+        journal: CrossingJournal | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: PhotoUploader | None = None,
+        reid_cache: ReIdCache | None = None,
+        best_frame: BestFrameSelector | None = None,
+    ) -> None:
+        """Process box y of a result, emit a crossing at 100 percent of the line."""
+        boxes = result.boxes
+        d_id = int(boxes.id[y].item())  # type: ignore[attr-defined]
+        # identify person - class value 0
+        if not (boxes.cls[y] == 0 and boxes.conf[y].item() > params.min_confidence):
+            return
+        xyxyn = boxes.xyxyn[y].tolist()
+        line_offset = params.get_line_offset(xyxyn)
+        crossed_line = params.is_below_line(xyxyn)
+        # ignore small boxes
+        box_validation = params.validate_box(xyxyn)
+        if (crossed_line != "false") and box_validation:
+            # Extract screenshot image from the results
+            xyxy = boxes.xyxy[y]
+            if crossed_line != "100":
+                if d_id not in crossings[crossed_line]:
+                    crossings[crossed_line][d_id] = VisionAIService().get_crop_image(
+                        result.orig_img, xyxy
+                    )
+            elif d_id not in crossings[crossed_line]:
+                crossings[crossed_line].append(d_id)
+                self.emit_crossing(
+                    result.orig_img,
+                    xyxy,
+                    d_id,
+                    frame_time,
+                    line_offset,
+                    (xyxyn[0] + xyxyn[2]) / 2,
+                    track_history.get(d_id) if track_history else None,
+                    crossings,
+                    camera_location,
+                    photos_file_path,
+                    journal,
+                    photo_settings,
+                    uploader,
+                    reid_cache,
+                    best_frame,
+                )
+        if track_history is not None:
+            track_history[d_id] = (frame_time, line_offset)
 
-    def validate_box(self, xyxyn: Tensor) -> bool:
-        """Filter out boxes not relevant."""
-        box_validation = True
-        box_with = xyxyn.tolist()[2] - xyxyn.tolist()[0]
-        box_heigth = xyxyn.tolist()[3] - xyxyn.tolist()[1]
+    def emit_crossing(
+        self,
+        im: np.ndarray,
+        xyxy: Tensor,
+        d_id: int,
+        frame_time: float,
+        line_offset: float,
+        x_center: float,
+        previous: tuple[float, float] | None,
+        crossings: dict,
+        camera_location: str,
+        photos_file_path: str,
+        journal: CrossingJournal | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: PhotoUploader | None = None,
+        reid_cache: ReIdCache | None = None,
+        best_frame: BestFrameSelector | None = None,
+    ) -> None:
+        """Save a line crossing, unless saved before a restart or merged.
+
+        The crossing time is interpolated from the previous (frame_time, line
+        offset) of the track.
+        """
+        crossing_time = get_crossing_time(previous, frame_time, line_offset)
+        # a track first seen below the line may be a skier saved by the
+        # session before a restart, or a skier given a new id after occlusion
+        first_seen_below = previous is None or previous[1] > 0
+        if (
+            journal
+            and first_seen_below
+            and journal.is_duplicate(crossing_time, x_center)
+        ):
+            logging.info(f"Line crossing ID:{d_id} saved before restart.")
+            return
+        if reid_cache:
+            crop = VisionAIService().get_crop_image(im, xyxy)
+            signature = get_signature(crop)
+            original_id = (
+                reid_cache.match(d_id, signature, crossing_time, x_center)
+                if first_seen_below
+                else None
+            )
+            if original_id is not None:
+                # kept, so a wrong merge can be recovered
+                file_name = self.save_merged_crop(
+                    crop,
+                    d_id,
+                    original_id,
+                    crossing_time,
+                    camera_location,
+                    photos_file_path,
+                )
+                logging.info(
+                    f"Line crossing ID:{d_id} merged with "
+                    f"ID:{original_id}, crop: {file_name}"
+                )
+                crossings["80"].pop(d_id, None)
+                crossings["90"].pop(d_id, None)
+                return
+            reid_cache.add(d_id, signature, crossing_time, x_center)
+        if best_frame:
+            best_frame.add_crossing(
+                d_id, crossing_time, x_center, im, np.array(xyxy.tolist())
+            )
+        else:
+            self.save_crossing(
+                im,
+                xyxy,
+                d_id,
+                crossing_time,
+                x_center,
+                crossings,
+                camera_location,
+                photos_file_path,
+                journal,
+                photo_settings,
+                uploader,
+            )
 
-        # check if box is too small and at the edge
-        if (box_with < DETECTION_BOX_MINIMUM_SIZE) or (box_heigth < DETECTION_BOX_MINIMUM_SIZE):
-            if (xyxyn.tolist()[2] > (1 - EDGE_MARGIN)) or (xyxyn.tolist()[3] > (1 - EDGE_MARGIN)):
-                return False
+    def save_crossing(
+        self,
+        im: np.ndarray,
+        xyxy: Tensor | np.ndarray,
+        d_id: int,
+        crossing_time: float,
+        x_center: float,
+        crossings: dict,
+        camera_location: str,
+        photos_file_path: str,
+        journal: CrossingJournal | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: PhotoUploader | None = None,
+    ) -> None:
+        """Save photos of a crossing and add it to the journal."""
+        file_name = VisionAIService().save_image(
+            im,
+            camera_location,
+            photos_file_path,
+            d_id,
+            crossings,
+            xyxy,
+            crossing_time,
+            photo_settings,
+            uploader,
+        )
+        if journal:
+            journal.append(d_id, crossing_time, x_center, file_name)
 
-        if (box_with > DETECTION_BOX_MAXIMUM_SIZE) or (box_heigth > DETECTION_BOX_MAXIMUM_SIZE):
-            return False
+    def save_merged_crop(
+        self,
+        crop: np.ndarray,
+        d_id: int,
+        original_id: int,
+        crossing_time: float,
+        camera_location: str,
+        photos_file_path: str,
+    ) -> str:
+        """Save crop of a crossing merged with an earlier id, return file name."""
+        current_time = datetime.datetime.fromtimestamp(crossing_time, datetime.UTC)
+        timestamp = current_time.strftime("%Y%m%d_%H%M%S")
+        merged_path = Path(photos_file_path) / "merged"
+        merged_path.mkdir(exist_ok=True)
+        file_name = f"{merged_path}/{camera_location}_{timestamp}_{d_id}_merged_{original_id}.jpg"
+        cv2.imwrite(file_name, crop)
+        return file_name
+
+    def save_best_frames(
+        self,
+        best_frame: BestFrameSelector,
+        crossings: dict,
+        camera_location: str,
+        photos_file_path: str,
+        journal: CrossingJournal | None = None,
+        photo_settings: PhotoSettings | None = None,
+        uploader: PhotoUploader | None = None,
+        *,
+        flush: bool = False,
+    ) -> None:
+        """Save crossings whose frames after the crossing have been seen."""
+        for crossing, im, xyxy in best_frame.pop_ready(flush=flush):
+            self.save_crossing(
+                im,
+                xyxy,
+                crossing.d_id,
+                crossing.crossing_time,
+                crossing.x_center,
+                crossings,
+                camera_location,
+                photos_file_path,
+                journal,
+                photo_settings,
+                uploader,
+            )
 
-        return box_validation
+    def validate_box(self, xyxyn: Tensor, params: DetectionParams) -> bool:
+        """Filter out boxes not relevant."""
+        return params.validate_box(xyxyn.tolist())
 
-    def is_below_line(self, xyxyn: Tensor, trigger_line: list) -> str:
+    def is_below_line(self, xyxyn: Tensor, params: DetectionParams) -> str:
         """Check if a point is below a trigger line."""
-        x_center_pos = (xyxyn.tolist()[2] + xyxyn.tolist()[0]) / 2
-        y_lower_pos = xyxyn.tolist()[3]
-        x1 = trigger_line[0]
-        y1 = trigger_line[1]
-        x2 = trigger_line[2]
-        y2 = trigger_line[3]
-        # check if more than half of the box is outside line x values
-        if (x_center_pos < x1) or (x_center_pos > x2):
-            return "false"
-        # get line derivated
-        a = (y2 - y1) / (x2 - x1)
-        # get line y value at point x and check if point y is below
-        y = a * (x_center_pos - x1) + y1
-        y_80 = a * (x_center_pos - x1) + (y1 * 0.8)
-        y_90 = a * (x_center_pos - x1) + (y1 * 0.9)
-        if y_lower_pos > y:
-            return "100"
-        if y_lower_pos > y_90:
-            return "90"
-        if y_lower_pos > y_80:
-            return "80"
-        return "false"
+        return params.is_below_line(xyxyn.tolist())
 
     async def print_image_with_trigger_line_v2(
         self,
-        token: str,
+        token_manager: TokenManager,
         event: dict,
         status_type: str,
         photos_file_path: str,
+        camera: Camera | None = None,
     ) -> None:
-        """Print an image with a trigger line."""
-        trigger_line_xyxyn = await VisionAIService().get_trigger_line_xyxy_list(
-            token, event
+        """Print an image with a trigger line.
+
+        Uses the latest frame of the running tracking session of the camera,
+        the video stream is only opened when no session is running. A leased
+        camera may have its own trigger line, if not given the CAMERA_LOCATION,
+        VIDEO_URL and TRIGGER_LINE_XYXYN configs are used.
+        """
+        if camera and camera.trigger_line:
+            trigger_line_xyxyn = list(parse_trigger_line(camera.trigger_line))
+        else:
+            trigger_line_xyxyn = await token_manager.call(
+                VisionAIService().get_trigger_line_xyxy_list, event
+            )
+        if camera:
+            camera_location = camera.location
+        else:
+            camera_location = await token_manager.call(
+                ConfigAdapter().get_config, event["id"], "CAMERA_LOCATION"
+            )
+        im = self.latest_frames.get(camera_location)
+        if im is None:
+            video_stream_url = (
+                camera.url
+                if camera
+                else await token_manager.call(
+                    ConfigAdapter().get_config, event["id"], "VIDEO_URL"
+                )
+            )
+            im = await asyncio.to_thread(read_single_frame, video_stream_url)
+
+        # get the current time with timezone
+        current_time = datetime.datetime.now(datetime.UTC)
+        time_text = current_time.strftime("%Y%m%d_%H%M%S")
+
+        # save image to file
+        trigger_line_config_file = await token_manager.call(
+            ConfigAdapter().get_config, event["id"], "TRIGGER_LINE_CONFIG_FILE"
         )
-        video_stream_url = await ConfigAdapter().get_config(token, event["id"], "VIDEO_URL")
+        file_name = f"{photos_file_path}/{time_text}_{camera_location}_{trigger_line_config_file}"
+        image_time_text = f"Line coordinates: {trigger_line_xyxyn}. Time: {time_text}"
+        im_line = draw_trigger_line(im, trigger_line_xyxyn, image_time_text)
+        await asyncio.to_thread(cv2.imwrite, file_name, im_line)
+        informasjon = f"Trigger line <a title={file_name}>photo</a> created."
+        await token_manager.call(
+            StatusAdapter().create_status, event, status_type, informasjon
+        )
+
 
-        cap = cv2.VideoCapture(video_stream_url)
+def read_single_frame(video_stream_url: str) -> np.ndarray:
+    """Open video stream and read one frame - blocking."""
+    cap = cv2.VideoCapture(video_stream_url)
+    try:
         # check if video stream is opened
         if not cap.isOpened():
             informasjon = f"Error opening video stream from: {video_stream_url}"
             logging.error(informasjon)
             raise VideoStreamNotFoundError(informasjon) from None
-        try:
-            # Show the results
-            ret_save, im = cap.read()
-            # Convert the frame to RBG
-            im_rgb = cv2.cvtColor(im, cv2.COLOR_BGR2RGB)
-
-            # Draw the trigger line
-            x1, y1, x2, y2 = map(float, trigger_line_xyxyn)  # Ensure integer coordinates
-            cv2.line(
-                im_rgb,
-                (int(x1 * im.shape[1]), int(y1 * im.shape[0])),
-                (int(x2 * im.shape[1]), int(y2 * im.shape[0])),
-                (255, 0, 0),  # Color (BGR)
-                5
-            )  # Thickness
-
-            # Draw the grid lines
-            for x in range(10, 100, 10):
-                cv2.line(
-                    im_rgb,
-                    (int(x * im.shape[1] / 100), 0),
-                    (int(x * im.shape[1] / 100), im.shape[0]),
-                    (255, 255, 255),
-                    1
-                )
-            for y in range(10, 100, 10):
-                cv2.line(
-                    im_rgb,
-                    (0, int(y * im.shape[0] / 100)),
-                    (im.shape[1], int(y * im.shape[0] / 100)),
-                    (255, 255, 255),
-                    1
-                )
-
-            # Add text (using OpenCV)
-            font_face = 1
-            font_scale = 1
-            font_color = (255, 0, 0)  # red
-
-            # get the current time with timezone
-            current_time = datetime.datetime.now(datetime.UTC)
-            time_text = current_time.strftime("%Y%m%d_%H%M%S")
-            image_time_text = (
-                f"Line coordinates: {trigger_line_xyxyn}. Time: {time_text}"
-            )
-            cv2.putText(im_rgb, image_time_text, (50, 50), font_face, font_scale, font_color, 2, cv2.LINE_AA)
-
-            # save image to file
-            trigger_line_config_file = await ConfigAdapter().get_config(
-                token, event["id"], "TRIGGER_LINE_CONFIG_FILE"
-            )
-            file_name = f"{photos_file_path}/{time_text}_{trigger_line_config_file}"
-            cv2.imwrite(file_name, cv2.cvtColor(im_rgb, cv2.COLOR_RGB2BGR))  # Convert back to BGR for saving
-            informasjon = f"Trigger line <a title={file_name}>photo</a> created."
-            await StatusAdapter().create_status(token, event, status_type, informasjon)
-
-        except TypeError as e:
-            logging.debug(f"TypeError: {e}")
-            # ignore
+        ret_read, im = cap.read()
+        if not ret_read:
+            informasjon = f"Error reading frame from: {video_stream_url}"
+            logging.error(informasjon)
+            raise VideoStreamNotFoundError(informasjon) from None
+    finally:
+        cap.release()
+    return im
+
+
+def get_person_boxes(result: Results) -> dict[int, np.ndarray]:
+    """Return box (xyxy) per track id of the tracked persons in a result."""
+    boxes = result.boxes
+    if not boxes or boxes.id is None:
+        return {}
+    persons = (boxes.cls == 0).tolist()
+    return {
+        int(d_id): np.array(xyxy)
+        for d_id, xyxy, person in zip(
+            boxes.id.tolist(), boxes.xyxy.tolist(), persons, strict=True
+        )
+        if person
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def get_grid_mask(height: int, width: int) -> np.ndarray:
+    """Return mask of 10% grid lines, computed once per resolution."""
+    mask = np.zeros((height, width), dtype=bool)
+    for x in range(10, 100, 10):
+        mask[:, int(x * width / 100)] = True
+    for y in range(10, 100, 10):
+        mask[int(y * height / 100), :] = True
+    mask.flags.writeable = False
+    return mask
+
+
+def draw_trigger_line(
+    im: np.ndarray, trigger_line_xyxyn: list, text: str
+) -> np.ndarray:
+    """Return copy of image (BGR) with trigger line, grid and text."""
+    im_line = im.copy()
+    height, width = im.shape[:2]
+
+    # Draw the grid lines
+    im_line[get_grid_mask(height, width)] = (255, 255, 255)
+
+    # Draw the trigger line
+    x1, y1, x2, y2 = map(float, trigger_line_xyxyn)
+    cv2.line(
+        im_line,
+        (int(x1 * width), int(y1 * height)),
+        (int(x2 * width), int(y2 * height)),
+        (0, 0, 255),  # Color (BGR) - red
+        5,  # Thickness
+    )
+
+    # Add text (using OpenCV)
+    font_face = 1
+    font_scale = 1
+    font_color = (0, 0, 255)  # red
+    cv2.putText(
+        im_line, text, (50, 50), font_face, font_scale, font_color, 2, cv2.LINE_AA
+    )
+    return im_line
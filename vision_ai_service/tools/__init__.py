@@ -0,0 +1 @@
+"""Package for development and load test tools."""
@@ -0,0 +1,219 @@
+"""Module for benchmarking batched inference against one process per camera.
+
+Each simulated camera replays the same local clip. In mode batched one
+process loads the model once, and the frames of all cameras are detected in
+batches by the BatchDetector and tracked per camera. In mode processes each
+camera runs in its own process with its own model. Total fps and memory
+(RSS summed over processes) are reported.
+
+python -m vision_ai_service.tools.batch_benchmark --video synthetic_race.mp4 --cameras 4
+"""
+
+import argparse
+import logging
+import multiprocessing
+import threading
+import time
+from typing import TYPE_CHECKING, Protocol
+
+import numpy as np
+
+from vision_ai_service.services.batch_detector import BATCH_MAX_WAIT, BATCH_SIZE
+from vision_ai_service.services.profiler import get_rss_mb
+from vision_ai_service.services.tracking_session import DetectionParams
+from vision_ai_service.tools.synthetic_video import get_size
+
+if TYPE_CHECKING:
+    from multiprocessing.synchronize import Barrier
+
+    from ultralytics import YOLO
+
+
+class Detector(Protocol):
+    """Interface of the detector used by a camera."""
+
+    model: "YOLO"
+
+    def detect(
+        self, im: np.ndarray, conf: float, classes: list[int], image_size: tuple
+    ) -> np.ndarray:
+        """Detect on one frame, return detections (x1, y1, x2, y2, conf, cls)."""
+        ...
+
+
+class SingleDetector:
+    """Class detecting one frame at a time, as a session without batching."""
+
+    def __init__(self) -> None:
+        """Load own model."""
+        from vision_ai_service.services.video_ai_service import load_model
+
+        self.model = load_model()
+
+    def detect(
+        self, im: np.ndarray, conf: float, classes: list[int], image_size: tuple
+    ) -> np.ndarray:
+        """Detect on one frame, return detections (x1, y1, x2, y2, conf, cls)."""
+        result = self.model.predict(
+            im, conf=conf, classes=classes, imgsz=image_size, verbose=False
+        )[0]
+        return result.boxes.data.cpu().numpy()
+
+
+def run_camera(video: str, detector: Detector, image_size: tuple[int, int]) -> int:
+    """Replay the clip for one camera, detect and track each frame, return frames."""
+    from vision_ai_service.services.frame_reader import FrameReader
+    from vision_ai_service.services.trackers import ByteTracker, get_tracked_result
+    from vision_ai_service.services.video_ai_service import DETECTION_CLASSES
+
+    params = DetectionParams()
+    # tracks are kept per camera, also when the model is shared
+    tracker = ByteTracker()
+    frame_count = 0
+    frame_reader = FrameReader(video)
+    for im, _frame_time in frame_reader:
+        detections = detector.detect(
+            im, params.min_confidence, DETECTION_CLASSES, image_size
+        )
+        get_tracked_result(detector.model, tracker, im, detections)
+        frame_count += 1
+    frame_reader.release()
+    return frame_count
+
+
+def warm_up(detector: Detector, image_size: tuple[int, int], count: int = 1) -> None:
+    """Run dummy inferences, so model loading is not timed."""
+    im = np.zeros((image_size[1], image_size[0], 3), dtype=np.uint8)
+    threads = [
+        threading.Thread(target=detector.detect, args=(im, 0.5, [0], image_size))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_batched(
+    video: str,
+    cameras: int,
+    image_size: tuple[int, int],
+    batch_size: int = BATCH_SIZE,
+    max_wait: float = BATCH_MAX_WAIT,
+) -> dict:
+    """Run all cameras in this process with one model and batched inference."""
+    from vision_ai_service.services.batch_detector import BatchDetector
+    from vision_ai_service.services.video_ai_service import load_model
+
+    batch_detector = BatchDetector(load_model(), batch_size, max_wait)
+    warm_up(batch_detector, image_size, min(cameras, batch_size))
+    frame_counts = [0] * cameras
+
+    def run(index: int) -> None:
+        try:
+            frame_counts[index] = run_camera(video, batch_detector, image_size)
+        finally:
+            batch_detector.remove_camera()
+
+    threads = [
+        threading.Thread(target=run, args=(i,), name=f"camera_{i}")
+        for i in range(cameras)
+    ]
+    for _ in threads:
+        batch_detector.add_camera()
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+    rss = get_rss_mb()
+    stats = batch_detector.get_stats()
+    batch_detector.close()
+    return {
+        "mode": "batched",
+        "cameras": cameras,
+        "batch_size": batch_size,
+        "max_wait_ms": round(max_wait * 1000, 1),
+        "frames": sum(frame_counts),
+        "seconds": round(elapsed, 1),
+        "total_fps": round(sum(frame_counts) / elapsed, 1) if elapsed else 0.0,
+        "rss_mb": round(rss),
+        "mean_batch_size": stats.get("mean_batch_size", 0.0),
+        "mean_wait_ms": stats.get("mean_wait_ms", 0.0),
+    }
+
+
+def run_process(
+    video: str,
+    image_size: tuple[int, int],
+    barrier: "Barrier",
+    results: multiprocessing.Queue,
+) -> None:
+    """Run one camera with its own model - runs in a child process."""
+    detector = SingleDetector()
+    warm_up(detector, image_size)
+    barrier.wait()
+    frame_count = run_camera(video, detector, image_size)
+    results.put((frame_count, get_rss_mb()))
+
+
+def run_processes(video: str, cameras: int, image_size: tuple[int, int]) -> dict:
+    """Run each camera in a separate process with its own model."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(cameras + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_process, args=(video, image_size, barrier, results))
+        for _ in range(cameras)
+    ]
+    for process in processes:
+        process.start()
+    # timed from when all models are loaded
+    barrier.wait()
+    start_time = time.perf_counter()
+    reports = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - start_time
+    for process in processes:
+        process.join()
+    frames = sum(frame_count for frame_count, _rss in reports)
+    return {
+        "mode": "processes",
+        "cameras": cameras,
+        "frames": frames,
+        "seconds": round(elapsed, 1),
+        "total_fps": round(frames / elapsed, 1) if elapsed else 0.0,
+        "rss_mb": round(sum(rss for _frame_count, rss in reports)),
+    }
+
+
+def main() -> None:
+    """Run batch benchmark from command line."""
+    parser = argparse.ArgumentParser(
+        description="Batched inference against one process per camera."
+    )
+    parser.add_argument("--video", default="synthetic_race.mp4")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument(
+        "--mode", choices=["batched", "processes", "compare"], default="compare"
+    )
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--max-wait", type=float, default=BATCH_MAX_WAIT, help="seconds"
+    )
+    parser.add_argument("--image-size", default="640x480")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    image_size = get_size(args.image_size)
+    if args.mode in ["batched", "compare"]:
+        logging.info(
+            run_batched(
+                args.video, args.cameras, image_size, args.batch_size, args.max_wait
+            )
+        )
+    if args.mode in ["processes", "compare"]:
+        logging.info(run_processes(args.video, args.cameras, image_size))
+
+
+if __name__ == "__main__":
+    main()
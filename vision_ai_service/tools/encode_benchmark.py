@@ -0,0 +1,119 @@
+"""Module for benchmarking photo encoding settings.
+
+Encodes one crossing (full frame, crop montage and preview) per setting and
+reports bytes written and encode time per crossing. The frame is read from
+a video or image, or a synthetic frame is drawn.
+
+python -m vision_ai_service.tools.encode_benchmark --video race.mp4
+python -m vision_ai_service.tools.encode_benchmark --size 1920x1080 --formats jpg webp
+"""
+
+import argparse
+import itertools
+import logging
+import statistics
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from vision_ai_service.adapters.exif_adapter import ExifAdapter
+from vision_ai_service.adapters.photo_encoding import (
+    PhotoSettings,
+    encode_photo,
+    write_photos,
+)
+from vision_ai_service.services.tracking_session import DetectionParams
+from vision_ai_service.tools.synthetic_video import (
+    Figure,
+    draw_figure,
+    get_figure_box,
+    get_size,
+)
+
+REPEATS = 20
+
+
+def get_frame(
+    video: str | None, image: str | None, frame_size: tuple[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return frame and a crop montage of a skier at the trigger line."""
+    if image:
+        im = cv2.imread(image)
+    elif video:
+        cap = cv2.VideoCapture(video)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, cap.get(cv2.CAP_PROP_FRAME_COUNT) // 2)
+        _, im = cap.read()
+        cap.release()
+    else:
+        im = np.full((frame_size[1], frame_size[0], 3), 235, dtype=np.uint8)
+        im[: frame_size[1] // 4] = 200
+        # add noise, a flat frame compresses better than a camera frame
+        noise = np.random.default_rng(1).normal(0, 6, im.shape)
+        im = np.clip(im + noise, 0, 255).astype(np.uint8)
+        figure = Figure(bib=1, crossing_s=0.0, x_center=0.5, color=(40, 40, 200))
+        box = get_figure_box(figure, 0.0, DetectionParams(), frame_size)
+        if box:
+            draw_figure(im, box, figure)
+    if im is None:
+        informasjon = f"Error reading frame from {image or video}."
+        raise ValueError(informasjon)
+    height, width = im.shape[:2]
+    # the same crop three times, as for a skier seen at 80, 90 and 100 percent
+    crop = im[height // 3 : height * 5 // 6, width * 2 // 5 : width * 3 // 5]
+    return im, np.concatenate([crop, crop, crop], axis=1)
+
+
+def benchmark(
+    im: np.ndarray, crop_im: np.ndarray, settings: PhotoSettings, repeats: int = REPEATS
+) -> dict:
+    """Encode and write one crossing repeats times, report bytes and time."""
+    exif_bytes = ExifAdapter().get_image_info("Finish", "20250101 12:00:00")
+    durations = []
+    bytes_written = 0
+    with tempfile.TemporaryDirectory() as photos_file_path:
+        file_name = (
+            f"{photos_file_path}/Finish_20250101_120000_1.{settings.photo_format}"
+        )
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            photos = encode_photo(im, crop_im, file_name, settings, exif_bytes)
+            bytes_written = write_photos(photos)
+            durations.append(time.perf_counter() - start_time)
+    return {
+        "format": settings.photo_format,
+        "quality": settings.quality,
+        "max_dimension": settings.max_dimension,
+        "preview": settings.preview,
+        "kb_per_crossing": round(bytes_written / 1024, 1),
+        "encode_ms_mean": round(statistics.mean(durations) * 1000, 1),
+        "encode_ms_min": round(min(durations) * 1000, 1),
+    }
+
+
+def main() -> None:
+    """Run encode benchmark from command line."""
+    parser = argparse.ArgumentParser(description="Benchmark photo encoding settings.")
+    parser.add_argument("--video", help="read middle frame of a video")
+    parser.add_argument("--image", help="read frame from an image")
+    parser.add_argument("--size", type=get_size, default=(1920, 1080))
+    parser.add_argument("--formats", nargs="+", default=["jpg", "webp"])
+    parser.add_argument("--qualities", nargs="+", type=int, default=[95, 85, 75])
+    parser.add_argument("--max-dimensions", nargs="+", type=int, default=[0, 1280])
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    im, crop_im = get_frame(args.video, args.image, args.size)
+    logging.info(
+        f"Frame {im.shape[1]}x{im.shape[0]}, crop montage {crop_im.shape[1]}x{crop_im.shape[0]}"
+    )
+    for photo_format, quality, max_dimension in itertools.product(
+        args.formats, args.qualities, args.max_dimensions
+    ):
+        settings = PhotoSettings(photo_format, quality, max_dimension, preview=True)
+        logging.info(benchmark(im, crop_im, settings, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Module for testing camera leases of several instances against the stub.
+
+Instances claim cameras through the in-process stand-in config service.
+The test checks that every camera is analysed by exactly one instance,
+after start, after a new instance joins and after an instance dies, and
+reports the time until the assignment is stable again.
+
+python -m vision_ai_service.tools.lease_test --cameras 6 --capacities 4 4 2
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from vision_ai_service.adapters import ConfigAdapter, TokenManager
+from vision_ai_service.adapters.http_client import close_client_session
+from vision_ai_service.services.camera_leases import Camera, CameraLeases
+from vision_ai_service.tools.load_test import EVENT_ID, point_adapters_to
+from vision_ai_service.tools.stub_server import (
+    StubServices,
+    load_default_settings,
+    start_stub_server,
+)
+
+TTL = 3.0
+RENEW_INTERVAL = 1.0
+SETTLE = 0.2
+MAX_ROUNDS = 30
+
+
+class Instance:
+    """Class representing one simulated instance with its analytics jobs."""
+
+    def __init__(self, leases: CameraLeases, token_manager: TokenManager) -> None:
+        """Initialize instance."""
+        self.leases = leases
+        self.token_manager = token_manager
+        self.running: set[str] = set()
+
+    async def renew(self, cameras: list[Camera]) -> None:
+        """One lease round, as handle_camera_leases in the app."""
+        configs = {
+            config["key"]: config["value"]
+            for config in await self.token_manager.call(
+                ConfigAdapter().get_all_configs, EVENT_ID
+            )
+        }
+        held = await self.leases.update(configs, cameras)
+        for location in self.running - held:
+            # analytics stopped, then the lease is released
+            await self.leases.release(location)
+        self.running = held
+
+
+def get_problems(instances: dict[str, Instance], cameras: list[Camera]) -> list[str]:
+    """Return cameras analysed twice, not at all, or above capacity."""
+    problems = []
+    owners: dict[str, list[str]] = {}
+    for instance_id, instance in instances.items():
+        if len(instance.running) > instance.leases.capacity:
+            problems.append(f"{instance_id} above capacity")
+        for location in instance.running:
+            owners.setdefault(location, []).append(instance_id)
+    capacity = sum(instance.leases.capacity for instance in instances.values())
+    problems += [f"{c} analysed by {o}" for c, o in owners.items() if len(o) > 1]
+    missing = [c.location for c in cameras if c.location not in owners]
+    if len(missing) > max(0, len(cameras) - capacity):
+        problems.append(f"not analysed: {missing}")
+    return problems
+
+
+async def run_until_stable(
+    phase: str, instances: dict[str, Instance], cameras: list[Camera]
+) -> dict:
+    """Run lease rounds until the assignment is correct and unchanged."""
+    start_time = time.perf_counter()
+    previous = None
+    overlaps = 0
+    problems: list[str] = []
+    for round_number in range(1, MAX_ROUNDS + 1):
+        await asyncio.gather(*(i.renew(cameras) for i in instances.values()))
+        assignment = {i: sorted(instance.running) for i, instance in instances.items()}
+        problems = get_problems(instances, cameras)
+        overlaps += any("analysed by" in problem for problem in problems)
+        if not problems and assignment == previous:
+            return {
+                "phase": phase,
+                "rounds": round_number,
+                "seconds": round(time.perf_counter() - start_time, 2),
+                "rounds_with_overlap": overlaps,
+                "assignment": assignment,
+            }
+        previous = assignment
+        await asyncio.sleep(RENEW_INTERVAL)
+    informasjon = f"Leases not stable after {MAX_ROUNDS} rounds in {phase}: {problems}"
+    raise Exception(informasjon)
+
+
+async def run_lease_test(camera_count: int, capacities: list[int]) -> list[dict]:
+    """Start the stub and run start, join and failure phases."""
+    stub = StubServices()
+    load_default_settings(stub)
+    runner, url = await start_stub_server(stub)
+    point_adapters_to(url)
+    cameras = [
+        Camera(f"Camera{i}", f"rtsp://camera{i}/stream") for i in range(camera_count)
+    ]
+    stub.set_config(
+        EVENT_ID, "CAMERAS", json.dumps([vars(camera) for camera in cameras])
+    )
+
+    def create_instance(index: int) -> Instance:
+        token_manager = TokenManager(stub.username, stub.password)
+        leases = CameraLeases(
+            token_manager, EVENT_ID, f"instance{index}", capacities[index], TTL, SETTLE
+        )
+        return Instance(leases, token_manager)
+
+    reports = []
+    try:
+        instances = {
+            f"instance{i}": create_instance(i) for i in range(len(capacities) - 1)
+        }
+        reports.append(await run_until_stable("start", instances, cameras))
+        instances[f"instance{len(capacities) - 1}"] = create_instance(
+            len(capacities) - 1
+        )
+        reports.append(await run_until_stable("join", instances, cameras))
+        # the first instance dies - no release, its leases expire
+        instances.pop("instance0")
+        reports.append(await run_until_stable("failure", instances, cameras))
+    finally:
+        await close_client_session()
+        await runner.cleanup()
+    return reports
+
+
+def main() -> None:
+    """Run lease test from command line."""
+    parser = argparse.ArgumentParser(description="Test camera leases against the stub.")
+    parser.add_argument("--cameras", type=int, default=6)
+    parser.add_argument(
+        "--capacities",
+        type=int,
+        nargs="+",
+        default=[4, 4, 2],
+        help="capacity per instance, the last one joins later",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    for report in asyncio.run(run_lease_test(args.cameras, args.capacities)):
+        print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
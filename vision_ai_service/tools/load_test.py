@@ -0,0 +1,272 @@
+"""Module for load testing adapters and the control loop against the stub.
+
+Run: python -m vision_ai_service.tools.load_test --scenario adapters
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from vision_ai_service.adapters import (
+    ConfigAdapter,
+    EventsAdapter,
+    PhotoUploader,
+    StatusAdapter,
+    TokenManager,
+    config_adapter,
+    events_adapter,
+    photo_upload_adapter,
+    status_adapter,
+    user_adapter,
+)
+from vision_ai_service.adapters.http_client import close_client_session
+from vision_ai_service.app import get_config
+from vision_ai_service.services.config_watcher import ConfigWatcher
+from vision_ai_service.tools.stub_server import (
+    StubServices,
+    load_default_settings,
+    start_stub_server,
+)
+
+EVENT_ID = "stub-event"
+PHOTO_SIZE = 200 * 1024  # bytes per crossing, photo, crop and preview
+UPLOAD_RATE = 100  # crossings per second
+
+
+def point_adapters_to(url: str) -> None:
+    """Point all adapters to one base url (the stub serves every endpoint)."""
+    config_adapter.PHOTO_SERVICE_URL = url
+    status_adapter.PHOTO_SERVICE_URL = url
+    photo_upload_adapter.PHOTO_SERVICE_URL = url
+    events_adapter.EVENT_SERVICE_URL = url
+    user_adapter.USER_SERVICE_URL = url
+
+
+def get_latency_report(
+    name: str, latencies: list[float], errors: int, elapsed: float
+) -> dict:
+    """Summarize latencies (seconds) to throughput and percentiles (ms)."""
+    count = len(latencies)
+    report = {
+        "scenario": name,
+        "requests": count + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+    }
+    if count > 1:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        report.update(
+            {
+                "p50_ms": round(percentiles[49] * 1000, 2),
+                "p95_ms": round(percentiles[94] * 1000, 2),
+                "p99_ms": round(percentiles[98] * 1000, 2),
+                "max_ms": round(max(latencies) * 1000, 2),
+            }
+        )
+    return report
+
+
+async def run_calls(
+    name: str,
+    call_factory: Callable[[int], Awaitable[Any]],
+    total: int,
+    concurrency: int,
+) -> dict:
+    """Run total calls with bounded concurrency and measure each call."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def timed_call(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call_factory(i)
+            except Exception as e:
+                errors += 1
+                logging.debug(f"{name} call {i} failed: {e}")
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_call(i) for i in range(total)))
+    return get_latency_report(name, latencies, errors, time.perf_counter() - start)
+
+
+async def run_uploads(
+    stub: StubServices, token_manager: TokenManager, total: int, concurrency: int
+) -> list[dict]:
+    """Submit crossings from a worker thread, as the analytics thread does.
+
+    Uploads failing while the stub injects errors are spooled. The spool is
+    then uploaded by a new uploader with errors turned off.
+    """
+    photos = {
+        "Finish_20250101_120000_1.jpg": os.urandom(PHOTO_SIZE * 3 // 4),
+        "Finish_20250101_120000_1.jpg_crop.jpg": os.urandom(PHOTO_SIZE // 8),
+        "Finish_20250101_120000_1.jpg_preview.jpg": os.urandom(PHOTO_SIZE // 8),
+    }
+    reports = []
+    with tempfile.TemporaryDirectory() as spool_path:
+        uploader = PhotoUploader(token_manager, EVENT_ID, spool_path, concurrency)
+        await uploader.start()
+        queue_depths = []
+
+        def submit_all() -> None:
+            for i in range(total):
+                uploader.submit(
+                    {f"{i}_{name}": data for name, data in photos.items()},
+                    {"file_name": f"{i}_Finish.jpg", "track_id": i},
+                )
+                queue_depths.append(uploader.queue.qsize())
+                time.sleep(1 / UPLOAD_RATE)
+
+        start = time.perf_counter()
+        await asyncio.to_thread(submit_all)
+        stats = await uploader.close()
+        reports.append(
+            {
+                "scenario": "photo_upload",
+                "elapsed_s": round(time.perf_counter() - start, 3),
+                "received": len(stub.photos),
+                "queue_depth_max": max(queue_depths, default=0),
+                **stats,
+            }
+        )
+        if stats["spool_depth"]:
+            stub.error_rate = 0.0
+            start = time.perf_counter()
+            uploader = PhotoUploader(token_manager, EVENT_ID, spool_path, concurrency)
+            await uploader.start()
+            await uploader.spool_empty.wait()
+            reports.append(
+                {
+                    "scenario": "photo_spool_drain",
+                    "elapsed_s": round(time.perf_counter() - start, 3),
+                    "received": len(stub.photos),
+                    **await uploader.close(),
+                }
+            )
+    return reports
+
+
+async def run_load_test(
+    scenario: str,
+    total: int,
+    concurrency: int,
+    stub: StubServices,
+) -> list[dict]:
+    """Start the stub in-process and run the requested scenario."""
+    load_default_settings(stub)
+    runner, url = await start_stub_server(stub)
+    point_adapters_to(url)
+    token_manager = TokenManager(stub.username, stub.password)
+    event = stub.events[0]
+    reports = []
+    try:
+        if scenario in ("adapters", "all"):
+            reports.append(
+                await run_calls(
+                    "get_config",
+                    lambda _i: token_manager.call(
+                        ConfigAdapter().get_config, EVENT_ID, "VIDEO_URL"
+                    ),
+                    total,
+                    concurrency,
+                )
+            )
+            reports.append(
+                await run_calls(
+                    "update_config",
+                    lambda i: token_manager.call(
+                        ConfigAdapter().update_config,
+                        EVENT_ID,
+                        "VIDEO_ANALYTICS_RUNNING",
+                        str(i % 2 == 0),
+                    ),
+                    total,
+                    concurrency,
+                )
+            )
+            reports.append(
+                await run_calls(
+                    "create_status",
+                    lambda i: token_manager.call(
+                        StatusAdapter().create_status,
+                        event,
+                        "video_status",
+                        f"Load {i}",
+                    ),
+                    total,
+                    concurrency,
+                )
+            )
+            reports.append(
+                await run_calls(
+                    "get_all_events",
+                    lambda _i: token_manager.call(EventsAdapter().get_all_events),
+                    total,
+                    concurrency,
+                )
+            )
+        if scenario in ("control-loop", "all"):
+            # one control loop runs one iteration at a time
+            config_watcher = ConfigWatcher(token_manager, EVENT_ID)
+            requests_before = sum(stub.request_count.values())
+            reports.append(
+                await run_calls(
+                    "control_loop_iteration",
+                    lambda _i: get_config(config_watcher),
+                    total,
+                    1,
+                )
+            )
+            reports[-1]["service_requests"] = (
+                sum(stub.request_count.values()) - requests_before
+            )
+        if scenario in ("upload", "all"):
+            reports += await run_uploads(stub, token_manager, total, concurrency)
+    finally:
+        await close_client_session()
+        await runner.cleanup()
+    return reports
+
+
+def main() -> None:
+    """Run load test from command line and print report."""
+    parser = argparse.ArgumentParser(description="Load test adapters against the stub.")
+    parser.add_argument(
+        "--scenario",
+        choices=["adapters", "control-loop", "upload", "all"],
+        default="all",
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    stub = StubServices(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        unauthorized_rate=args.unauthorized_rate,
+    )
+    reports = asyncio.run(
+        run_load_test(args.scenario, args.requests, args.concurrency, stub)
+    )
+    for report in reports:
+        print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
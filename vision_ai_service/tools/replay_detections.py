@@ -0,0 +1,109 @@
+"""Module for tuning detection parameters by replaying a detection log.
+
+Record a log by setting config DETECTION_LOG to True during video analytics,
+then sweep parameters without running inference again:
+
+python -m vision_ai_service.tools.replay_detections --log <path> \
+    --min-confidence 0.5 0.6 0.7 --trigger-line 0:0.7:1:0.7 0:0.75:1:0.75
+"""
+
+import argparse
+import itertools
+import logging
+import time
+
+from vision_ai_service.services.detection_log import open_detection_log, replay
+from vision_ai_service.services.tracking_session import (
+    DETECTION_BOX_MAXIMUM_SIZE,
+    DETECTION_BOX_MINIMUM_SIZE,
+    EDGE_MARGIN,
+    MIN_CONFIDENCE,
+    DetectionParams,
+    parse_trigger_line,
+)
+
+
+def sweep(
+    log_path: str,
+    min_confidences: list[float],
+    trigger_lines: list[str],
+    box_minimum_sizes: list[float],
+    box_maximum_sizes: list[float],
+    edge_margins: list[float],
+) -> list[dict]:
+    """Replay the log for every combination of parameters, return crossing counts."""
+    columns = open_detection_log(log_path)
+    reports = []
+    for combination in itertools.product(
+        min_confidences,
+        trigger_lines,
+        box_minimum_sizes,
+        box_maximum_sizes,
+        edge_margins,
+    ):
+        (
+            min_confidence,
+            trigger_line,
+            box_minimum_size,
+            box_maximum_size,
+            edge_margin,
+        ) = combination
+        params = DetectionParams(
+            trigger_line=parse_trigger_line(trigger_line),
+            min_confidence=min_confidence,
+            box_minimum_size=box_minimum_size,
+            box_maximum_size=box_maximum_size,
+            edge_margin=edge_margin,
+        )
+        start_time = time.perf_counter()
+        crossings = replay(columns, params)
+        reports.append(
+            {
+                "min_confidence": min_confidence,
+                "trigger_line": trigger_line,
+                "box_minimum_size": box_minimum_size,
+                "box_maximum_size": box_maximum_size,
+                "edge_margin": edge_margin,
+                "crossings": len(crossings),
+                "replay_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            }
+        )
+    return reports
+
+
+def main() -> None:
+    """Run parameter sweep from command line."""
+    parser = argparse.ArgumentParser(description="Replay a detection log.")
+    parser.add_argument("--log", required=True, help="detection log directory")
+    parser.add_argument(
+        "--min-confidence", type=float, nargs="+", default=[MIN_CONFIDENCE]
+    )
+    parser.add_argument("--trigger-line", nargs="+", default=["0:0.75:1:0.75"])
+    parser.add_argument(
+        "--box-minimum-size",
+        type=float,
+        nargs="+",
+        default=[DETECTION_BOX_MINIMUM_SIZE],
+    )
+    parser.add_argument(
+        "--box-maximum-size",
+        type=float,
+        nargs="+",
+        default=[DETECTION_BOX_MAXIMUM_SIZE],
+    )
+    parser.add_argument("--edge-margin", type=float, nargs="+", default=[EDGE_MARGIN])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for report in sweep(
+        args.log,
+        args.min_confidence,
+        args.trigger_line,
+        args.box_minimum_size,
+        args.box_maximum_size,
+        args.edge_margin,
+    ):
+        logging.info(report)
+
+
+if __name__ == "__main__":
+    main()
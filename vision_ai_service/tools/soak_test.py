@@ -0,0 +1,115 @@
+"""Module for a soak test of the analytics frame path.
+
+Replays a local clip a number of times through the same frame path as video
+analytics, and fails if RSS grows more than allowed after warm-up.
+
+python -m vision_ai_service.tools.soak_test --video synthetic_race.mp4 --loops 20
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+from vision_ai_service.services.profiler import get_rss_mb
+from vision_ai_service.services.tracking_session import DetectionParams
+
+WARM_UP_FRAMES = 100
+SAMPLE_FRAMES = 250
+MAX_GROWTH_MB = 50.0
+
+
+def soak(
+    video: str,
+    loops: int,
+    tracker_name: str = "ultralytics",
+    image_size: tuple[int, int] = (640, 480),
+) -> list[tuple[int, float]]:
+    """Replay video loops times, return RSS samples (frame count, MB)."""
+    from vision_ai_service.services.frame_reader import FrameReader
+    from vision_ai_service.services.trackers import get_tracker, track_frame
+    from vision_ai_service.services.video_ai_service import (
+        DETECTION_CLASSES,
+        VideoAIService,
+        load_model,
+    )
+
+    model = load_model()
+    tracker = get_tracker(tracker_name) if tracker_name != "ultralytics" else None
+    service = VideoAIService()
+    params = DetectionParams()
+    crossings = {"100": [], "90": {}, "80": {}}
+    track_history: dict[int, tuple[float, float]] = {}
+    samples = []
+    frame_count = 0
+    with tempfile.TemporaryDirectory() as photos_file_path:
+        for loop in range(loops):
+            frame_reader = FrameReader(video)
+            for im, frame_time in frame_reader:
+                if tracker:
+                    result = track_frame(
+                        model,
+                        tracker,
+                        im,
+                        params.min_confidence,
+                        DETECTION_CLASSES,
+                        image_size,
+                    )
+                else:
+                    result = model.track(
+                        im,
+                        conf=params.min_confidence,
+                        classes=DETECTION_CLASSES,
+                        imgsz=image_size,
+                        persist=True,
+                        verbose=False,
+                    )[0]
+                service.process_boxes(
+                    result,
+                    params,
+                    crossings,
+                    "Soak",
+                    photos_file_path,
+                    frame_time,
+                    track_history,
+                )
+                frame_count += 1
+                if frame_count == WARM_UP_FRAMES or frame_count % SAMPLE_FRAMES == 0:
+                    samples.append((frame_count, get_rss_mb()))
+            frame_reader.release()
+            logging.info(
+                f"Loop {loop + 1}/{loops}: {frame_count} frames, "
+                f"RSS {get_rss_mb():.0f} MB, {len(crossings['100'])} crossings."
+            )
+    return samples
+
+
+def main() -> None:
+    """Run soak test from command line, exit code 1 if RSS is not bounded."""
+    parser = argparse.ArgumentParser(
+        description="Soak test of the analytics frame path."
+    )
+    parser.add_argument("--video", default="synthetic_race.mp4")
+    parser.add_argument("--loops", type=int, default=20)
+    parser.add_argument("--tracker", default="ultralytics")
+    parser.add_argument("--max-growth-mb", type=float, default=MAX_GROWTH_MB)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    start_time = time.perf_counter()
+    samples = soak(args.video, args.loops, args.tracker)
+    baseline = next((rss for frames, rss in samples if frames >= WARM_UP_FRAMES), 0.0)
+    peak = max((rss for _frames, rss in samples), default=0.0)
+    growth = peak - baseline
+    logging.info(
+        f"Soak test: {samples[-1][0] if samples else 0} frames in "
+        f"{time.perf_counter() - start_time:.0f}s, RSS after warm-up {baseline:.0f} MB, "
+        f"peak {peak:.0f} MB, growth {growth:.1f} MB (max {args.max_growth_mb:.0f} MB)."
+    )
+    if growth > args.max_growth_mb:
+        logging.error(f"RSS is not bounded - samples: {samples}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
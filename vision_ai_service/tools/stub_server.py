@@ -0,0 +1,325 @@
+"""Module for an in-process stand-in of event-, user- and photo-service.
+
+The stub implements the endpoints used by the adapters with the same status
+codes as the real services, and supports configurable latency and error
+injection for load testing on one machine.
+
+Start standalone: python -m vision_ai_service.tools.stub_server --port 8092
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from pathlib import Path
+
+import jwt
+from aiohttp import BodyPartReader, hdrs, web
+
+PROJECT_ROOT = f"{Path.cwd()}/vision_ai_service"
+JWT_SECRET = os.getenv("JWT_SECRET", "secret")
+JWT_EXP_DELTA_SECONDS = int(os.getenv("JWT_EXP_DELTA_SECONDS", "3600"))
+
+
+class StubServices:
+    """Class representing the state of the stand-in services."""
+
+    def __init__(
+        self,
+        username: str | None = None,
+        password: str | None = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unauthorized_rate: float = 0.0,
+    ) -> None:
+        """Initialize the stub with one event and default settings.
+
+        The credentials default to ADMIN_USERNAME and ADMIN_PASSWORD.
+        """
+        self.username = username or os.getenv("ADMIN_USERNAME", "admin")
+        self.password = password or os.getenv("ADMIN_PASSWORD", "password")
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.unauthorized_rate = unauthorized_rate
+        self.jwt_exp_delta_seconds = JWT_EXP_DELTA_SECONDS
+        self.events = [
+            {
+                "id": "stub-event",
+                "name": "Stub event",
+                "date_of_event": "2026-01-01",
+                "timezone": "Europe/Oslo",
+            }
+        ]
+        self.configs: dict[tuple[str, str], dict] = {}
+        self.status: list[dict] = []
+        self.photos: list[dict] = []
+        self.config_version = 0
+        self.request_count: dict[str, int] = {}
+
+    def set_config(self, event_id: str, key: str, value: str) -> None:
+        """Set a config value directly, as an operator in the UI would."""
+        existing = self.configs.get((event_id, key))
+        config_id = existing["id"] if existing else str(uuid.uuid4())
+        self.configs[(event_id, key)] = {
+            "id": config_id,
+            "event_id": event_id,
+            "key": key,
+            "value": value,
+        }
+        self.config_version += 1
+
+    def create_token(self) -> str:
+        """Create a signed token with expiry."""
+        payload = {
+            "username": self.username,
+            "exp": int(time.time()) + self.jwt_exp_delta_seconds,
+        }
+        return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+    def is_authorized(self, request: web.Request) -> bool:
+        """Validate the bearer token of a request."""
+        authorization = request.headers.get(hdrs.AUTHORIZATION, "")
+        if not authorization.startswith("Bearer "):
+            return False
+        try:
+            jwt.decode(authorization[7:], JWT_SECRET, algorithms=["HS256"])
+        except jwt.PyJWTError:
+            return False
+        return True
+
+
+STUB_KEY = web.AppKey("stub", StubServices)
+
+
+@web.middleware
+async def inject_faults(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Add latency, random errors and token validation to all requests."""
+    stub = request.app[STUB_KEY]
+    endpoint = f"{request.method} {request.path}"
+    stub.request_count[endpoint] = stub.request_count.get(endpoint, 0) + 1
+    delay = stub.latency + random.uniform(0, stub.latency_jitter)  # noqa: S311
+    if delay:
+        await asyncio.sleep(delay)
+    if random.random() < stub.error_rate:  # noqa: S311
+        return web.json_response(
+            {"detail": "Injected error"}, status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+    if request.path != "/login":
+        if random.random() < stub.unauthorized_rate or not stub.is_authorized(request):  # noqa: S311
+            return web.json_response(
+                {"detail": "Unauthorized"}, status=HTTPStatus.UNAUTHORIZED
+            )
+    return await handler(request)
+
+
+async def login(request: web.Request) -> web.Response:
+    """Login and return token."""
+    stub = request.app[STUB_KEY]
+    body = await request.json()
+    if body.get("username") == stub.username and body.get("password") == stub.password:
+        return web.json_response({"token": stub.create_token()})
+    return web.json_response(
+        {"detail": "Wrong credentials"}, status=HTTPStatus.UNAUTHORIZED
+    )
+
+
+async def get_events(request: web.Request) -> web.Response:
+    """Return all events."""
+    return web.json_response(request.app[STUB_KEY].events)
+
+
+async def get_config(request: web.Request) -> web.Response:
+    """Return one config by key and event."""
+    stub = request.app[STUB_KEY]
+    key = request.query.get("key", "")
+    event_id = request.query.get("eventId", "")
+    config = stub.configs.get((event_id, key))
+    if not config:
+        return web.json_response(
+            {"detail": f"Config {key} not found."}, status=HTTPStatus.NOT_FOUND
+        )
+    return web.json_response(config)
+
+
+async def get_configs(request: web.Request) -> web.Response:
+    """Return all configs, optionally for one event.
+
+    Supports conditional requests - 304 if If-None-Match is current.
+    """
+    stub = request.app[STUB_KEY]
+    etag = f'"{stub.config_version}"'
+    if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+        return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={hdrs.ETAG: etag})
+    event_id = request.query.get("eventId")
+    configs = [
+        config
+        for (config_event_id, _key), config in stub.configs.items()
+        if not event_id or config_event_id == event_id
+    ]
+    return web.json_response(configs, headers={hdrs.ETAG: etag})
+
+
+async def create_config(request: web.Request) -> web.Response:
+    """Create a config."""
+    stub = request.app[STUB_KEY]
+    body = await request.json()
+    stub.set_config(body["event_id"], body["key"], body["value"])
+    config_id = stub.configs[(body["event_id"], body["key"])]["id"]
+    return web.Response(
+        status=HTTPStatus.CREATED, headers={hdrs.LOCATION: f"/config/{config_id}"}
+    )
+
+
+async def update_config(request: web.Request) -> web.Response:
+    """Update a config, 404 if it does not exist."""
+    stub = request.app[STUB_KEY]
+    body = await request.json()
+    if (body["event_id"], body["key"]) not in stub.configs:
+        return web.json_response(
+            {"detail": f"Config {body['key']} not found."}, status=HTTPStatus.NOT_FOUND
+        )
+    stub.set_config(body["event_id"], body["key"], body["value"])
+    return web.Response(status=HTTPStatus.NO_CONTENT)
+
+
+async def get_status(request: web.Request) -> web.Response:
+    """Return latest status messages, newest first."""
+    stub = request.app[STUB_KEY]
+    event_id = request.query.get("eventId")
+    status_type = request.query.get("type")
+    count = int(request.query.get("count", "25"))
+    status = [
+        s
+        for s in reversed(stub.status)
+        if s["event_id"] == event_id and (not status_type or s["type"] == status_type)
+    ]
+    return web.json_response(status[:count])
+
+
+async def create_status(request: web.Request) -> web.Response:
+    """Create a status message."""
+    stub = request.app[STUB_KEY]
+    body = await request.json()
+    status_id = str(uuid.uuid4())
+    stub.status.append({"id": status_id, **body})
+    return web.Response(
+        status=HTTPStatus.CREATED, headers={hdrs.LOCATION: f"/status/{status_id}"}
+    )
+
+
+async def delete_status(request: web.Request) -> web.Response:
+    """Delete all status messages for an event."""
+    stub = request.app[STUB_KEY]
+    event_id = request.query.get("event_id")
+    stub.status = [s for s in stub.status if s["event_id"] != event_id]
+    return web.Response(status=HTTPStatus.NO_CONTENT)
+
+
+async def upload_photo(request: web.Request) -> web.Response:
+    """Receive photo files and metadata of one crossing (multipart)."""
+    stub = request.app[STUB_KEY]
+    reader = await request.multipart()
+    metadata = {}
+    files = {}
+    async for part in reader:
+        if not isinstance(part, BodyPartReader):
+            # nested multipart is not used by the uploader
+            continue
+        if part.name == "metadata":
+            metadata = await part.json() or {}
+        elif part.filename:
+            files[part.filename] = len(await part.read())
+    if not files:
+        return web.json_response(
+            {"detail": "No photo files in upload."}, status=HTTPStatus.BAD_REQUEST
+        )
+    photo_id = str(uuid.uuid4())
+    # sizes only, the stub does not keep the image bytes
+    stub.photos.append({"id": photo_id, "metadata": metadata, "files": files})
+    return web.Response(
+        status=HTTPStatus.CREATED, headers={hdrs.LOCATION: f"/photos/{photo_id}"}
+    )
+
+
+def create_stub_app(stub: StubServices | None = None) -> web.Application:
+    """Create the aiohttp application serving all stand-in endpoints."""
+    app = web.Application(middlewares=[inject_faults])
+    app[STUB_KEY] = stub or StubServices()
+    app.add_routes(
+        [
+            web.post("/login", login),
+            web.get("/events", get_events),
+            web.get("/config", get_config),
+            web.post("/config", create_config),
+            web.put("/config", update_config),
+            web.get("/configs", get_configs),
+            web.get("/status", get_status),
+            web.post("/status", create_status),
+            web.delete("/status", delete_status),
+            web.post("/photos/upload", upload_photo),
+        ]
+    )
+    return app
+
+
+async def start_stub_server(
+    stub: StubServices, host: str = "localhost", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Start the stub in the running event loop, return runner and base url."""
+    runner = web.AppRunner(create_stub_app(stub), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    sockets = site._server.sockets  # type: ignore[union-attr]  # noqa: SLF001
+    bound_port = sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def load_default_settings(stub: StubServices) -> None:
+    """Seed the stub with the defaults from global_settings.json."""
+    config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
+    with config_file.open() as json_file:
+        settings = json.load(json_file)
+    for event in stub.events:
+        for key, value in settings.items():
+            stub.set_config(event["id"], key, value)
+
+
+def main() -> None:
+    """Run the stub standalone."""
+    parser = argparse.ArgumentParser(
+        description="Stand-in for event/user/photo services."
+    )
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    stub = StubServices(
+        username=os.getenv("ADMIN_USERNAME", "admin"),
+        password=os.getenv("ADMIN_PASSWORD", "password"),
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        unauthorized_rate=args.unauthorized_rate,
+    )
+    load_default_settings(stub)
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(create_stub_app(stub), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
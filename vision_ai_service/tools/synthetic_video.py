@@ -0,0 +1,422 @@
+"""Module for a synthetic video source for end-to-end testing without cameras.
+
+Figures for each contestant in a start list move towards the camera and
+cross the trigger line at their scheduled crossing times. The video is
+written to a local file that can be used as VIDEO_URL, together with a
+ground truth file for recall benchmarks.
+
+Generate: python -m vision_ai_service.tools.synthetic_video generate --output race.mp4
+Benchmark: python -m vision_ai_service.tools.synthetic_video benchmark --video race.mp4
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from vision_ai_service.adapters.http_client import close_client_session
+from vision_ai_service.services.simulate_service import (
+    add_modelled_crossing_time,
+    add_random_crossing_time,
+    get_contestant_list,
+)
+from vision_ai_service.services.tracking_session import (
+    DetectionParams,
+    parse_trigger_line,
+)
+
+FRAME_SIZE = (1280, 720)
+FPS = 25
+LEAD_IN_SECONDS = 3.0
+APPROACH_SECONDS = 2.5  # time on screen before and after the crossing
+FIGURE_HEIGHT_AT_LINE = 0.3  # relative to frame height
+MATCH_TOLERANCE_SECONDS = 0.5
+
+
+@dataclass
+class Figure:
+    """Class representing one contestant moving across the trigger line."""
+
+    bib: int
+    crossing_s: float
+    x_center: float
+    color: tuple[int, int, int]
+
+
+def get_figures(
+    contestants: list,
+    trigger_line: tuple[float, float, float, float],
+    speedup: float,
+    occlusion: float,
+    seed: int,
+) -> list[Figure]:
+    """Place figures along the trigger line at their scheduled crossing times.
+
+    With probability occlusion a figure follows close behind the previous one,
+    partly hidden by it.
+    """
+    # seeded, the same test video for the same seed - not for security
+    rng = random.Random(seed)  # noqa: S311
+    timed = sorted(
+        contestants,
+        key=lambda contestant: contestant["crossing_time"],
+    )
+    first_crossing = datetime.datetime.fromisoformat(timed[0]["crossing_time"])
+    x1, _y1, x2, _y2 = trigger_line
+    figures: list[Figure] = []
+    for contestant in timed:
+        crossing = datetime.datetime.fromisoformat(contestant["crossing_time"])
+        crossing_s = (
+            LEAD_IN_SECONDS + (crossing - first_crossing).total_seconds() / speedup
+        )
+        x_center = rng.uniform(x1 + 0.1 * (x2 - x1), x2 - 0.1 * (x2 - x1))
+        if figures and rng.random() < occlusion:
+            previous = figures[-1]
+            crossing_s = previous.crossing_s + rng.uniform(0.1, 0.3)
+            x_center = previous.x_center + rng.uniform(-0.04, 0.04)
+        color = (rng.randint(0, 200), rng.randint(0, 200), rng.randint(0, 200))
+        figures.append(Figure(contestant["bib"], crossing_s, x_center, color))
+    return figures
+
+
+def get_figure_box(
+    figure: Figure,
+    t: float,
+    params: DetectionParams,
+    frame_size: tuple[int, int] = FRAME_SIZE,
+    figure_height: float = FIGURE_HEIGHT_AT_LINE,
+) -> tuple[float, float, float, float] | None:
+    """Return normalized box (x1, y1, x2, y2) of figure at time t, None if off screen."""
+    dt = t - figure.crossing_s
+    if abs(dt) > APPROACH_SECONDS:
+        return None
+    x1, y1, _x2, _y2 = params.trigger_line
+    y_line = y1 + params.slope * (figure.x_center - x1)
+    # feet move from far (top) to near (bottom), crossing the line at dt 0
+    y_bottom = y_line + dt * (1 - y_line) / APPROACH_SECONDS
+    # perspective - figures grow when approaching the camera
+    height = figure_height * max(0.2, y_bottom / max(y_line, 0.01))
+    width = height * 0.4 * frame_size[1] / frame_size[0]
+    return (
+        figure.x_center - width / 2,
+        y_bottom - height,
+        figure.x_center + width / 2,
+        y_bottom,
+    )
+
+
+def draw_figure(
+    im: np.ndarray, box: tuple[float, float, float, float], figure: Figure
+) -> None:
+    """Draw a simple skier figure (head, body, arms, legs and bib) in box."""
+    height, width = im.shape[:2]
+    bx1, by1, bx2, by2 = (
+        int(box[0] * width),
+        int(box[1] * height),
+        int(box[2] * width),
+        int(box[3] * height),
+    )
+    box_w = max(bx2 - bx1, 4)
+    box_h = max(by2 - by1, 8)
+    cx = (bx1 + bx2) // 2
+    thickness = max(1, box_w // 6)
+    head_r = max(2, box_h // 12)
+    cv2.circle(im, (cx, by1 + head_r), head_r, (80, 120, 200), -1)
+    body_top = by1 + 2 * head_r
+    body_bottom = by1 + int(box_h * 0.55)
+    cv2.rectangle(
+        im,
+        (cx - box_w // 4, body_top),
+        (cx + box_w // 4, body_bottom),
+        figure.color,
+        -1,
+    )
+    cv2.line(
+        im, (cx - box_w // 4, body_top), (bx1, body_bottom), figure.color, thickness
+    )
+    cv2.line(
+        im, (cx + box_w // 4, body_top), (bx2, body_bottom), figure.color, thickness
+    )
+    cv2.line(im, (cx, body_bottom), (bx1 + box_w // 6, by2), (40, 40, 40), thickness)
+    cv2.line(im, (cx, body_bottom), (bx2 - box_w // 6, by2), (40, 40, 40), thickness)
+    cv2.putText(
+        im,
+        str(figure.bib),
+        (cx - box_w // 5, body_top + (body_bottom - body_top) // 2),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        max(0.3, box_w / 120),
+        (255, 255, 255),
+        1,
+        cv2.LINE_AA,
+    )
+
+
+def generate_frames(
+    figures: list[Figure],
+    params: DetectionParams,
+    fps: int = FPS,
+    frame_size: tuple[int, int] = FRAME_SIZE,
+    figure_height: float = FIGURE_HEIGHT_AT_LINE,
+) -> Iterator[np.ndarray]:
+    """Yield frames (BGR) with all figures visible at each frame time."""
+    background = np.full((frame_size[1], frame_size[0], 3), 235, dtype=np.uint8)
+    # darker snow towards the horizon
+    background[: frame_size[1] // 4] = 200
+    duration = max(figure.crossing_s for figure in figures) + APPROACH_SECONDS
+    for frame_index in range(int(duration * fps) + 1):
+        t = frame_index / fps
+        im = background.copy()
+        visible = []
+        for figure in figures:
+            box = get_figure_box(figure, t, params, frame_size, figure_height)
+            if box:
+                visible.append((box, figure))
+        # far figures first, near figures are drawn on top and occlude them
+        for box, figure in sorted(visible, key=lambda item: item[0][3]):
+            draw_figure(im, box, figure)
+        yield im
+
+
+def generate_video(
+    start_list: str,
+    output: str,
+    trigger_line: str,
+    speedup: float,
+    occlusion: float,
+    start_model: str = "list",
+    fastest_time: int = 300,
+    seed: int = 1,
+    frame_size: tuple[int, int] = FRAME_SIZE,
+    figure_height: float = FIGURE_HEIGHT_AT_LINE,
+) -> dict:
+    """Write synthetic video and ground truth file, return summary.
+
+    A small figure_height in a large frame_size gives distant skiers, as seen
+    by a high resolution finish camera.
+    """
+    random.seed(seed)
+    params = DetectionParams(trigger_line=parse_trigger_line(trigger_line))
+    contestants = asyncio.run(load_contestants(start_list))
+    if start_model == "list":
+        contestants = add_random_crossing_time(contestants, fastest_time)
+    else:
+        contestants = add_modelled_crossing_time(
+            contestants, fastest_time, start_model, 120, 30
+        )
+    figures = get_figures(contestants, params.trigger_line, speedup, occlusion, seed)
+    writer = cv2.VideoWriter(output, cv2.VideoWriter.fourcc(*"mp4v"), FPS, frame_size)
+    frame_count = 0
+    for im in generate_frames(figures, params, FPS, frame_size, figure_height):
+        writer.write(im)
+        frame_count += 1
+    writer.release()
+    ground_truth = [
+        {"bib": figure.bib, "crossing_s": round(figure.crossing_s, 3)}
+        for figure in figures
+    ]
+    ground_truth_file = Path(output).with_suffix(".json")
+    ground_truth_file.write_text(
+        json.dumps(
+            {
+                "fps": FPS,
+                "frame_size": frame_size,
+                "trigger_line": trigger_line,
+                "crossings": ground_truth,
+            },
+            indent=2,
+        )
+    )
+    return {
+        "video": output,
+        "ground_truth": str(ground_truth_file),
+        "frames": frame_count,
+        "crossings": len(ground_truth),
+    }
+
+
+async def load_contestants(start_list: str) -> list:
+    """Load start list from file or url, and close the pooled session."""
+    try:
+        return await get_contestant_list(start_list)
+    finally:
+        await close_client_session()
+
+
+def match_crossings(
+    expected_s: list[float], detected_s: list[float], tolerance: float
+) -> int:
+    """Count expected crossings matched by a detected crossing within tolerance."""
+    unmatched = sorted(detected_s)
+    matched = 0
+    for expected in sorted(expected_s):
+        for i, detected in enumerate(unmatched):
+            if abs(detected - expected) <= tolerance:
+                matched += 1
+                del unmatched[i]
+                break
+    return matched
+
+
+def benchmark(
+    video: str, mode: str = "full", image_size: tuple[int, int] = (640, 480)
+) -> dict:
+    """Track persons in the synthetic video, report fps, recall and precision.
+
+    Frames go through the same path as in video analytics: FrameReader and
+    model.track for mode full, TiledDetector for mode tiled.
+    """
+    from vision_ai_service.services.frame_reader import FrameReader
+    from vision_ai_service.services.tiled_detector import TILE_SIZE, TiledDetector
+    from vision_ai_service.services.trackers import ByteTracker
+    from vision_ai_service.services.video_ai_service import (
+        DETECTION_CLASSES,
+        load_model,
+    )
+
+    ground_truth = json.loads(Path(video).with_suffix(".json").read_text())
+    fps = ground_truth["fps"]
+    params = DetectionParams(
+        trigger_line=parse_trigger_line(ground_truth["trigger_line"])
+    )
+    model = load_model()
+    detector = (
+        TiledDetector(model, tracker=ByteTracker(frame_rate=fps))
+        if mode == "tiled"
+        else None
+    )
+    crossed: dict[int, float] = {}
+    frame_count = 0
+    frame_reader = FrameReader(video)
+    start_time = time.perf_counter()
+    for im, _frame_time in frame_reader:
+        if detector:
+            result = detector.track(
+                im, params.trigger_line, params.min_confidence, DETECTION_CLASSES
+            )
+        else:
+            result = model.track(
+                im,
+                conf=params.min_confidence,
+                classes=DETECTION_CLASSES,
+                imgsz=image_size,
+                persist=True,
+                verbose=False,
+            )[0]
+        boxes = result.boxes
+        if boxes is not None and boxes.id is not None:
+            for track_id, xyxyn in zip(
+                boxes.id.int().tolist(), boxes.xyxyn.tolist(), strict=True
+            ):
+                if (
+                    track_id not in crossed
+                    and params.is_below_line(xyxyn) == "100"
+                    and params.validate_box(xyxyn)
+                ):
+                    crossed[track_id] = frame_count / fps
+        frame_count += 1
+    elapsed = time.perf_counter() - start_time
+    frame_reader.release()
+    expected = [crossing["crossing_s"] for crossing in ground_truth["crossings"]]
+    matched = match_crossings(expected, list(crossed.values()), MATCH_TOLERANCE_SECONDS)
+    return {
+        "mode": mode,
+        "image_size": image_size if mode == "full" else TILE_SIZE,
+        "frames": frame_count,
+        "fps": round(frame_count / elapsed, 1) if elapsed else 0.0,
+        "expected": len(expected),
+        "detected": len(crossed),
+        "recall": round(matched / len(expected), 3) if expected else 0.0,
+        "precision": round(matched / len(crossed), 3) if crossed else 0.0,
+    }
+
+
+def compare_tiled(video: str, image_size: tuple[int, int]) -> list[dict]:
+    """Benchmark full frame, full frame at the pixel budget of tiled, and tiled."""
+    from vision_ai_service.services.tiled_detector import TILE_SIZE, get_tile_layout
+
+    ground_truth = json.loads(Path(video).with_suffix(".json").read_text())
+    width, height = ground_truth["frame_size"]
+    tiles = get_tile_layout(
+        width, height, parse_trigger_line(ground_truth["trigger_line"])
+    )
+    # tiles and the downscaled full frame, all at tile size
+    pixel_budget = (len(tiles) + 1) * TILE_SIZE * TILE_SIZE
+    budget_width = int((pixel_budget * width / height) ** 0.5) // 32 * 32
+    # imgsz of ultralytics is (height, width)
+    budget_size = (budget_width * height // width // 32 * 32, budget_width)
+    return [
+        benchmark(video, "full", image_size),
+        benchmark(video, "full", budget_size),
+        benchmark(video, "tiled"),
+    ]
+
+
+def main() -> None:
+    """Generate synthetic video or run benchmark from command line."""
+    parser = argparse.ArgumentParser(description="Synthetic video source.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    generate = subparsers.add_parser("generate")
+    generate.add_argument("--start-list", default="tests/files/startliste.csv")
+    generate.add_argument("--output", default="synthetic_race.mp4")
+    generate.add_argument("--trigger-line", default="0.1:0.75:0.9:0.75")
+    generate.add_argument(
+        "--speedup", type=float, default=4.0, help="higher gives denser crossings"
+    )
+    generate.add_argument(
+        "--occlusion", type=float, default=0.2, help="share of figures partly hidden"
+    )
+    generate.add_argument(
+        "--start-model", choices=["list", "mass", "interval"], default="list"
+    )
+    generate.add_argument("--seed", type=int, default=1)
+    generate.add_argument(
+        "--size", default="1280x720", help="frame size, e.g. 3840x2160"
+    )
+    generate.add_argument(
+        "--figure-height",
+        type=float,
+        default=FIGURE_HEIGHT_AT_LINE,
+        help="figure height at the trigger line, relative to frame height",
+    )
+    bench = subparsers.add_parser("benchmark")
+    bench.add_argument("--video", default="synthetic_race.mp4")
+    bench.add_argument("--mode", choices=["full", "tiled", "compare"], default="full")
+    bench.add_argument("--image-size", default="640x480")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "generate":
+        summary = generate_video(
+            args.start_list,
+            args.output,
+            args.trigger_line,
+            args.speedup,
+            args.occlusion,
+            args.start_model,
+            seed=args.seed,
+            frame_size=get_size(args.size),
+            figure_height=args.figure_height,
+        )
+    elif args.mode == "compare":
+        summary = compare_tiled(args.video, get_size(args.image_size))
+    else:
+        summary = benchmark(args.video, args.mode, get_size(args.image_size))
+    logging.info(summary)
+
+
+def get_size(value: str) -> tuple[int, int]:
+    """Parse size given as WIDTHxHEIGHT."""
+    width, height = value.split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Module for benchmarking trackers on recorded or synthetic detections.
+
+Recorded: a detection log (config DETECTION_LOG), ids of the tracker used
+while recording are the reference.
+Synthetic: boxes of synthetic figures with noise and missed detections,
+the bib is the reference id.
+
+python -m vision_ai_service.tools.tracker_benchmark --log <path>
+python -m vision_ai_service.tools.tracker_benchmark --synthetic --fps 10 --miss-rate 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from collections.abc import Iterator
+
+import numpy as np
+
+from vision_ai_service.services.detection_log import NO_TRACK_ID, open_detection_log
+from vision_ai_service.services.simulate_service import (
+    add_random_crossing_time,
+    get_percentile,
+)
+from vision_ai_service.services.trackers import get_tracker
+from vision_ai_service.services.tracking_session import DetectionParams
+from vision_ai_service.tools.synthetic_video import (
+    get_figure_box,
+    get_figures,
+    load_contestants,
+)
+
+Frames = list[tuple[np.ndarray, np.ndarray]]  # detections and reference ids per frame
+
+
+def get_log_frames(log_path: str) -> Frames:
+    """Group detections of a log per frame."""
+    columns = open_detection_log(log_path)
+    frames: Frames = []
+    frame_numbers = np.asarray(columns["frame"])
+    if not len(frame_numbers):
+        return frames
+    starts = np.flatnonzero(np.diff(frame_numbers, prepend=frame_numbers[0] - 1))
+    ends = np.append(starts[1:], len(frame_numbers))
+    for start, end in zip(starts, ends, strict=True):
+        detections = np.column_stack(
+            [
+                columns["xyxyn"][start:end],
+                columns["conf"][start:end],
+                columns["cls"][start:end],
+            ]
+        ).astype(np.float64)
+        frames.append((detections, np.asarray(columns["track_id"][start:end])))
+    return frames
+
+
+def get_synthetic_frames(
+    start_list: str, fps: int, noise: float, miss_rate: float, seed: int = 1
+) -> Frames:
+    """Return detections of synthetic figures, with box noise and missed detections."""
+    rng = random.Random(seed)  # noqa: S311
+    random.seed(seed)
+    params = DetectionParams()
+    contestants = add_random_crossing_time(
+        asyncio.run(load_contestants(start_list)), 300
+    )
+    figures = get_figures(contestants, params.trigger_line, 4.0, 0.2, seed)
+    duration = max(figure.crossing_s for figure in figures) + 3
+    frames: Frames = []
+    for frame_index in range(int(duration * fps)):
+        t = frame_index / fps
+        rows = []
+        bibs = []
+        for figure in figures:
+            box = get_figure_box(figure, t, params)
+            if box is None or rng.random() < miss_rate:
+                continue
+            rows.append(
+                [c + rng.gauss(0, noise) for c in box] + [rng.uniform(0.5, 1), 0]
+            )
+            bibs.append(figure.bib)
+        frames.append((np.array(rows).reshape(-1, 6), np.array(bibs, dtype=np.int64)))
+    return frames
+
+
+def get_id_stability(pairs: Iterator[tuple[int, int]]) -> dict:
+    """ID switches and track ids per reference object, from (reference, track) pairs."""
+    last_id: dict[int, int] = {}
+    ids: dict[int, set[int]] = {}
+    switches = 0
+    for reference_id, track_id in pairs:
+        if reference_id in last_id and last_id[reference_id] != track_id:
+            switches += 1
+        last_id[reference_id] = track_id
+        ids.setdefault(reference_id, set()).add(track_id)
+    return {
+        "objects": len(ids),
+        "id_switches": switches,
+        "ids_per_object": round(statistics.mean(len(i) for i in ids.values()), 2)
+        if ids
+        else 0.0,
+    }
+
+
+def run_tracker(name: str, frames: Frames, fps: int) -> dict:
+    """Run tracker over frames, report per-frame cost and id stability."""
+    tracker = get_tracker(name, frame_rate=fps)
+    durations = []
+    pairs = []
+    for detections, reference_ids in frames:
+        start_time = time.perf_counter()
+        tracks = tracker.update(detections)
+        durations.append(time.perf_counter() - start_time)
+        for track in tracks:
+            reference_id = int(reference_ids[int(track[7])])
+            if reference_id != NO_TRACK_ID:
+                pairs.append((reference_id, int(track[4])))
+    return {
+        "tracker": name,
+        "frames": len(frames),
+        "frame_us_mean": round(statistics.mean(durations) * 1e6, 1)
+        if durations
+        else 0.0,
+        "frame_us_p95": round(get_percentile(durations, 95) * 1e6, 1),
+        **get_id_stability(iter(pairs)),
+    }
+
+
+def main() -> None:
+    """Run tracker benchmark from command line."""
+    parser = argparse.ArgumentParser(description="Benchmark trackers.")
+    parser.add_argument("--log", help="detection log directory")
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--start-list", default="tests/files/startliste.csv")
+    parser.add_argument("--fps", type=int, default=25)
+    parser.add_argument("--noise", type=float, default=0.003)
+    parser.add_argument("--miss-rate", type=float, default=0.1)
+    parser.add_argument(
+        "--trackers",
+        nargs="+",
+        choices=["lap", "bytetrack"],
+        default=["lap", "bytetrack"],
+        help="ultralytics (model.track) detects on images, it is not benchmarked here",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.log:
+        frames = get_log_frames(args.log)
+    else:
+        frames = get_synthetic_frames(
+            args.start_list, args.fps, args.noise, args.miss_rate
+        )
+    for name in args.trackers:
+        try:
+            logging.info(run_tracker(name, frames, args.fps))
+        except ImportError as e:
+            logging.warning(f"Tracker {name} not available - {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""Package for all views."""
+
+from .commands import (
+    AnalyticsStart,
+    AnalyticsStop,
+    ProfilingStart,
+    SimulationStart,
+    TriggerLine,
+)
+from .health import Health, Ready
@@ -0,0 +1,59 @@
+"""Resource module for local control commands."""
+
+from http import HTTPStatus
+
+from aiohttp import web
+
+from .health import CONTROL_SERVICE_KEY
+
+
+def send_command(request: web.Request, command: str) -> web.Response:
+    """Queue command in the running process, 503 if not ready."""
+    control_service = request.app[CONTROL_SERVICE_KEY]
+    if not control_service.ready:
+        return web.json_response(
+            {"detail": "Vision AI is not ready."},
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+    control_service.send(command)
+    return web.json_response({"command": command}, status=HTTPStatus.ACCEPTED)
+
+
+class AnalyticsStart(web.View):
+    """Class representing start of video analytics."""
+
+    async def post(self) -> web.Response:
+        """Start analytics route function."""
+        return send_command(self.request, "analytics_start")
+
+
+class AnalyticsStop(web.View):
+    """Class representing stop of video analytics."""
+
+    async def post(self) -> web.Response:
+        """Stop analytics route function."""
+        return send_command(self.request, "stop_tracking")
+
+
+class TriggerLine(web.View):
+    """Class representing drawing of the trigger line."""
+
+    async def post(self) -> web.Response:
+        """Draw trigger line route function."""
+        return send_command(self.request, "draw_trigger_line")
+
+
+class ProfilingStart(web.View):
+    """Class representing start of a profiling session."""
+
+    async def post(self) -> web.Response:
+        """Start profiling route function."""
+        return send_command(self.request, "start_profiling")
+
+
+class SimulationStart(web.View):
+    """Class representing start of crossings simulation."""
+
+    async def post(self) -> web.Response:
+        """Start simulation route function."""
+        return send_command(self.request, "start_simulation")
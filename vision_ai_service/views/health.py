@@ -0,0 +1,30 @@
+"""Resource module for liveness and readiness resources."""
+
+from http import HTTPStatus
+
+from aiohttp import web
+
+from vision_ai_service.services.control_service import ControlService
+
+CONTROL_SERVICE_KEY = web.AppKey("control_service", ControlService)
+
+
+class Health(web.View):
+    """Class representing liveness resource."""
+
+    async def get(self) -> web.Response:
+        """Health route function - the event loop is alive if we answer."""
+        control_service = self.request.app[CONTROL_SERVICE_KEY]
+        return web.json_response(control_service.get_health())
+
+
+class Ready(web.View):
+    """Class representing readiness resource."""
+
+    async def get(self) -> web.Response:
+        """Ready route function - 503 until startup has completed."""
+        control_service = self.request.app[CONTROL_SERVICE_KEY]
+        status = (
+            HTTPStatus.OK if control_service.ready else HTTPStatus.SERVICE_UNAVAILABLE
+        )
+        return web.json_response(control_service.get_health(), status=status)